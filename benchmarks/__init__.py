@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the resume pipeline.
+
+See benchmarks/run.py for usage. baseline.json holds the reference
+timings the --compare regression gate checks against.
+"""
@@ -0,0 +1,203 @@
+"""
+Concurrency benchmark: one sync WSGI worker against one async ASGI worker.
+
+    python -m benchmarks.concurrency
+    python -m benchmarks.concurrency --requests 32 --upload-seconds 2
+
+Both servers run as real processes on a throwaway SQLite database: the
+sync side is Django's WSGI server without threads (one request at a time,
+like a gunicorn sync worker), the async side is uvicorn serving
+core.asgi. Clients send their multipart bodies over --upload-seconds, as
+browsers on ordinary connections do, and all of them start at once.
+
+Uploads are queued for the analysis worker (ANALYSIS_USE_QUEUE), as in
+deployments that run it, so their handling is short on both servers; bodies small
+enough to sit in the kernel's socket buffers do not hold the sync worker
+either. The jd-match path extracts and scores inside the request: the
+sync worker serialises that work, the ASGI worker overlaps it on its
+thread pools.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSRF_TOKEN = "b" * 32
+BOUNDARY = "skillmatch-benchmark-boundary"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def multipart(fields: Dict[str, str], files: Dict[str, Tuple[str, bytes]]) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        )
+    for name, (filename, content) in files.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n".encode("utf-8") + content + b"\r\n"
+        )
+    parts.append(f"--{BOUNDARY}--\r\n".encode("utf-8"))
+    return b"".join(parts)
+
+
+# =========================================
+# SERVERS
+# =========================================
+
+def server_env(workdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "DJANGO_SETTINGS_MODULE": "core.settings",
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'db.sqlite3')}",
+        "MEDIA_ROOT": os.path.join(workdir, "media"),
+        "METRICS_DIR": os.path.join(workdir, "metrics"),
+        "SLOW_REQUEST_THRESHOLD_MS": "0",
+        "ANALYSIS_USE_QUEUE": "True",
+        "DEBUG": "False",
+    })
+    return env
+
+
+def prepare_database(env: Dict[str, str]) -> str:
+    """Migrate the throwaway database and return a logged-in session id."""
+    subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0"], cwd=REPO_ROOT, env=env, check=True)
+    script = (
+        "import django; django.setup()\n"
+        "from django.conf import settings\n"
+        "from django.contrib.auth.models import User\n"
+        "from django.test import Client\n"
+        "client = Client()\n"
+        "client.force_login(User.objects.create_user('benchmark', password='benchmark'))\n"
+        "print(client.cookies[settings.SESSION_COOKIE_NAME].value)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True
+    )
+    return output.stdout.strip().splitlines()[-1]
+
+
+def start_server(mode: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    if mode == "sync":
+        command = [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--nothreading", "--noreload"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "core.asgi:application", "--port", str(port),
+                   "--workers", "1", "--log-level", "warning"]
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+
+# =========================================
+# CLIENTS
+# =========================================
+
+async def post(port: int, path: str, body: bytes, session_id: str, upload_seconds: float,
+               steps: int = 20) -> Tuple[int, float]:
+    """POST a multipart body, trickled over upload_seconds; returns (status, seconds)."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n"
+        f"Content-Type: multipart/form-data; boundary={BOUNDARY}\r\nContent-Length: {len(body)}\r\n"
+        f"Cookie: sessionid={session_id}; csrftoken={CSRF_TOKEN}\r\nX-CSRFToken: {CSRF_TOKEN}\r\n\r\n"
+    )
+    writer.write(head.encode("ascii"))
+    chunk = -(-len(body) // steps)
+    for offset in range(0, len(body), chunk):
+        writer.write(body[offset:offset + chunk])
+        await writer.drain()
+        await asyncio.sleep(upload_seconds / steps)
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def load(port: int, path: str, body: bytes, session_id: str, requests: int,
+               upload_seconds: float) -> Dict[str, float]:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        post(port, path, body, session_id, upload_seconds) for _ in range(requests)
+    ))
+    wall = time.perf_counter() - started
+    failed = [status for status, _ in results if status >= 400]
+    if failed:
+        raise RuntimeError(f"{len(failed)} request(s) to {path} failed: {failed[:5]}")
+    latencies = sorted(seconds for _, seconds in results)
+    return {
+        "wall_s": round(wall, 2),
+        "throughput_rps": round(requests / wall, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000),
+        "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000),
+    }
+
+
+# =========================================
+# CLI
+# =========================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .corpus import SIZES, build_corpus
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.concurrency", description=__doc__.split("\n")[1])
+    parser.add_argument("--size", choices=list(SIZES), default="medium")
+    parser.add_argument("--requests", type=int, default=16, help="Concurrent clients per scenario.")
+    parser.add_argument("--upload-seconds", type=float, default=1.0,
+                        help="Time each client takes to send its request body.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="skillmatch-concurrency-") as workdir:
+        entry = build_corpus(os.path.join(workdir, "corpus"), [args.size])[args.size]
+        with open(entry["pdf"], "rb") as f:
+            body = multipart({"job_description": entry["jd_text"]}, {"resume": ("resume.pdf", f.read())})
+
+        env = server_env(workdir)
+        session_id = prepare_database(env)
+        print(f"{args.requests} concurrent clients per scenario, bodies of {len(body) // 1024} KiB "
+              f"sent over {args.upload_seconds:.1f} s")
+
+        for path in ("/upload/", "/jd-match/"):
+            results = {}
+            for mode in ("sync", "async"):
+                port = free_port()
+                server = start_server(mode, port, env)
+                try:
+                    # Untimed warm-up: imports, the extraction pool and the taxonomy.
+                    asyncio.run(post(port, path, body, session_id, 0))
+                    results[mode] = asyncio.run(load(port, path, body, session_id, args.requests,
+                                                     args.upload_seconds))
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+                stats = results[mode]
+                print(f"{path:<12} {mode:<5} {stats['wall_s']:>7.2f} s  {stats['throughput_rps']:>7.2f} req/s  "
+                      f"p50 {stats['p50_ms']:>7} ms  p95 {stats['p95_ms']:>7} ms")
+            speedup = results["async"]["throughput_rps"] / results["sync"]["throughput_rps"]
+            print(f"{path:<12} async throughput x{speedup:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
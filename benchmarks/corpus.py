@@ -0,0 +1,212 @@
+"""
+Deterministic synthetic resumes and job descriptions.
+
+The same (size, seed) always yields the same text, so timings are
+comparable across runs and machines. PDFs are rendered with reportlab in
+invariant mode (no timestamps or random document IDs); DOCX files carry
+fixed core properties and, like many resume templates, put each job's
+heading and dates in a table row.
+"""
+import datetime
+import os
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+
+@dataclass(frozen=True)
+class CorpusSize:
+    jobs: int
+    bullets_per_job: int
+    projects: int
+    skills: int
+    jd_paragraphs: int
+
+
+SIZES: Dict[str, CorpusSize] = {
+    # About one page.
+    "small": CorpusSize(jobs=2, bullets_per_job=4, projects=2, skills=12, jd_paragraphs=2),
+    # Two to three pages, a typical senior resume.
+    "medium": CorpusSize(jobs=6, bullets_per_job=8, projects=5, skills=30, jd_paragraphs=6),
+    # Over fifty pages; exceeds the default extraction page cap.
+    "huge": CorpusSize(jobs=200, bullets_per_job=14, projects=60, skills=80, jd_paragraphs=40),
+}
+
+FIRST_NAMES = ["Aarav", "Priya", "Jordan", "Mei", "Lucas", "Fatima", "Noah", "Sofia", "Ravi", "Elena"]
+LAST_NAMES = ["Sharma", "Chen", "Okafor", "Garcia", "Nguyen", "Kowalski", "Haddad", "Smith", "Rao", "Silva"]
+COMPANIES = [
+    "Northwind Labs", "Bluepeak Systems", "Quantive Analytics", "Helio Cloud", "Ardent Fintech",
+    "Vertex Health", "Lumen Retail", "Orbit Logistics", "Cobalt Security", "Maple Software",
+]
+TITLES = [
+    "Software Engineer", "Backend Developer", "Data Analyst", "Full Stack Developer",
+    "DevOps Engineer", "Machine Learning Engineer", "Senior Software Engineer", "Tech Lead",
+]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis",
+    "Django", "Flask", "FastAPI", "Spring", "React", "Angular", "Vue", "Node", "Express",
+    "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Terraform", "Jenkins", "Git", "GitHub", "Linux",
+    "Pandas", "NumPy", "Machine Learning", "Data Analysis", "Tableau", "Power BI", "Excel",
+    "REST", "API", "GraphQL", "Kafka", "Spark", "Airflow", "Elasticsearch", "CI/CD", "Agile", "Scrum",
+    "Communication", "Leadership", "Teamwork", "Problem Solving", "Time Management",
+]
+ACTIONS = ["Developed", "Designed", "Implemented", "Built", "Created", "Led", "Managed", "Engineered", "Optimized"]
+OBJECTS = [
+    "a REST API serving {n} daily users", "the data ingestion pipeline with {skill}",
+    "a reporting dashboard in {skill}", "the CI/CD workflow using {skill}",
+    "a caching layer backed by {skill}", "microservices deployed on {skill}",
+    "an internal tool for {n} analysts", "the search service using {skill}",
+]
+OUTCOMES = [
+    "reducing latency by {p}%", "cutting cloud costs by {p}%", "improving throughput by {p}%",
+    "raising test coverage to {p}%", "saving {n} engineering hours per quarter",
+    "increasing conversion by {p}%",
+]
+JD_SENTENCES = [
+    "We are looking for an engineer with strong experience in {a} and {b}.",
+    "You will design, build and operate services using {a}, {b} and {c}.",
+    "Hands-on knowledge of {a} is required; exposure to {b} is a plus.",
+    "The team values ownership, communication and a pragmatic approach to {a}.",
+    "You will collaborate with product managers to deliver features on {a} and {b}.",
+    "Experience with {a}, {b} or {c} in a production environment is expected.",
+]
+
+
+# =========================================
+# TEXT
+# =========================================
+
+def _fill(rng: random.Random, template: str) -> str:
+    return template.format(
+        n=rng.choice([50, 120, 800, 5000, 20000, 100000]),
+        p=rng.randint(10, 70),
+        skill=rng.choice(SKILLS),
+    )
+
+
+def resume_lines(size: str, seed: int = 0) -> List[str]:
+    spec = SIZES[size]
+    rng = random.Random(f"resume-{size}-{seed}")
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+
+    lines = [
+        f"{first} {last}",
+        f"{handle}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)} | "
+        f"linkedin.com/in/{handle} | github.com/{handle}",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience building "
+        f"products with {', '.join(rng.sample(SKILLS, 3))}.",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, min(spec.skills, len(SKILLS)))),
+        "EXPERIENCE",
+    ]
+    for job in range(spec.jobs):
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({2024 - job * 2} - {2026 - job * 2})")
+        for _ in range(spec.bullets_per_job):
+            lines.append(
+                f"- {rng.choice(ACTIONS)} {_fill(rng, rng.choice(OBJECTS))}, "
+                f"{_fill(rng, rng.choice(OUTCOMES))}."
+            )
+
+    lines.append("PROJECTS")
+    for _ in range(spec.projects):
+        lines.append(
+            f"- {rng.choice(ACTIONS)} {_fill(rng, rng.choice(OBJECTS))} "
+            f"using {' and '.join(rng.sample(SKILLS, 2))}."
+        )
+
+    lines += [
+        "EDUCATION",
+        f"B.Tech in Computer Science, State University, {rng.randint(2005, 2020)}",
+        "CERTIFICATIONS",
+        f"{rng.choice(['AWS', 'Azure', 'GCP'])} Certified Developer",
+    ]
+    return lines
+
+
+def resume_text(size: str, seed: int = 0) -> str:
+    return "\n".join(resume_lines(size, seed))
+
+
+def job_description_text(size: str, seed: int = 0) -> str:
+    spec = SIZES[size]
+    rng = random.Random(f"jd-{size}-{seed}")
+    title = rng.choice(TITLES)
+
+    paragraphs = [f"{title} at {rng.choice(COMPANIES)}"]
+    for _ in range(spec.jd_paragraphs):
+        sentences = []
+        for _ in range(4):
+            a, b, c = rng.sample(SKILLS, 3)
+            sentences.append(rng.choice(JD_SENTENCES).format(a=a, b=b, c=c))
+        paragraphs.append(" ".join(sentences))
+    paragraphs.append("Requirements: " + ", ".join(rng.sample(SKILLS, min(spec.skills // 2 + 4, len(SKILLS)))))
+    return "\n\n".join(paragraphs)
+
+
+# =========================================
+# FILES
+# =========================================
+
+def write_pdf(lines: List[str], path: str) -> str:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    story = []
+    for line in lines:
+        if line.isupper():
+            story.append(Spacer(1, 8))
+            story.append(Paragraph(escape(line), styles["Heading2"]))
+        else:
+            story.append(Paragraph(escape(line), styles["Normal"]))
+
+    SimpleDocTemplate(path, pagesize=A4, invariant=True).build(story)
+    return path
+
+
+JOB_HEADING = re.compile(r"^(.+) \((\d{4} - \d{4})\)$")
+
+
+def write_docx(lines: List[str], path: str) -> str:
+    import docx
+
+    document = docx.Document()
+    fixed = datetime.datetime(2024, 1, 1)
+    document.core_properties.created = fixed
+    document.core_properties.modified = fixed
+    document.core_properties.author = "benchmarks"
+
+    for line in lines:
+        job = JOB_HEADING.match(line)
+        if line.isupper():
+            document.add_heading(line.title(), level=2)
+        elif job:
+            row = document.add_table(rows=1, cols=2).rows[0]
+            row.cells[0].text, row.cells[1].text = job.groups()
+        else:
+            document.add_paragraph(line)
+    document.save(path)
+    return path
+
+
+def build_corpus(directory: str, sizes: List[str], seed: int = 0) -> Dict[str, Dict[str, str]]:
+    """
+    Write one PDF and one DOCX resume plus a JD per size.
+    Returns {size: {"pdf": path, "docx": path, "resume_text": ..., "jd_text": ...}}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = {}
+    for size in sizes:
+        lines = resume_lines(size, seed)
+        corpus[size] = {
+            "pdf": write_pdf(lines, os.path.join(directory, f"resume_{size}.pdf")),
+            "docx": write_docx(lines, os.path.join(directory, f"resume_{size}.docx")),
+            "resume_text": "\n".join(lines),
+            "jd_text": job_description_text(size, seed),
+        }
+    return corpus
@@ -0,0 +1,217 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks.run                                  # all sizes, print + JSON
+    python -m benchmarks.run --sizes small medium --repeat 7
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.run --output benchmarks/baseline.json   # refresh the baseline
+
+With --compare the exit status is 1 when any stage's median is slower
+than the baseline by more than the threshold (and by more than the
+absolute noise floor), so the command can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_THRESHOLD = 0.25
+# Differences below this many milliseconds are treated as noise.
+DEFAULT_NOISE_FLOOR_MS = 2.0
+
+
+# =========================================
+# ENVIRONMENT
+# =========================================
+
+def setup_django(use_pool: bool = False) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    # Analyze inline and extract in-process unless the pool is being measured.
+    settings.ANALYSIS_USE_QUEUE = False
+    if not use_pool:
+        settings.EXTRACTION_POOL_SIZE = 0
+
+
+class TestEnvironment:
+    """Throwaway test database, media root and logged-in client."""
+
+    def __init__(self, media_root: str):
+        self.media_root = media_root
+
+    def __enter__(self):
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.test import Client
+        from django.test.runner import DiscoverRunner
+        from django.test.utils import setup_test_environment
+
+        settings.MEDIA_ROOT = self.media_root
+        settings.REPORT_CACHE_DIR = os.path.join(self.media_root, "reports")
+        settings.ANALYSIS_MEMOIZE = False
+        setup_test_environment()
+        self._runner = DiscoverRunner(verbosity=0)
+        self._old_config = self._runner.setup_databases()
+
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("benchmark", password="benchmark"))
+        return self
+
+    def __exit__(self, *exc):
+        from django.test.utils import teardown_test_environment
+
+        self._runner.teardown_databases(self._old_config)
+        teardown_test_environment()
+
+
+# =========================================
+# TIMING
+# =========================================
+
+def time_stage(stage, repeat: int, warmup: int = 1) -> Dict[str, object]:
+    for _ in range(warmup):
+        if stage.before_each:
+            stage.before_each()
+        stage.func()
+
+    samples = []
+    for _ in range(repeat):
+        if stage.before_each:
+            stage.before_each()
+        started = time.perf_counter()
+        stage.func()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "runs": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def run_suite(sizes: List[str], repeat: int, include_requests: bool = True,
+              stage_filter: Optional[str] = None, log=print) -> Dict[str, object]:
+    from matcher.services import current_analysis_version
+
+    from .corpus import build_corpus
+    from .stages import all_stages
+
+    results: Dict[str, Dict[str, object]] = {}
+    with tempfile.TemporaryDirectory(prefix="skillmatch-bench-") as workdir:
+        corpus = build_corpus(os.path.join(workdir, "corpus"), sizes)
+
+        with TestEnvironment(os.path.join(workdir, "media")) as env:
+            for size in sizes:
+                results[size] = {}
+                client = env.client if include_requests else None
+                for stage in all_stages(corpus[size], client):
+                    if stage_filter and stage_filter not in stage.name:
+                        continue
+                    stats = time_stage(stage, repeat)
+                    results[size][stage.name] = stats
+                    log(f"{size:>6}  {stage.name:<36} median {stats['median_ms']:>10.2f} ms")
+
+    import django
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "django": django.get_version(),
+            "engine_version": current_analysis_version(),
+            "repeat": repeat,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+# =========================================
+# BASELINE COMPARISON
+# =========================================
+
+def compare(current: Dict[str, object], baseline: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD,
+            noise_floor_ms: float = DEFAULT_NOISE_FLOOR_MS) -> List[Dict[str, object]]:
+    """Return one row per stage present in both runs, flagging regressions."""
+    rows = []
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {})
+        for name, stats in stages.items():
+            if name not in base_stages:
+                continue
+            old, new = base_stages[name]["median_ms"], stats["median_ms"]
+            ratio = new / old if old else float("inf")
+            rows.append({
+                "size": size,
+                "stage": name,
+                "baseline_ms": old,
+                "current_ms": new,
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + threshold and new - old > noise_floor_ms,
+            })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]], stream=sys.stdout) -> None:
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        stream.write(
+            f"{row['size']:>6}  {row['stage']:<36} {row['baseline_ms']:>10.2f} -> "
+            f"{row['current_ms']:>10.2f} ms  x{row['ratio']:<6} {flag}\n"
+        )
+
+
+# =========================================
+# CLI
+# =========================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .corpus import SIZES
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", default=None, help="Only run stages whose name contains this text.")
+    parser.add_argument("--skip-requests", action="store_true", help="Skip the Django test-client stages.")
+    parser.add_argument("--use-pool", action="store_true", help="Extract through the worker-process pool.")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file.")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline median (default 0.25).")
+    parser.add_argument("--noise-floor-ms", type=float, default=DEFAULT_NOISE_FLOOR_MS)
+    args = parser.parse_args(argv)
+
+    setup_django(use_pool=args.use_pool)
+    current = run_suite(args.sizes, args.repeat, not args.skip_requests, args.stage)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold, args.noise_floor_ms)
+        print_comparison(rows)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}.")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
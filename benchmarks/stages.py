@@ -0,0 +1,204 @@
+"""
+Benchmark stages: one entry per pipeline step that is timed separately.
+
+Analyzer stages receive plain strings, as external callers do, so each
+timing includes the document preparation that stage triggers on its own.
+"""
+import datetime
+import itertools
+import random
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from resume_diagnostics_engine.ats_scorer import calculate_ats_score
+from resume_diagnostics_engine.role_catalog import RoleCatalog
+
+from matcher import services
+from matcher.extraction import EXTRACTORS, extract_document, extract_text
+from matcher.utils import generate_resume_report
+
+# Every analyzer in matcher.services that takes (resume) or (resume, jd).
+RESUME_ANALYZERS = [
+    "diagnose_resume",
+    "detect_ats_template_risk",
+    "extract_technical_skills",
+    "extract_soft_skills",
+    "suggest_roles",
+]
+RESUME_JD_ANALYZERS = [
+    "jd_match_score",
+    "keyword_match_score",
+    "missing_skills",
+    "skill_gap_analysis",
+    "realistic_ats_score",
+    "ai_resume_suggestions",
+    "run_analysis",
+]
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[], object]
+    # Runs before every timed call, outside the measurement.
+    before_each: Optional[Callable[[], None]] = None
+
+
+def extraction_stages(entry: Dict[str, str]) -> List[Stage]:
+    return [
+        Stage("extract_text[pdf]", lambda: extract_text(entry["pdf"])),
+        Stage("extract_text[docx]", lambda: extract_text(entry["docx"])),
+    ] + docx_backend_stages(entry)
+
+
+def docx_backend_stages(entry: Dict[str, str]) -> List[Stage]:
+    """Each registered DOCX backend on its own, e.g. the streaming parser against python-docx."""
+    def run_backend(backend):
+        saved = EXTRACTORS[".docx"]
+        EXTRACTORS[".docx"] = [backend]
+        try:
+            result = extract_document(entry["docx"])
+        finally:
+            EXTRACTORS[".docx"] = saved
+        if not result.text:
+            raise RuntimeError(f"{backend.name} extracted no text")
+
+    return [
+        Stage(f"extract_docx[{backend.name}]", lambda backend=backend: run_backend(backend))
+        for backend in EXTRACTORS[".docx"]
+    ]
+
+
+def analyzer_stages(entry: Dict[str, str]) -> List[Stage]:
+    resume_text, jd_text = entry["resume_text"], entry["jd_text"]
+
+    stages = [Stage("clean_text", lambda: services.clean_text(resume_text))]
+    for name in RESUME_ANALYZERS:
+        func = getattr(services, name)
+        stages.append(Stage(f"services.{name}", lambda func=func: func(resume_text)))
+    for name in RESUME_JD_ANALYZERS:
+        func = getattr(services, name)
+        stages.append(Stage(f"services.{name}", lambda func=func: func(resume_text, jd_text)))
+
+    stages.append(Stage("calculate_ats_score", lambda: calculate_ats_score(resume_text, jd_text)))
+    return stages
+
+
+def memo_stages(entry: Dict[str, str]) -> List[Stage]:
+    """
+    Cache hits of a memoized analyzer. Memoization is otherwise switched
+    off while benchmarking, so the stages above time the real work.
+    """
+    from django.test.utils import override_settings
+
+    def cached_analysis():
+        with override_settings(ANALYSIS_MEMOIZE=True):
+            services.run_analysis(entry["resume_text"], entry["jd_text"])
+
+    return [Stage("run_analysis[memoized]", cached_analysis)]
+
+
+def synthetic_role_catalog(roles: int = 5000, vocabulary: int = 800, seed: int = 0) -> RoleCatalog:
+    """A catalog far larger than the shipped one, for checking recommendation latency."""
+    rng = random.Random(f"roles-{roles}-{seed}")
+    skills = [f"skill{i}" for i in range(vocabulary)]
+    return RoleCatalog(
+        {
+            "category": f"role_{i}",
+            "titles": [f"Role {i}"],
+            "skills": rng.sample(skills, rng.randint(3, 10)),
+            "min_experience": rng.randint(0, 5),
+        }
+        for i in range(roles)
+    )
+
+
+def role_catalog_stages() -> List[Stage]:
+    catalog = synthetic_role_catalog()
+    candidate = random.Random("candidate").sample([f"skill{i}" for i in range(800)], 25)
+    return [Stage(f"role_catalog.match[{len(catalog)} roles]", lambda: catalog.match(candidate, 3, k=5))]
+
+
+def report_stages(entry: Dict[str, str]) -> List[Stage]:
+    resume = SimpleNamespace(
+        user=SimpleNamespace(username="benchmark"),
+        uploaded_at=datetime.datetime(2024, 1, 1),
+        extracted_text=entry["resume_text"],
+        job_description=entry["jd_text"],
+        ats_score=72,
+    )
+    analysis = services.run_analysis(entry["resume_text"], entry["jd_text"])
+    return [Stage("generate_resume_report", lambda: generate_resume_report(resume, analysis))]
+
+
+def request_stages(entry: Dict[str, str], client) -> List[Stage]:
+    """
+    Full requests through the Django test client. Uploads are analyzed
+    inline (ANALYSIS_USE_QUEUE must be off) and the extraction cache is
+    cleared first, so every upload pays for extraction.
+    """
+    from django.urls import reverse
+
+    from matcher.models import ExtractionCache, Resume
+
+    def clear_cache():
+        ExtractionCache.objects.all().delete()
+
+    def upload(path):
+        with open(path, "rb") as f:
+            response = client.post(
+                reverse("matcher:upload_resume"),
+                {"resume": f, "job_description": entry["jd_text"]},
+            )
+        if response.status_code != 200:
+            raise RuntimeError(f"upload_resume returned {response.status_code}")
+
+    def latest_resume():
+        resume = Resume.objects.filter(analysis_status="completed").order_by("-id").first()
+        if resume is None:
+            # Only happens in the untimed warm-up call when uploads were filtered out.
+            upload(entry["pdf"])
+            resume = Resume.objects.filter(analysis_status="completed").order_by("-id").first()
+        return resume
+
+    def view_report():
+        response = client.get(reverse("matcher:resume_view", args=[latest_resume().id]))
+        if response.status_code != 200:
+            raise RuntimeError(f"view_resume_report returned {response.status_code}")
+
+    def download_report():
+        # The warm-up call renders the PDF; timed calls are served from the disk cache.
+        response = client.get(reverse("matcher:download_report", args=[latest_resume().id]))
+        if response.status_code != 200:
+            raise RuntimeError(f"download_report returned {response.status_code}")
+        b"".join(response.streaming_content)
+
+    postings = itertools.count()
+
+    def rematch():
+        # A posting not seen before every time, so the match is computed rather than reused.
+        response = client.post(
+            reverse("matcher:rematch", args=[latest_resume().id]),
+            {"job_description": f"{entry['jd_text']}\nPosting {next(postings)}"},
+        )
+        if response.status_code != 302 or "/match/" not in response.url:
+            raise RuntimeError(f"rematch returned {response.status_code}")
+
+    return [
+        Stage("upload_resume[pdf]", lambda: upload(entry["pdf"]), before_each=clear_cache),
+        Stage("upload_resume[docx]", lambda: upload(entry["docx"]), before_each=clear_cache),
+        Stage("view_resume_report", view_report),
+        Stage("download_report[cached]", download_report),
+        Stage("rematch_resume", rematch),
+    ]
+
+
+def all_stages(entry: Dict[str, str], client=None) -> List[Stage]:
+    stages = (
+        extraction_stages(entry) + analyzer_stages(entry) + memo_stages(entry)
+        + role_catalog_stages() + report_stages(entry)
+    )
+    if client is not None:
+        stages += request_stages(entry, client)
+    return stages
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Serve uploads and reports with the coroutine views (matcher.async_views).
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -47,7 +47,8 @@ INSTALLED_APPS = [
 # =========================================
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'matcher.middleware.RequestMetricsMiddleware',
+    'matcher.middleware.StaticFilesMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -131,7 +132,17 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # MEDIA FILES
 # =========================================
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_ROOT = os.getenv("MEDIA_ROOT") or os.path.join(BASE_DIR, 'media')
+
+# Rendered PDF reports, keyed by resume, analysis version and template version.
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR") or os.path.join(MEDIA_ROOT, 'reports')
+
+# Hash uploads as they stream in; the digest keys the extraction cache.
+FILE_UPLOAD_HANDLERS = [
+    "matcher.uploadhandlers.HashingUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
 
 # =========================================
 # LOGIN / LOGOUT
@@ -140,6 +151,118 @@ LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/login/"
 
+# =========================================
+# TEXT EXTRACTION
+# =========================================
+# Per-backend, per-document limits for the extractor registry
+# (matcher/extraction.py). Thin output falls through to the next backend.
+EXTRACTION_LIMITS = {
+    "time_budget": float(os.getenv("EXTRACTION_TIME_BUDGET", "10")),
+    "max_pages": int(os.getenv("EXTRACTION_MAX_PAGES", "50")),
+    "max_chars": int(os.getenv("EXTRACTION_MAX_CHARS", "200000")),
+    "min_chars_per_page": 200,
+}
+
+# Extraction runs in a pool of worker processes (0 = in-process).
+# A task exceeding the timeout or RSS limit has its worker killed and respawned;
+# PDFs longer than EXTRACTION_PAGES_PER_TASK pages are split across workers.
+EXTRACTION_POOL_SIZE = int(os.getenv("EXTRACTION_POOL_SIZE", "2"))
+EXTRACTION_WORKER_TIMEOUT = float(os.getenv("EXTRACTION_WORKER_TIMEOUT", "60"))
+EXTRACTION_WORKER_MAX_RSS_MB = int(os.getenv("EXTRACTION_WORKER_MAX_RSS_MB", "512"))
+EXTRACTION_PAGES_PER_TASK = 10
+
+# Files one batch ranking (web or rank_resumes) extracts and scores at once.
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "2"))
+
+# =========================================
+# BACKGROUND ANALYSIS QUEUE
+# =========================================
+# By default uploads are analyzed inside the request. Set
+# ANALYSIS_USE_QUEUE=True only where `python manage.py run_analysis_worker`
+# (the Procfile's worker process) is running, or uploads stay pending.
+ANALYSIS_USE_QUEUE = os.getenv("ANALYSIS_USE_QUEUE", "False") == "True"
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "5"))
+ANALYSIS_JOB_VISIBILITY_TIMEOUT = int(os.getenv("ANALYSIS_JOB_VISIBILITY_TIMEOUT", "300"))
+ANALYSIS_JOB_RETRY_BASE_DELAY = 10
+ANALYSIS_JOB_RETRY_MAX_DELAY = 600
+
+# =========================================
+# ASYNC VIEWS
+# =========================================
+# core.asgi turns ASYNC_VIEWS on, routing uploads and reports to the
+# coroutine views in matcher.async_views. Their blocking work runs on two
+# bounded thread pools per process (matcher.offload).
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False") == "True"
+ASYNC_CPU_WORKERS = int(os.getenv("ASYNC_CPU_WORKERS", "4"))
+ASYNC_IO_WORKERS = int(os.getenv("ASYNC_IO_WORKERS", "8"))
+
+# =========================================
+# CACHES
+# =========================================
+# The "analysis" cache memoizes deterministic analyzers (matcher.memo).
+# ANALYSIS_CACHE_BACKEND picks where entries live: locmem (per process,
+# LRU), file or db (shared by every gunicorn worker and the analysis
+# worker; db needs `python manage.py createcachetable`).
+ANALYSIS_MEMOIZE = os.getenv("ANALYSIS_MEMOIZE", "True") == "True"
+ANALYSIS_CACHE_BACKEND = os.getenv("ANALYSIS_CACHE_BACKEND", "locmem")
+_ANALYSIS_CACHE_LOCATIONS = {
+    "locmem": ("matcher.cache_backends.LocMemCache", "skillmatch-analysis"),
+    "file": (
+        "matcher.cache_backends.FileBasedCache",
+        os.getenv("ANALYSIS_CACHE_DIR") or os.path.join(BASE_DIR, 'cache', 'analysis'),
+    ),
+    "db": ("matcher.cache_backends.DatabaseCache", "matcher_analysis_cache"),
+}
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "analysis": {
+        "BACKEND": _ANALYSIS_CACHE_LOCATIONS[ANALYSIS_CACHE_BACKEND][0],
+        "LOCATION": _ANALYSIS_CACHE_LOCATIONS[ANALYSIS_CACHE_BACKEND][1],
+        "TIMEOUT": int(os.getenv("ANALYSIS_CACHE_TTL", "86400")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000")),
+            "CULL_FREQUENCY": 4,
+        },
+    },
+}
+
+# =========================================
+# HISTORY / RESUME SEARCH
+# =========================================
+HISTORY_PAGE_SIZE = 20
+
+# Rows fetched per database round trip by the streaming history export.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Full-text index: FTS5 on SQLite, tsvector + GIN on PostgreSQL.
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+# =========================================
+# METRICS
+# =========================================
+# Prometheus metrics are served at /metrics. Every process writes its own
+# file to METRICS_DIR, which must be shared by all gunicorn workers and the
+# analysis worker (defaults to <tmp>/skillmatch-metrics).
+METRICS_DIR = os.getenv("METRICS_DIR") or os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1.0"))
+# When set, /metrics requires "Authorization: Bearer <token>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "matcher.performance": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+    },
+}
+
 # =========================================
 # DEFAULT PRIMARY KEY
 # =========================================
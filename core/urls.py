@@ -7,6 +7,7 @@ from django.conf.urls.static import static
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('matcher.urls')),  # Your app
+    path('', include('jd_matcher.urls')),
 ]
 
 # 🔥 MEDIA FILES FOR UPLOADS (DEVELOPMENT ONLY)
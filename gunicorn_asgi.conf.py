@@ -0,0 +1,24 @@
+# Gunicorn settings for serving the ASGI application with uvicorn workers:
+#
+#     gunicorn core.asgi:application -c gunicorn_asgi.conf.py
+#
+# Each worker runs one event loop. Uploads and reports are coroutine views
+# (core.asgi turns ASYNC_VIEWS on), so a worker keeps many requests in
+# flight and only their blocking parts occupy the ASYNC_CPU_WORKERS /
+# ASYNC_IO_WORKERS thread pools. Size the database connection limit for
+# workers * (ASYNC_CPU_WORKERS + ASYNC_IO_WORKERS) plus the per-request
+# threads Django uses for sync ORM calls.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+# Far fewer processes than the sync setup needs: concurrency comes from the event loop.
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, multiprocessing.cpu_count() // 2)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to bound memory growth from PDF parsing.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+accesslog = "-"
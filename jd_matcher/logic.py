@@ -1,15 +1,10 @@
-import re
+from resume_diagnostics_engine.skill_matcher import SkillMatcher, get_matcher
 
-def extract_skills_from_jd(jd_text, known_skills):
-    jd_text = jd_text.lower()
-    found = []
-
-    for skill in known_skills:
-        pattern = rf"\b{re.escape(skill)}\b"
-        if re.search(pattern, jd_text):
-            found.append(skill)
 
-    return list(set(found))
+def extract_skills_from_jd(jd_text, known_skills):
+    """known_skills is a keyword list or an already compiled SkillMatcher."""
+    matcher = known_skills if isinstance(known_skills, SkillMatcher) else get_matcher(known_skills)
+    return matcher.find_all(jd_text or "")
 
 
 def calculate_match(resume_skills, jd_skills):
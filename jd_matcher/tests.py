@@ -1,3 +1,35 @@
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from matcher.tests import JD_TEXT, RESUME_TEXT, make_docx, make_pdf
+
+from .logic import calculate_match
+
+
+@override_settings(EXTRACTION_POOL_SIZE=0)
+class JdMatcherViewTests(TestCase):
+    def post(self, name, content):
+        return self.client.post("/jd-match/", {
+            "resume": SimpleUploadedFile(name, content),
+            "job_description": JD_TEXT,
+        })
+
+    def test_uploaded_pdf_and_docx_are_parsed_without_saving(self):
+        for name, content in (
+            ("resume.pdf", make_pdf([RESUME_TEXT])),
+            ("resume.docx", make_docx(RESUME_TEXT.splitlines())),
+        ):
+            with self.subTest(name), self.settings(MEDIA_ROOT="/nonexistent"):
+                response = self.post(name, content)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("kubernetes", response.context["matched_skills"])
+                self.assertGreater(response.context["match_percent"], 0)
+
+    def test_match_percent_covers_job_skills_only(self):
+        percent, matched, missing = calculate_match(["python", "excel"], ["python", "aws", "docker", "sql"])
+
+        self.assertEqual(percent, 25)
+        self.assertEqual(matched, ["python"])
+        self.assertEqual(sorted(missing), ["aws", "docker", "sql"])
+        self.assertEqual(calculate_match(["python"], []), (0, [], []))
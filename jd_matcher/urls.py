@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path
-from .views import jd_matcher_view
+from .views import jd_matcher_view, jd_matcher_view_async
 
 urlpatterns = [
-    path("jd-match/", jd_matcher_view, name="jd_match"),
+    path("jd-match/", jd_matcher_view_async if settings.ASYNC_VIEWS else jd_matcher_view, name="jd_match"),
 ]
@@ -1,8 +1,28 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from resume_diagnostics_engine.skill_extractor import extract_explicit_skills
-from resume_diagnostics_engine.constants import COMMON_SKILLS
+from resume_diagnostics_engine.skill_taxonomy import TECHNICAL, get_taxonomy
 from .logic import extract_skills_from_jd, calculate_match
-from matcher.services import extract_text_from_pdf
+from matcher.extraction import run_extraction
+from matcher.offload import run_cpu, run_io
+
+
+def match_resume_to_jd(resume_file, jd_text):
+    # The upload is parsed where it lies (memory or its temp file); nothing is saved.
+    resume_text = run_extraction(resume_file).text if resume_file else ""
+    resume_skills = extract_explicit_skills(resume_text)
+
+    jd_skills = extract_skills_from_jd(jd_text, get_taxonomy().matcher(TECHNICAL))
+
+    match_percent, matched, missing = calculate_match(
+        resume_skills, jd_skills
+    )
+
+    return {
+        "match_percent": match_percent,
+        "matched_skills": matched,
+        "missing_skills": missing,
+    }
 
 
 def jd_matcher_view(request):
@@ -12,22 +32,21 @@ def jd_matcher_view(request):
         resume_file = request.FILES.get("resume")
         jd_text = request.POST.get("job_description")
 
-        resume_text = extract_text_from_pdf(resume_file)
-        resume_skills = extract_explicit_skills(resume_text)
+        context.update(match_resume_to_jd(resume_file, jd_text))
 
-        jd_skills = extract_skills_from_jd(jd_text, COMMON_SKILLS)
+    return render(request, "jd_matcher/match.html", context)
 
-        match_percent, matched, missing = calculate_match(
-            resume_skills, jd_skills
-        )
 
-        context.update({
-            "match_percent": match_percent,
-            "matched_skills": matched,
-            "missing_skills": missing,
-        })
+def _read_form(request):
+    return request.FILES.get("resume"), request.POST.get("job_description")
 
-    return render(request, "jd_matcher/match.html", context)
 
+async def jd_matcher_view_async(request):
+    """jd_matcher_view for ASGI: parsing and matching run on matcher.offload's pools."""
+    context = {}
+
+    if request.method == "POST":
+        resume_file, jd_text = await run_io(_read_form, request)
+        context.update(await run_cpu(match_resume_to_jd, resume_file, jd_text))
 
-# Create your views here.
+    return await sync_to_async(render)(request, "jd_matcher/match.html", context)
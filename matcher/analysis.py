@@ -0,0 +1,202 @@
+import hashlib
+from typing import Dict, Optional
+
+from django.db.models import Exists
+from django.utils import timezone
+
+from . import metrics
+from .corpus import index_document
+from .extraction import extract_cached
+from .job_descriptions import get_job_document
+from .models import AnalysisSnapshot, CorpusDocument, JobDescription, JobMatch, Resume
+from .services import ResumeDocument, current_analysis_version, run_analysis, run_jd_analysis
+from .skills import store_resume_skills
+
+
+# =========================================
+# INPUT FINGERPRINT
+# =========================================
+
+def analysis_input_hash(resume_text: str, job_description: str) -> str:
+    digest = hashlib.sha256()
+    digest.update((resume_text or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((job_description or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+# =========================================
+# SNAPSHOT STORAGE
+# =========================================
+
+def analyze_and_store(resume: Resume) -> Dict[str, object]:
+    """
+    Run the full pipeline for a resume, persist the snapshot and
+    refresh the summary columns shown in history.
+    """
+    resume_text = resume.extracted_text or ""
+    job_description = resume.job_description or ""
+
+    resume_doc = ResumeDocument(resume_text)
+    # Built from the registry profile; the posting was indexed into the
+    # corpus when it was first registered.
+    job_doc = get_job_document(resume.job_posting)
+
+    with metrics.stage_timer("index_corpus"):
+        index_document(CorpusDocument.KIND_RESUME, resume.pk, resume_doc.term_vector)
+
+    with metrics.stage_timer("analysis"):
+        result = run_analysis(resume_doc, job_doc)
+
+    with metrics.stage_timer("store_snapshot"):
+        AnalysisSnapshot.objects.update_or_create(
+            resume=resume,
+            defaults={
+                "engine_version": current_analysis_version(),
+                "input_hash": analysis_input_hash(resume_text, job_description),
+                "result": result,
+            },
+        )
+
+    diagnosis = result["resume_diagnosis"]
+    resume.ats_score = result["ats_score"]
+    resume.jd_match_score = result["jd_score"]
+    resume.keyword_match_score = result["keyword_score"]
+    if result["suggested_roles"]:
+        resume.suggested_role = result["suggested_roles"][0]["role"]
+    resume.detected_skills = ", ".join(result["detected_skills"])
+    resume.missing_skills = ", ".join(result["missing"])
+    resume.overall_strength = diagnosis["overall_strength"]
+    resume.ats_readability = diagnosis["ats_readability"]
+    resume.strengths_summary = " | ".join(diagnosis["strengths"])
+    resume.weaknesses_summary = " | ".join(diagnosis["weaknesses"])
+    resume.suggestions_summary = " | ".join(diagnosis["suggestions"])
+    resume.analysis_status = "completed"
+    resume.analyzed_at = timezone.now()
+    resume.save()
+
+    with metrics.stage_timer("store_skills"):
+        store_resume_skills(resume, result)
+
+    return result
+
+
+def get_analysis(resume: Resume) -> Dict[str, object]:
+    """
+    Return the stored analysis for a resume, recomputing it only when the
+    engine version or the inputs changed since it was persisted.
+    """
+    try:
+        snapshot = resume.snapshot
+    except AnalysisSnapshot.DoesNotExist:
+        snapshot = None
+
+    if snapshot is not None:
+        input_hash = analysis_input_hash(resume.extracted_text, resume.job_description)
+        if snapshot.is_current(current_analysis_version(), input_hash):
+            return snapshot.result
+
+    return analyze_and_store(resume)
+
+
+# =========================================
+# UPLOAD PROCESSING
+# =========================================
+
+def process_resume(resume: Resume, upload=None) -> bool:
+    """
+    Extract and analyze an uploaded resume.
+    ``upload`` is the request's UploadedFile when it is still at hand: it is
+    parsed from memory (or its temporary file) instead of being read back
+    from storage.
+    Returns False when no text could be extracted; the resume is then
+    marked as failed because retrying the same file cannot succeed.
+    """
+    source = upload if upload is not None else resume.file.path
+    extraction = extract_cached(source, resume.file_sha256)
+    resume_text = extraction.text
+
+    if not resume_text.strip():
+        resume.extracted_text = ""
+        resume.analysis_status = "failed"
+        resume.analyzed_at = timezone.now()
+        resume.save()
+        metrics.ANALYSES.inc(status="failed")
+        return False
+
+    resume.extracted_text = resume_text
+    analyze_and_store(resume)
+    metrics.ANALYSES.inc(status="completed")
+    return True
+
+
+# =========================================
+# RE-MATCHING AGAINST ANOTHER JOB DESCRIPTION
+# =========================================
+
+def get_resume_document(resume: Resume) -> ResumeDocument:
+    """
+    A ResumeDocument whose keywords come from the term vector indexed
+    into the corpus at analysis time, so the text is not re-tokenized.
+    The vector is indexed together with the snapshot; when the snapshot
+    is from another engine or taxonomy version (whose aliases folded the
+    vector), the text is tokenized afresh instead.
+    """
+    document = ResumeDocument(resume.extracted_text or "")
+    current_snapshot = AnalysisSnapshot.objects.filter(
+        resume_id=resume.pk, engine_version=current_analysis_version()
+    )
+    stored = (
+        CorpusDocument.objects.filter(kind=CorpusDocument.KIND_RESUME, key=str(resume.pk))
+        .filter(Exists(current_snapshot))
+        .values_list("term_vector", flat=True)
+        .first()
+    )
+    if stored is not None:
+        document.term_vector = dict(stored)
+        document.keywords = set(stored)
+    return document
+
+
+def rematch_resume(resume: Resume, posting: JobDescription) -> JobMatch:
+    """
+    Score an analyzed resume against another posting and store the result
+    as a JobMatch. The resume's snapshot (refreshed first if stale) and
+    stored term vector supply every resume-side feature, so only the JD
+    overlap is computed; a current match for the same pair is returned as is.
+    """
+    match = JobMatch.objects.filter(resume=resume, job_posting=posting).first()
+    return _current_match(resume, posting, get_analysis(resume), match)
+
+
+def get_match_analysis(match: JobMatch) -> Dict[str, object]:
+    """The resume's full analysis with the match's JD-dependent outputs swapped in."""
+    analysis = dict(get_analysis(match.resume))
+    match = _current_match(match.resume, match.job_posting, analysis, match)
+    analysis.update(match.result)
+    return analysis
+
+
+def _current_match(resume: Resume, posting: JobDescription, analysis: Dict[str, object],
+                   match: Optional[JobMatch]) -> JobMatch:
+    version = current_analysis_version()
+    input_hash = analysis_input_hash(resume.extracted_text, posting.text)
+    if match is not None and match.is_current(version, input_hash):
+        return match
+
+    with metrics.stage_timer("rematch"):
+        result = run_jd_analysis(get_resume_document(resume), get_job_document(posting), analysis)
+
+    with metrics.stage_timer("store_match"):
+        match, _ = JobMatch.objects.update_or_create(
+            resume=resume,
+            job_posting=posting,
+            defaults={
+                "engine_version": version,
+                "input_hash": input_hash,
+                "ats_score": result["ats_score"],
+                "jd_match_score": result["jd_score"],
+                "result": result,
+            },
+        )
+    return match
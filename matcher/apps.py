@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class MatcherConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'matcher'
+
+    def ready(self):
+        from resume_diagnostics_engine.bm25 import set_corpus_provider
+        from resume_diagnostics_engine.role_catalog import get_catalog
+        from resume_diagnostics_engine.skill_taxonomy import get_taxonomy
+
+        from . import signals  # noqa: F401
+        from .corpus import DatabaseCorpusProvider
+
+        set_corpus_provider(DatabaseCorpusProvider())
+        # Load the role catalog and skill taxonomy at startup rather than on the first analysis.
+        get_catalog()
+        get_taxonomy()
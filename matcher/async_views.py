@@ -0,0 +1,134 @@
+"""
+Coroutine versions of the upload and report views, routed instead of the
+synchronous ones when ASYNC_VIEWS is on (core.asgi turns it on).
+
+While an upload is parsed, extracted and scored, the request only awaits:
+blocking work runs on the bounded pools in matcher.offload and ORM calls
+use Django's async API, so one ASGI worker keeps many uploads in flight
+instead of dedicating a thread to each for its whole lifetime.
+"""
+import functools
+import os
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+from django.shortcuts import redirect, render, resolve_url
+
+from .analysis import get_analysis, process_resume
+from .job_descriptions import register_job_description
+from .jobs import enqueue_analysis
+from .metrics import stage_timer
+from .models import AnalysisSnapshot, Resume
+from .offload import run_cpu, run_io
+from .views import build_report_context
+
+# Templates read request.user, which may hit the database: render where sync code is allowed.
+_render = sync_to_async(render)
+
+
+async def get_request_user(request):
+    """The authenticated user, resolved without blocking the event loop."""
+    def resolve():
+        user = request.user
+        user.is_authenticated  # forces the lazy session lookup
+        return user
+    return await sync_to_async(resolve)()
+
+
+def async_login_required(view=None, login_url="matcher:login"):
+    """login_required for coroutine views (Django 4.2's decorator only wraps sync views)."""
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            user = await get_request_user(request)
+            if not user.is_authenticated:
+                return redirect_to_login(request.get_full_path(), resolve_url(login_url))
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+
+    return decorator(view) if view is not None else decorator
+
+
+async def render_timed(request, template_name, context=None):
+    with stage_timer(f"render:{os.path.basename(template_name)}"):
+        return await _render(request, template_name, context)
+
+
+def _parse_form(request):
+    # Reading POST and FILES parses the multipart body, spooling large files to disk.
+    return request.POST, request.FILES
+
+
+# =========================================
+# MAIN ANALYSIS
+# =========================================
+
+@async_login_required
+async def upload_resume(request):
+    if request.method == "POST":
+        post, files = await run_io(_parse_form, request)
+        resume_file = files.get("resume")
+        job_description = post.get("job_description", "").strip()
+
+        if not resume_file:
+            messages.error(request, "Please upload a resume file.")
+            return redirect("matcher:upload_resume")
+
+        file_ext = os.path.splitext(resume_file.name)[1].lower()
+        if file_ext not in [".pdf", ".docx"]:
+            messages.error(request, "Only PDF and DOCX files are supported.")
+            return redirect("matcher:upload_resume")
+
+        # Profiling a new posting tokenizes and scans it: CPU work.
+        job_posting = await run_cpu(register_job_description, job_description)
+        resume = await Resume.objects.acreate(
+            user=await get_request_user(request),
+            file=resume_file,
+            file_sha256=getattr(request, "upload_sha256", {}).get("resume", ""),
+            job_posting=job_posting,
+        )
+
+        # Hand extraction and scoring to the background worker
+        if settings.ANALYSIS_USE_QUEUE:
+            await sync_to_async(enqueue_analysis)(resume)
+            return redirect("matcher:resume_view", resume_id=resume.id)
+
+        if not await run_cpu(process_resume, resume, resume_file):
+            messages.error(
+                request,
+                "Could not extract text from this resume. Please upload a cleaner PDF or DOCX file."
+            )
+            return redirect("matcher:upload_resume")
+
+        snapshot = await AnalysisSnapshot.objects.aget(resume_id=resume.id)
+        context = build_report_context(resume, snapshot.result)
+        return await render_timed(request, "matcher/results.html", context)
+
+    return await _render(request, "matcher/upload.html")
+
+
+# =========================================
+# HISTORY / REPORTS
+# =========================================
+
+@async_login_required
+async def view_resume_report(request, resume_id):
+    try:
+        resume = await Resume.objects.select_related("snapshot", "job_posting").aget(
+            id=resume_id,
+            user=await get_request_user(request),
+        )
+    except Resume.DoesNotExist:
+        raise Http404("No Resume matches the given query.")
+
+    if resume.analysis_status != "completed":
+        return await _render(request, "matcher/processing.html", {"resume": resume})
+
+    # Usually the stored snapshot; re-scored when the engine version changed.
+    analysis = await run_cpu(get_analysis, resume)
+
+    context = build_report_context(resume, analysis)
+    return await render_timed(request, "matcher/results.html", context)
@@ -0,0 +1,233 @@
+"""
+Batch scoring of many resumes against one job description.
+
+The job description is profiled once per batch; resumes are extracted
+in the isolated extraction pool and scored in parallel, and results are
+yielded as soon as each file finishes, so output can be streamed without
+holding the batch in memory.
+"""
+import csv
+import json
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .extraction import run_extraction
+from .services import (
+    JobDocument,
+    JobInput,
+    ResumeDocument,
+    as_job_document,
+    jd_match_score,
+    missing_skills,
+    realistic_ats_score,
+)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+RESULT_FIELDS = [
+    "file", "ats_score", "jd_match_score", "missing_skills",
+    "detected_skills", "extractor", "error",
+]
+
+STORED_RESULT_FIELDS = ["resume_id", "file", "user", "bm25_score"]
+
+# (display name, path or raw bytes, extension)
+BatchSource = Tuple[str, object, str]
+
+
+# =========================================
+# INPUT DISCOVERY
+# =========================================
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+
+def iter_directory_sources(directory: str) -> Iterator[BatchSource]:
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            ext = _extension(filename)
+            if ext in SUPPORTED_EXTENSIONS:
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory), path, ext
+
+
+def iter_zip_sources(zip_file) -> Iterator[BatchSource]:
+    """Yield ZIP members one at a time; ``zip_file`` is a path or file object."""
+    with zipfile.ZipFile(zip_file) as archive:
+        for info in archive.infolist():
+            ext = _extension(info.filename)
+            if info.is_dir() or ext not in SUPPORTED_EXTENSIONS:
+                continue
+            if os.path.basename(info.filename).startswith("."):
+                continue
+            yield info.filename, archive.read(info), ext
+
+
+def iter_sources(path: str) -> Iterator[BatchSource]:
+    if os.path.isdir(path):
+        return iter_directory_sources(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip_sources(path)
+    raise ValueError(f"{path} is neither a directory nor a ZIP archive")
+
+
+# =========================================
+# SCORING
+# =========================================
+
+def _score_source(job: JobDocument, name: str, source, ext: str) -> Dict[str, object]:
+    row = dict.fromkeys(RESULT_FIELDS, "")
+    row["file"] = name
+
+    try:
+        # The isolated extraction pool enforces the per-file timeout and RSS limit.
+        extraction = run_extraction(source, ext)
+        row["extractor"] = extraction.extractor
+        if not extraction.text:
+            row["error"] = extraction.error or "no text extracted"
+            return row
+
+        resume = ResumeDocument(extraction.text)
+        row["ats_score"], _ = realistic_ats_score(resume, job)
+        row["jd_match_score"], _ = jd_match_score(resume, job)
+        row["missing_skills"] = missing_skills(resume, job)
+        row["detected_skills"] = list(resume.tech_skills)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        close_old_connections()
+
+    return row
+
+
+# =========================================
+# BATCH RUNNER
+# =========================================
+
+def profile_job_description(jd: JobInput) -> JobDocument:
+    """Build the JD document (or complete a registry one) with every feature the scorers read."""
+    job = as_job_document(jd)
+    job.keywords
+    job.term_weights
+    job.tech_skills
+    return job
+
+
+def iter_batch_results(sources: Iterable[BatchSource], jd_text: JobInput,
+                       workers: Optional[int] = None) -> Iterator[Dict[str, object]]:
+    """
+    Score every source against the JD, yielding rows in completion order.
+
+    Files are extracted in the process-wide extraction pool, so a batch
+    never starts processes of its own; ``workers`` (default
+    BATCH_MAX_WORKERS) threads feed it and score the extracted text. At
+    most a few files per thread are in flight, so memory stays bounded no
+    matter how many files the batch contains.
+    """
+    job = profile_job_description(jd_text)
+    workers = max(1, workers or getattr(settings, "BATCH_MAX_WORKERS", 2))
+    max_in_flight = workers * 4
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+        pending = set()
+        for name, source, ext in sources:
+            pending.add(pool.submit(_score_source, job, name, source, ext))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def rank_stored(jd_text: JobInput, user=None, top_k: int = 20) -> List[Dict[str, object]]:
+    """
+    BM25-rank already analyzed resumes (all, or one user's) against the JD
+    from their stored corpus term vectors, best first; nothing is extracted.
+    """
+    from .corpus import rank_stored_resumes
+    from .models import Resume
+
+    job = profile_job_description(jd_text)
+    resume_ids = None
+    if user is not None:
+        resume_ids = list(Resume.objects.filter(user=user).values_list("id", flat=True))
+
+    ranked = rank_stored_resumes(job.keywords, resume_ids=resume_ids, top_k=top_k)
+    resumes = Resume.objects.select_related("user").only("file", "user__username").in_bulk(
+        [resume_id for resume_id, _ in ranked]
+    )
+    return [
+        {
+            "resume_id": resume_id,
+            "file": resumes[resume_id].file.name,
+            "user": resumes[resume_id].user.username,
+            "bm25_score": round(score, 4),
+        }
+        for resume_id, score in ranked
+        if resume_id in resumes
+    ]
+
+
+def rank_results(rows: Iterable[Dict[str, object]]):
+    """Order rows best-first: JD match, then ATS score; failed files last."""
+    return sorted(
+        rows,
+        key=lambda row: (
+            not row["error"],
+            row["jd_match_score"] or 0,
+            row["ats_score"] or 0,
+        ),
+        reverse=True,
+    )
+
+
+# =========================================
+# OUTPUT FORMATS
+# =========================================
+
+def _flatten(row: Dict[str, object]) -> Dict[str, object]:
+    return {
+        key: "; ".join(value) if isinstance(value, list) else value
+        for key, value in row.items()
+    }
+
+
+def format_jsonl(row: Dict[str, object]) -> str:
+    return json.dumps(row) + "\n"
+
+
+class _LineBuffer:
+    """File-like sink letting csv.writer format one row into a string."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv_lines(rows: Iterable[Dict[str, object]], fieldnames: Sequence[str] = RESULT_FIELDS) -> Iterator[str]:
+    writer = csv.DictWriter(_LineBuffer(), fieldnames=fieldnames)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(_flatten(row))
+
+
+def iter_jsonl_lines(rows: Iterable[Dict[str, object]]) -> Iterator[str]:
+    for row in rows:
+        yield format_jsonl(row)
+
+
+def write_results(rows: Iterable[Dict[str, object]], stream: TextIO, output_format: str = "jsonl",
+                  fieldnames: Sequence[str] = RESULT_FIELDS) -> None:
+    lines = iter_csv_lines(rows, fieldnames) if output_format == "csv" else iter_jsonl_lines(rows)
+    for line in lines:
+        stream.write(line)
+        stream.flush()
@@ -0,0 +1,59 @@
+"""
+Django cache backends that report evictions.
+
+Each subclass counts the entries its backend removes to stay under
+MAX_ENTRIES and adds them to skillmatch_cache_evictions_total, so the
+analysis cache's size cap can be tuned from /metrics. Behaviour is
+otherwise the stock backend's: local memory evicts least recently used
+entries, the file and database backends cull a share of entries once the
+cap is reached.
+"""
+import threading
+
+from django.core.cache.backends import db, filebased, locmem
+from django.db import connections
+
+from . import metrics
+
+
+class LocMemCache(locmem.LocMemCache):
+    """Per-process LRU cache."""
+
+    def _cull(self):
+        before = len(self._cache)
+        super()._cull()
+        metrics.CACHE_EVICTIONS.inc(before - len(self._cache), backend="locmem")
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """Directory of pickled entries, shared by every process on the host."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._culling = threading.local()
+
+    def _cull(self):
+        self._culling.count = 0
+        try:
+            super()._cull()
+        finally:
+            evicted, self._culling.count = self._culling.count, None
+        if evicted:
+            metrics.CACHE_EVICTIONS.inc(evicted, backend="file")
+
+    def _delete(self, fname):
+        deleted = super()._delete(fname)
+        if deleted and getattr(self._culling, "count", None) is not None:
+            self._culling.count += 1
+        return deleted
+
+
+class DatabaseCache(db.DatabaseCache):
+    """Cache table (``manage.py createcachetable``), shared by every process."""
+
+    def _cull(self, db, cursor, now, num):
+        super()._cull(db, cursor, now, num)
+        # Only reached when the table is over MAX_ENTRIES; expired rows count too.
+        table = connections[db].ops.quote_name(self._table)
+        cursor.execute("SELECT COUNT(*) FROM %s" % table)
+        metrics.CACHE_EVICTIONS.inc(max(num - cursor.fetchone()[0], 0), backend="db")
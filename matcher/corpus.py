@@ -0,0 +1,155 @@
+"""
+Database-backed corpus statistics for BM25 term weighting.
+
+Every analyzed resume and registered job description stores its term
+vector in CorpusDocument (job descriptions under their content hash). Document frequencies (CorpusTerm) and corpus totals
+(CorpusStatistics) are updated incrementally from the difference between
+a document's old and new vector, so indexing one document never rescans
+the corpus. rank_stored_resumes() ranks the stored resume vectors against
+a query (``rank_resumes --stored``).
+
+IDF weights follow the corpus: jd_match_score for an unchanged resume and
+JD drifts as documents are added. Stored snapshots and job matches keep
+the score computed at the time; their currency check (engine and taxonomy
+version) ignores the corpus, so re-analysis is not triggered by growth.
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F
+
+from resume_diagnostics_engine.bm25 import (
+    CorpusProvider,
+    CorpusView,
+    rank_documents,
+    term_weights,
+)
+
+from .models import CorpusDocument, CorpusStatistics, CorpusTerm
+
+# Stays under SQLite's bound-parameter limit for `term IN (...)` queries.
+_IN_CHUNK = 500
+
+
+def _chunks(items: List[str], size: int = _IN_CHUNK) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# =========================================
+# INCREMENTAL INDEXING
+# =========================================
+
+def _adjust_document_frequency(terms: Iterable[str], delta: int) -> None:
+    terms = sorted(terms)
+    if delta > 0:
+        CorpusTerm.objects.bulk_create(
+            [CorpusTerm(term=term) for term in terms], ignore_conflicts=True, batch_size=_IN_CHUNK
+        )
+    for chunk in _chunks(terms):
+        CorpusTerm.objects.filter(term__in=chunk).update(
+            document_frequency=F("document_frequency") + delta
+        )
+
+
+def _adjust_totals(doc_delta: int, length_delta: int) -> None:
+    CorpusStatistics.objects.get_or_create(pk=1)
+    CorpusStatistics.objects.filter(pk=1).update(
+        doc_count=F("doc_count") + doc_delta,
+        total_length=F("total_length") + length_delta,
+    )
+
+
+@transaction.atomic
+def index_document(kind: str, key, vector: Mapping[str, int]) -> CorpusDocument:
+    """Store a document's term vector and apply the statistics delta."""
+    key = str(key)
+    vector = dict(vector)
+    length = sum(vector.values())
+
+    document = CorpusDocument.objects.select_for_update().filter(kind=kind, key=key).first()
+    if document is not None and document.term_vector == vector:
+        return document  # re-analysis of unchanged text: the statistics stay as they are
+
+    old_terms = set(document.term_vector) if document else set()
+    new_terms = set(vector)
+
+    _adjust_document_frequency(new_terms - old_terms, +1)
+    _adjust_document_frequency(old_terms - new_terms, -1)
+    _adjust_totals(0 if document else 1, length - (document.length if document else 0))
+
+    if document is None:
+        document = CorpusDocument(kind=kind, key=key)
+    document.term_vector = vector
+    document.length = length
+    document.save()
+    return document
+
+
+@transaction.atomic
+def remove_document(kind: str, key) -> None:
+    document = CorpusDocument.objects.select_for_update().filter(kind=kind, key=str(key)).first()
+    if document is None:
+        return
+    _adjust_document_frequency(document.term_vector, -1)
+    _adjust_totals(-1, -document.length)
+    document.delete()
+
+
+@transaction.atomic
+def reset_corpus() -> None:
+    CorpusDocument.objects.all().delete()
+    CorpusTerm.objects.all().delete()
+    CorpusStatistics.objects.all().delete()
+
+
+# =========================================
+# STATISTICS PROVIDER
+# =========================================
+
+class DatabaseCorpusProvider(CorpusProvider):
+    """Reads totals and the requested terms' frequencies (two queries)."""
+
+    def view(self, terms: Iterable[str]) -> CorpusView:
+        totals = CorpusStatistics.objects.filter(pk=1).first()
+        if totals is None or not totals.doc_count:
+            return CorpusView()
+
+        frequencies: Dict[str, int] = {}
+        for chunk in _chunks(sorted(set(terms))):
+            frequencies.update(
+                CorpusTerm.objects.filter(term__in=chunk).values_list("term", "document_frequency")
+            )
+        return CorpusView(
+            doc_count=totals.doc_count,
+            avg_doc_length=totals.avg_doc_length,
+            document_frequencies=frequencies,
+        )
+
+
+# =========================================
+# CORPUS RANKING
+# =========================================
+
+def rank_stored_resumes(query_terms: Iterable[str], resume_ids: Optional[Iterable[int]] = None,
+                        top_k: int = 20, chunk_size: int = 500) -> List[Tuple[int, float]]:
+    """
+    BM25-rank stored resume term vectors against a query (e.g. a JD's
+    keywords) and return ``(resume_id, score)`` best-first.
+    """
+    query_terms = set(query_terms)
+    view = DatabaseCorpusProvider().view(query_terms)
+    weights = term_weights(query_terms, view)
+
+    documents = CorpusDocument.objects.filter(kind=CorpusDocument.KIND_RESUME)
+    if resume_ids is not None:
+        documents = documents.filter(key__in=[str(pk) for pk in resume_ids])
+
+    rows = documents.values_list("key", "term_vector", "length").iterator(chunk_size=chunk_size)
+    ranked = rank_documents(
+        weights,
+        ((int(key), vector, length) for key, vector, length in rows),
+        view.avg_doc_length,
+        top_k=top_k,
+    )
+    return ranked
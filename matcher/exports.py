@@ -0,0 +1,83 @@
+"""
+Streaming export of analysis history.
+
+Rows are read with values_list over the exported columns only and
+fetched EXPORT_CHUNK_SIZE at a time through QuerySet.iterator(), then
+formatted one line at a time, so memory stays flat however many resumes
+are exported. The output formats are the batch ranking's: JSONL keeps
+skill and diagnosis lists as arrays, CSV joins them with "; ".
+"""
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from .batch import iter_csv_lines, iter_jsonl_lines
+from .models import Resume
+
+# (output column, queryset lookup)
+EXPORT_COLUMNS = (
+    ("id", "id"),
+    ("username", "user__username"),
+    ("uploaded_at", "uploaded_at"),
+    ("analyzed_at", "analyzed_at"),
+    ("analysis_status", "analysis_status"),
+    ("job_title", "job_posting__title"),
+    ("ats_score", "ats_score"),
+    ("jd_match_score", "jd_match_score"),
+    ("keyword_match_score", "keyword_match_score"),
+    ("suggested_role", "suggested_role"),
+    ("detected_skills", "detected_skills"),
+    ("missing_skills", "missing_skills"),
+    ("overall_strength", "overall_strength"),
+    ("ats_readability", "ats_readability"),
+    ("strengths", "strengths_summary"),
+    ("weaknesses", "weaknesses_summary"),
+    ("suggestions", "suggestions_summary"),
+)
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+EXPORT_FORMATS = ("csv", "jsonl")
+
+# Columns stored joined into one string, and the separator they were joined with.
+_LIST_COLUMNS = {
+    "detected_skills": ",",
+    "missing_skills": ",",
+    "strengths": "|",
+    "weaknesses": "|",
+    "suggestions": "|",
+}
+_DATE_COLUMNS = ("uploaded_at", "analyzed_at")
+
+
+def export_queryset(user=None, status: Optional[str] = None) -> QuerySet:
+    """Resumes to export, oldest first; user=None covers every account."""
+    resumes = Resume.objects.order_by("id")
+    if user is not None:
+        resumes = resumes.filter(user=user)
+    if status:
+        resumes = resumes.filter(analysis_status=status)
+    return resumes
+
+
+def _export_row(values) -> Dict[str, object]:
+    row = dict(zip(EXPORT_FIELDS, values))
+    for name, separator in _LIST_COLUMNS.items():
+        row[name] = [item.strip() for item in (row[name] or "").split(separator) if item.strip()]
+    for name in _DATE_COLUMNS:
+        if row[name] is not None:
+            row[name] = row[name].isoformat()
+    return row
+
+
+def iter_export_rows(resumes: QuerySet, chunk_size: Optional[int] = None) -> Iterator[Dict[str, object]]:
+    rows = resumes.values_list(*(lookup for _, lookup in EXPORT_COLUMNS))
+    for values in rows.iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE):
+        yield _export_row(values)
+
+
+def iter_export_lines(resumes: QuerySet, output_format: str = "jsonl",
+                      chunk_size: Optional[int] = None) -> Iterator[str]:
+    rows = iter_export_rows(resumes, chunk_size)
+    if output_format == "csv":
+        return iter_csv_lines(rows, EXPORT_FIELDS)
+    return iter_jsonl_lines(rows)
@@ -0,0 +1,448 @@
+import hashlib
+import io
+import logging
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+
+from . import metrics
+from .models import ExtractionCache
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================
+# EXTRACTION RESULT / LIMITS
+# =========================================
+
+@dataclass
+class ExtractionResult:
+    text: str
+    page_count: int = 0
+    extractor: str = ""
+    extraction_ms: float = 0.0
+    cached: bool = False
+    truncated: bool = False
+    attempts: List[str] = field(default_factory=list)
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    # Wall-clock seconds one backend may spend on one document.
+    time_budget: float = 10.0
+    max_pages: int = 50
+    max_chars: int = 200_000
+    # Below this many characters per page the text is considered too thin
+    # and the next (higher fidelity) backend is tried.
+    min_chars_per_page: int = 200
+
+
+def get_extraction_limits() -> ExtractionLimits:
+    return ExtractionLimits(**getattr(settings, "EXTRACTION_LIMITS", {}))
+
+
+class _PageCollector:
+    """Accumulates page texts while enforcing the deadline and caps."""
+
+    def __init__(self, limits: ExtractionLimits, deadline: float,
+                 page_range: Optional[Tuple[int, int]] = None):
+        self.limits = limits
+        self.deadline = deadline
+        self.page_range = page_range
+        self.pages: List[str] = []
+        self.chars = 0
+        self.truncated = False
+
+    def accepting(self) -> bool:
+        if len(self.pages) >= self.limits.max_pages or self.chars >= self.limits.max_chars:
+            self.truncated = True
+            return False
+        if time.monotonic() > self.deadline:
+            self.truncated = True
+            return False
+        return True
+
+    def add(self, text: Optional[str]) -> None:
+        text = (text or "").strip()
+        self.pages.append(text)
+        self.chars += len(text)
+
+    def text(self) -> str:
+        text = "\n".join(page for page in self.pages if page)
+        if len(text) > self.limits.max_chars:
+            self.truncated = True
+        return text[:self.limits.max_chars].strip()
+
+    def selected(self, sequence):
+        """Restrict a backend's page sequence to the requested page range."""
+        if self.page_range is None:
+            return sequence
+        start, stop = self.page_range
+        return sequence[start:stop]
+
+
+# =========================================
+# BACKEND REGISTRY
+# =========================================
+
+# A backend receives a path or binary file object and returns
+# (page_collector, total_page_count).
+BackendFunc = Callable[[object, _PageCollector], Tuple[_PageCollector, int]]
+
+
+@dataclass(frozen=True)
+class ExtractorBackend:
+    name: str
+    func: BackendFunc
+    time_budget: Optional[float] = None
+
+
+EXTRACTORS: Dict[str, List[ExtractorBackend]] = {}
+
+# Stamped on ExtractionCache entries; bump it whenever a backend's output
+# changes (such as DOCX table text) so earlier extractions are redone.
+EXTRACTION_VERSION = "3"
+
+
+def register_extractor(ext: str, name: str, time_budget: Optional[float] = None):
+    """
+    Register a backend for a file extension.
+    Backends run in registration order, so register fast ones first.
+    """
+    def decorator(func: BackendFunc) -> BackendFunc:
+        backends = EXTRACTORS.setdefault(ext.lower(), [])
+        backends[:] = [b for b in backends if b.name != name]
+        backends.append(ExtractorBackend(name=name, func=func, time_budget=time_budget))
+        return func
+    return decorator
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def source_ext(source) -> str:
+    """File extension of a path or of an uploaded/named file object."""
+    return os.path.splitext(str(getattr(source, "name", source)))[1].lower()
+
+
+def as_extraction_source(source):
+    """
+    Read uploads in place: an UploadedFile is unwrapped to the BytesIO
+    (in-memory upload) or temporary file behind it, which backends can
+    parse directly instead of a copy saved to MEDIA_ROOT and read back.
+    Paths, bytes and other file objects are returned unchanged.
+    """
+    if isinstance(source, UploadedFile):
+        source = source.file
+        # A temporary upload is wrapped by tempfile, which parsers such as
+        # pdfminer do not accept as a stream; hand them the file inside.
+        if not isinstance(source, io.IOBase):
+            source = getattr(source, "file", source)
+    return source
+
+
+@register_extractor(".pdf", "pypdf2")
+def _extract_pdf_pypdf2(source, pages: _PageCollector):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(_rewind(source))
+    if reader.is_encrypted:
+        raise ValueError("encrypted PDF")
+
+    for page in pages.selected(reader.pages):
+        if not pages.accepting():
+            break
+        pages.add(page.extract_text())
+    return pages, len(reader.pages)
+
+
+@register_extractor(".pdf", "pdfminer")
+def _extract_pdf_pdfminer(source, pages: _PageCollector):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    page_numbers = range(*pages.page_range) if pages.page_range else None
+    for layout in extract_pages(_rewind(source), page_numbers=page_numbers,
+                                maxpages=pages.limits.max_pages):
+        if not pages.accepting():
+            break
+        pages.add("".join(
+            element.get_text() for element in layout if isinstance(element, LTTextContainer)
+        ))
+    return pages, len(pages.pages)
+
+
+@register_extractor(".pdf", "pdfplumber")
+def _extract_pdf_pdfplumber(source, pages: _PageCollector):
+    import pdfplumber
+
+    with pdfplumber.open(_rewind(source)) as pdf:
+        for page in pages.selected(pdf.pages):
+            if not pages.accepting():
+                break
+            pages.add(page.extract_text())
+            page.flush_cache()
+        return pages, len(pdf.pages)
+
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _WORD_NS + "body"
+_W_PARAGRAPH = _WORD_NS + "p"
+_W_TEXT = _WORD_NS + "t"
+# Word saves a text box twice: as DrawingML in mc:Choice and as VML in
+# mc:Fallback, for readers without DrawingML. Only the former is read.
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run content that python-docx also renders as whitespace.
+_W_WHITESPACE = {_WORD_NS + "tab": "\t", _WORD_NS + "br": "\n", _WORD_NS + "cr": "\n"}
+
+
+@register_extractor(".docx", "docx-stream")
+def _extract_docx_stream(source, pages: _PageCollector):
+    """
+    Stream word/document.xml out of the zip with iterparse. Paragraphs,
+    including those in table cells and text boxes (whose mc:Fallback copy
+    is skipped), come out one per line in document order; finished body blocks are cleared as the parse goes,
+    so memory stays bounded by the largest paragraph or table.
+    """
+    import zipfile
+    from xml.etree.ElementTree import iterparse
+
+    lines: List[str] = []
+    chars = 0
+    with zipfile.ZipFile(_rewind(source)) as archive, archive.open("word/document.xml") as xml:
+        body = None
+        # Text of the open paragraphs; text-box paragraphs nest inside another.
+        open_paragraphs: List[List[str]] = []
+        fallback_depth = 0
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+
+            if event == "start":
+                if tag == _W_PARAGRAPH:
+                    open_paragraphs.append([])
+                elif tag == _W_BODY:
+                    body = elem
+                continue
+
+            if tag == _W_TEXT:
+                if open_paragraphs:
+                    open_paragraphs[-1].append(elem.text or "")
+            elif tag in _W_WHITESPACE:
+                if open_paragraphs:
+                    open_paragraphs[-1].append(_W_WHITESPACE[tag])
+            elif tag == _W_PARAGRAPH:
+                text = "".join(open_paragraphs.pop())
+                if text.strip():
+                    lines.append(text)
+                    chars += len(text) + 1
+
+            if body is not None and len(body) and elem is body[-1]:
+                # A top-level paragraph, table or section has been read.
+                body.clear()
+                if chars >= pages.limits.max_chars or time.monotonic() > pages.deadline:
+                    pages.truncated = True
+                    break
+
+    if not lines:
+        raise ValueError("no text in word/document.xml")
+    pages.add("\n".join(lines))
+    return pages, 0
+
+
+@register_extractor(".docx", "python-docx")
+def _extract_docx_python_docx(source, pages: _PageCollector):
+    import docx
+
+    doc = docx.Document(_rewind(source))
+    pages.add("\n".join(
+        para.text for para in doc.paragraphs if para.text.strip()
+    ))
+    return pages, 0
+
+
+def _looks_thin(text: str, page_count: int, limits: ExtractionLimits) -> bool:
+    # Page-less formats (DOCX) report 0 pages: their first backend reads the
+    # whole text layer, so a short document is not a reason to try another.
+    if not page_count:
+        return not text
+    return len(text) < limits.min_chars_per_page * page_count
+
+
+# =========================================
+# FILE TEXT EXTRACTION
+# =========================================
+
+def extract_document(file_path, ext: Optional[str] = None,
+                     limits: Optional[ExtractionLimits] = None,
+                     page_range: Optional[Tuple[int, int]] = None) -> ExtractionResult:
+    """
+    Extract text with the backends registered for the file type.
+    ``file_path`` may also be raw bytes, a binary file object or an
+    UploadedFile; ``ext`` is required when it has no name to go by. The
+    first backend whose output is not too thin wins; otherwise the longest
+    output across all backends is returned.
+    """
+    ext = (ext or source_ext(file_path)).lower()
+    limits = limits or get_extraction_limits()
+    file_path = as_extraction_source(file_path)
+    if isinstance(file_path, (bytes, bytearray, memoryview)):
+        file_path = io.BytesIO(file_path)
+    started = time.perf_counter()
+
+    best: Optional[ExtractionResult] = None
+    attempts: List[str] = []
+
+    for backend in EXTRACTORS.get(ext, []):
+        budget = backend.time_budget or limits.time_budget
+        collector = _PageCollector(limits, time.monotonic() + budget, page_range)
+        attempts.append(backend.name)
+
+        try:
+            collector, page_count = backend.func(file_path, collector)
+        except Exception as e:
+            logger.warning("Extractor %s failed on %s: %s", backend.name, file_path, e)
+            continue
+
+        result = ExtractionResult(
+            text=collector.text(),
+            page_count=page_count,
+            extractor=backend.name,
+            truncated=collector.truncated,
+        )
+        if best is None or len(result.text) > len(best.text):
+            best = result
+        pages_read = len(collector.pages) if page_range else page_count
+        if not _looks_thin(result.text, pages_read, limits):
+            break
+
+    if best is None:
+        return ExtractionResult(text="", attempts=attempts)
+
+    return replace(
+        best,
+        extraction_ms=round((time.perf_counter() - started) * 1000, 2),
+        attempts=attempts,
+    )
+
+
+def run_extraction(source, ext: Optional[str] = None) -> ExtractionResult:
+    """
+    Single entry point for callers that extract uploads. ``source`` is a
+    path, raw bytes, a file object or an UploadedFile still in memory.
+    Runs in the isolated worker-process pool when EXTRACTION_POOL_SIZE > 0,
+    in-process otherwise.
+    """
+    ext = (ext or source_ext(source)).lower()
+
+    with metrics.stage_timer("extract"):
+        if getattr(settings, "EXTRACTION_POOL_SIZE", 0) > 0:
+            # Imported lazily: the pool module builds on this one.
+            from .extraction_pool import get_extraction_pool
+            result = get_extraction_pool().extract(source, ext)
+        else:
+            result = extract_document(source, ext)
+
+    _record_extraction(source, ext, result)
+    return result
+
+
+def _source_size(source) -> int:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if isinstance(source, UploadedFile):
+        return source.size or 0
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    try:
+        return os.path.getsize(source)
+    except (OSError, TypeError):
+        return 0
+
+
+def _record_extraction(source, ext: str, result: ExtractionResult) -> None:
+    metrics.DOCUMENTS_PROCESSED.inc(ext=ext, extractor=result.extractor or "none")
+    metrics.DOCUMENT_BYTES.observe(_source_size(source), ext=ext)
+    if result.page_count:
+        metrics.DOCUMENT_PAGES.observe(result.page_count, ext=ext)
+    if not result.text:
+        metrics.EXTRACTION_FAILURES.inc(ext=ext)
+
+
+def extract_text(file_path):
+    """
+    Extract text from PDF or DOCX file.
+    """
+    return run_extraction(file_path).text
+
+
+# =========================================
+# CONTENT-ADDRESSED CACHE
+# =========================================
+
+def file_sha256(file_path, chunk_size=64 * 1024) -> str:
+    """SHA-256 of a path, or of a file object read from the start."""
+    digest = hashlib.sha256()
+    source = as_extraction_source(file_path)
+    if hasattr(source, "read"):
+        _rewind(source)
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_cached(file_path, sha256="", ext: Optional[str] = None) -> ExtractionResult:
+    """
+    Extract text, reusing a previous extraction of byte-identical content.
+    Extracted text depends only on the file bytes and EXTRACTION_VERSION,
+    so entries are shared across users. Empty extractions, and extractions cut short by the
+    time, page or character budget, are not cached. ``file_path`` may be an
+    upload that has not been read back from storage; pass the digest the
+    upload handler computed to skip hashing it again.
+    """
+    sha256 = sha256 or file_sha256(file_path)
+
+    entry = ExtractionCache.objects.filter(sha256=sha256, extraction_version=EXTRACTION_VERSION).first()
+    metrics.EXTRACTION_CACHE.inc(result="hit" if entry is not None else "miss")
+    if entry is not None:
+        return ExtractionResult(
+            text=entry.extracted_text,
+            page_count=entry.page_count,
+            extractor=entry.extractor,
+            extraction_ms=entry.extraction_ms,
+            cached=True,
+        )
+
+    result = run_extraction(file_path, ext)
+    if result.text and not result.truncated:
+        # Replaces an entry left by an older extraction version.
+        ExtractionCache.objects.update_or_create(
+            sha256=sha256,
+            defaults={
+                "extracted_text": result.text,
+                "page_count": result.page_count,
+                "extractor": result.extractor,
+                "extraction_ms": result.extraction_ms,
+                "extraction_version": EXTRACTION_VERSION,
+            },
+        )
+    return result
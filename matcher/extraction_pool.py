@@ -0,0 +1,256 @@
+"""
+Persistent pool of extraction worker processes.
+
+PDF parsing is CPU-bound and occasionally pathological, so it runs outside
+the web/worker process. Every task has a hard timeout; a worker that times
+out, dies, or grows past the RSS limit is killed and replaced. Long PDFs are
+split into page ranges that are extracted in parallel.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+from .extraction import (
+    ExtractionLimits, ExtractionResult, as_extraction_source, get_extraction_limits, source_ext,
+)
+from .extraction_worker import worker_main
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux only, None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# =========================================
+# WORKER PROCESS
+# =========================================
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=worker_main,
+            args=(child_conn, os.environ.get("DJANGO_SETTINGS_MODULE")),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class WorkerFailure(Exception):
+    pass
+
+
+# =========================================
+# POOL
+# =========================================
+
+class ExtractionPool:
+    def __init__(self, size: int, timeout: float, max_rss_mb: Optional[float] = None,
+                 pages_per_task: int = 10):
+        self.size = size
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.pages_per_task = pages_per_task
+
+        # Spawned children never inherit the parent's threads or DB connections.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(size):
+            self._spawn()
+
+        # Page-range tasks are dispatched from threads so one caller can
+        # keep several worker processes busy.
+        self._dispatcher = ThreadPoolExecutor(max_workers=size, thread_name_prefix="extraction")
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        if not self._closed:
+            self._spawn()
+
+    def _over_rss_limit(self, worker: _Worker) -> bool:
+        if not self.max_rss_mb:
+            return False
+        rss = _rss_mb(worker.process.pid)
+        return rss is not None and rss > self.max_rss_mb
+
+    def _run(self, task: Tuple):
+        """Run one task on an idle worker, enforcing the hard timeout and RSS limit."""
+        worker = self._idle.get(timeout=self.timeout)
+        while not worker.process.is_alive():
+            # Died while idle (e.g. killed by the OS): the task has not started yet.
+            logger.warning("Extraction worker %s found dead and replaced", worker.process.pid)
+            self._replace(worker)
+            worker = self._idle.get(timeout=self.timeout)
+        deadline = time.monotonic() + self.timeout
+
+        try:
+            worker.conn.send(task)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WorkerFailure(f"timed out after {self.timeout}s")
+                if worker.conn.poll(min(remaining, 0.25)):
+                    status, payload = worker.conn.recv()
+                    break
+                if not worker.process.is_alive():
+                    raise WorkerFailure("worker process died")
+                if self._over_rss_limit(worker):
+                    raise WorkerFailure("exceeded RSS limit")
+        except (WorkerFailure, EOFError, OSError) as e:
+            logger.warning("Extraction worker %s replaced: %s", worker.process.pid, e)
+            self._replace(worker)
+            raise WorkerFailure(str(e)) from e
+        except BaseException:
+            self._idle.put(worker)
+            raise
+
+        # A worker that finished but ballooned is recycled before its next task.
+        if self._over_rss_limit(worker):
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+        if status == "error":
+            raise WorkerFailure(payload)
+        return payload
+
+    def extract(self, source, ext: Optional[str] = None,
+                limits: Optional[ExtractionLimits] = None) -> ExtractionResult:
+        """
+        Extract a document in the pool. ``source`` is a path, raw bytes or
+        a file object (such as an upload); file contents are sent to the
+        worker as bytes. Failures are reported on the result rather than raised.
+        """
+        ext = (ext or source_ext(source)).lower()
+        limits = limits or get_extraction_limits()
+        source = as_extraction_source(source)
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif hasattr(source, "getvalue"):
+            source = source.getvalue()
+        elif hasattr(source, "read"):
+            source.seek(0)
+            source = source.read()
+        started = time.perf_counter()
+
+        try:
+            total_pages = 0
+            if ext == ".pdf" and self.size > 1:
+                total_pages = self._run(("count_pages", source, ext, None, None))
+
+            if min(total_pages, limits.max_pages) > self.pages_per_task:
+                result = self._extract_ranges(source, ext, limits, total_pages)
+            else:
+                result = self._run(("extract", source, ext, limits, None))
+        except (WorkerFailure, queue.Empty) as e:
+            return ExtractionResult(
+                text="",
+                error=str(e) or "no extraction worker available",
+                extraction_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+
+        result.extraction_ms = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    def _extract_ranges(self, source, ext, limits, total_pages) -> ExtractionResult:
+        page_count = min(total_pages, limits.max_pages)
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        futures = [
+            self._dispatcher.submit(self._run, ("extract", source, ext, limits, page_range))
+            for page_range in ranges
+        ]
+        parts: List[ExtractionResult] = [future.result() for future in futures]
+
+        text = "\n".join(part.text for part in parts if part.text)
+        extractors = []
+        for part in parts:
+            if part.extractor and part.extractor not in extractors:
+                extractors.append(part.extractor)
+
+        return ExtractionResult(
+            text=text[:limits.max_chars].strip(),
+            page_count=total_pages,
+            extractor="+".join(extractors),
+            truncated=(total_pages > page_count or len(text) > limits.max_chars
+                       or any(part.truncated for part in parts)),
+            attempts=sorted({name for part in parts for name in part.attempts}),
+        )
+
+    def close(self) -> None:
+        self._closed = True
+        self._dispatcher.shutdown(wait=False)
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+
+# =========================================
+# PROCESS-WIDE POOL
+# =========================================
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return this process's pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(
+                size=settings.EXTRACTION_POOL_SIZE,
+                timeout=getattr(settings, "EXTRACTION_WORKER_TIMEOUT", 60),
+                max_rss_mb=getattr(settings, "EXTRACTION_WORKER_MAX_RSS_MB", None),
+                pages_per_task=getattr(settings, "EXTRACTION_PAGES_PER_TASK", 10),
+            )
+            atexit.register(_pool.close)
+        return _pool
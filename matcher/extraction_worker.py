@@ -0,0 +1,45 @@
+"""
+Entry point of an extraction pool worker process.
+
+Kept free of module-level Django imports: spawned children import this
+module before Django is configured.
+"""
+import io
+import os
+
+
+def worker_main(conn, settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module or "core.settings")
+    import django
+    django.setup()
+
+    from matcher.extraction import extract_document
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        action, source, ext, limits, page_range = task
+        try:
+            if isinstance(source, bytes):
+                source = io.BytesIO(source)
+            if action == "count_pages":
+                conn.send(("ok", _count_pdf_pages(source)))
+            else:
+                conn.send(("ok", extract_document(source, ext=ext, limits=limits, page_range=page_range)))
+        except BaseException as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _count_pdf_pages(source) -> int:
+    # Zero means "unknown": the document is then extracted as one task,
+    # letting the fallback backends handle files PyPDF2 cannot open.
+    import PyPDF2
+    try:
+        return len(PyPDF2.PdfReader(source).pages)
+    except Exception:
+        return 0
@@ -0,0 +1,72 @@
+"""
+Keyset (cursor) pagination for a user's resume history.
+
+Pages are ordered by (uploaded_at, id) descending, the Resume default
+ordering, and served by the (user, -uploaded_at, -id) index. A page is
+found by seeking past the last row of the previous one, so deep pages cost
+the same as the first; only the columns the list shows are loaded.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Resume
+
+# Everything history.html and the JSON feed read; the large text columns
+# (extracted_text and the summaries) are never fetched.
+HISTORY_FIELDS = (
+    "id", "user_id", "ats_score", "suggested_role", "detected_skills",
+    "analysis_status", "uploaded_at",
+)
+
+
+@dataclass
+class HistoryPage:
+    items: List[Resume] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(resume: Resume) -> str:
+    payload = json.dumps([resume.uploaded_at.isoformat(), resume.id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for anything that is not a cursor we issued."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        uploaded_at, resume_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(uploaded_at), int(resume_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"invalid history cursor: {cursor!r}") from e
+
+
+def get_history_page(user, cursor: Optional[str] = None, page_size: Optional[int] = None) -> HistoryPage:
+    page_size = page_size or getattr(settings, "HISTORY_PAGE_SIZE", 20)
+
+    queryset = (
+        Resume.objects.filter(user=user)
+        .only(*HISTORY_FIELDS)
+        .order_by("-uploaded_at", "-id")
+    )
+    if cursor:
+        uploaded_at, resume_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(uploaded_at__lt=uploaded_at) | Q(uploaded_at=uploaded_at, id__lt=resume_id)
+        )
+
+    # One extra row tells whether another page exists without a COUNT.
+    rows = list(queryset[:page_size + 1])
+    page = HistoryPage(items=rows[:page_size])
+    if len(rows) > page_size:
+        page.next_cursor = encode_cursor(rows[page_size - 1])
+    return page
@@ -0,0 +1,167 @@
+"""
+Registry of distinct job descriptions.
+
+A pasted or imported posting is normalized and hashed; identical postings
+share one JobDescription row whose term vector and skill hits are computed
+once. Analyses build their JobDocument from that stored profile instead of
+re-cleaning and re-tokenizing the text on every request.
+"""
+import hashlib
+import unicodedata
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from django.db import IntegrityError, transaction
+
+from . import metrics
+from .corpus import index_document
+from .models import CorpusDocument, JobDescription
+from .services import JobDocument, current_analysis_version
+
+
+def normalize_job_text(text: Optional[str]) -> str:
+    """NFKC, collapse runs of spaces, drop blank lines; line breaks are kept."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def job_content_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# =========================================
+# PROFILES
+# =========================================
+
+def build_profile(text: str) -> Dict[str, object]:
+    job = JobDocument(text)
+    return {
+        "term_vector": job.term_vector,
+        "tech_skills": list(job.tech_skills),
+        "profile_version": current_analysis_version(),
+    }
+
+
+def _index(posting: JobDescription) -> None:
+    index_document(CorpusDocument.KIND_JOB, posting.content_hash, posting.term_vector)
+
+
+def ensure_profile(posting: JobDescription) -> JobDescription:
+    """Recompute a profile written by an older engine version (or never written)."""
+    if posting.profile_version == current_analysis_version():
+        return posting
+
+    with metrics.stage_timer("profile_job_description"):
+        for field, value in build_profile(posting.text).items():
+            setattr(posting, field, value)
+        posting.save(update_fields=["term_vector", "tech_skills", "profile_version"])
+        _index(posting)
+    return posting
+
+
+def get_job_document(posting: Optional[JobDescription]) -> JobDocument:
+    """A JobDocument whose features come from the stored profile."""
+    if posting is None:
+        return JobDocument("")
+
+    ensure_profile(posting)
+    job = JobDocument(posting.text)
+    # Seed the lazily computed features so the text is never re-tokenized.
+    job.term_vector = dict(posting.term_vector)
+    job.keywords = set(posting.term_vector)
+    job.tech_skills = list(posting.tech_skills)
+    return job
+
+
+# =========================================
+# REGISTRATION
+# =========================================
+
+def register_job_description(text: Optional[str], title: str = "", source: str = "upload",
+                             external_id: str = "") -> Optional[JobDescription]:
+    """
+    Return the registry row for this posting, creating and profiling it
+    the first time it is seen. Blank text returns None.
+    """
+    normalized = normalize_job_text(text)
+    if not normalized:
+        return None
+
+    content_hash = job_content_hash(normalized)
+    posting = JobDescription.objects.filter(content_hash=content_hash).first()
+    if posting is not None:
+        return ensure_profile(posting)
+
+    try:
+        with transaction.atomic():
+            with metrics.stage_timer("profile_job_description"):
+                posting = JobDescription.objects.create(
+                    content_hash=content_hash,
+                    text=normalized,
+                    title=title[:200],
+                    source=source,
+                    external_id=external_id[:200],
+                    **build_profile(normalized),
+                )
+                # Counted in the corpus before any resume is scored against it.
+                _index(posting)
+    except IntegrityError:
+        # Another request registered the same posting first.
+        posting = JobDescription.objects.get(content_hash=content_hash)
+    return posting
+
+
+def _import_chunk(records: List[Mapping[str, object]], source: str, counts: Dict[str, int]) -> None:
+    pending: Dict[str, JobDescription] = {}
+    for record in records:
+        normalized = normalize_job_text(str(record.get("text") or record.get("description") or ""))
+        if not normalized:
+            counts["skipped"] += 1
+            continue
+        content_hash = job_content_hash(normalized)
+        if content_hash in pending:
+            counts["existing"] += 1
+            continue
+        pending[content_hash] = JobDescription(
+            content_hash=content_hash,
+            text=normalized,
+            title=str(record.get("title") or "")[:200],
+            source=str(record.get("source") or source)[:50],
+            external_id=str(record.get("id") or record.get("external_id") or "")[:200],
+        )
+
+    known = set(
+        JobDescription.objects.filter(content_hash__in=list(pending)).values_list("content_hash", flat=True)
+    )
+    counts["existing"] += len(known)
+
+    new = []
+    for content_hash, posting in pending.items():
+        if content_hash in known:
+            continue
+        for field, value in build_profile(posting.text).items():
+            setattr(posting, field, value)
+        new.append(posting)
+
+    with transaction.atomic():
+        JobDescription.objects.bulk_create(new, ignore_conflicts=True)
+        for posting in new:
+            _index(posting)
+    counts["created"] += len(new)
+
+
+def import_job_descriptions(records: Iterable[Mapping[str, object]], source: str = "import",
+                            chunk_size: int = 500) -> Dict[str, int]:
+    """
+    Register many postings at once. Each chunk of records costs one lookup
+    of known hashes and one bulk insert; returns created/existing/skipped counts.
+    """
+    counts = {"created": 0, "existing": 0, "skipped": 0}
+    chunk: List[Mapping[str, object]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            _import_chunk(chunk, source, counts)
+            chunk = []
+    if chunk:
+        _import_chunk(chunk, source, counts)
+    return counts
@@ -0,0 +1,192 @@
+import logging
+import os
+import random
+import socket
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .analysis import process_resume
+from .models import AnalysisJob, Resume
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================
+# QUEUE SETTINGS
+# =========================================
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# =========================================
+# ENQUEUE / CLAIM
+# =========================================
+
+def enqueue_analysis(resume: Resume) -> AnalysisJob:
+    resume.analysis_status = "pending"
+    resume.save(update_fields=["analysis_status"])
+
+    return AnalysisJob.objects.create(
+        resume=resume,
+        max_attempts=_setting("ANALYSIS_JOB_MAX_ATTEMPTS", 5),
+    )
+
+
+def claim_next_job(worker_id: str, visibility_timeout: Optional[int] = None) -> Optional[AnalysisJob]:
+    """
+    Atomically claim the next runnable job.
+    Claiming is a conditional UPDATE on the row's previous state, so two
+    workers can never both win the same job on SQLite or Postgres.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = _setting("ANALYSIS_JOB_VISIBILITY_TIMEOUT", 300)
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=visibility_timeout)
+
+    candidates = AnalysisJob.objects.filter(
+        Q(status=AnalysisJob.STATUS_QUEUED, run_after__lte=now)
+        | Q(status=AnalysisJob.STATUS_RUNNING, locked_at__lt=stale_before)
+    ).order_by("run_after", "id").values_list(
+        "id", "status", "locked_at", "attempts", "max_attempts", "resume_id",
+    )[:10]
+
+    for job_id, status, locked_at, attempts, max_attempts, resume_id in candidates:
+        unclaimed = AnalysisJob.objects.filter(id=job_id, status=status, locked_at=locked_at)
+        if status == AnalysisJob.STATUS_RUNNING and attempts >= max_attempts:
+            # Its worker died on the last attempt (OOM, SIGKILL), so fail_job
+            # never ran; without this the file would be retried forever.
+            _fail_abandoned(unclaimed, job_id, resume_id, attempts, now)
+            continue
+
+        claimed = unclaimed.update(
+            status=AnalysisJob.STATUS_RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return AnalysisJob.objects.select_related("resume").get(id=job_id)
+
+    return None
+
+
+# =========================================
+# COMPLETION / RETRY
+# =========================================
+
+def _fail_abandoned(unclaimed, job_id: int, resume_id: int, attempts: int, now) -> None:
+    failed = unclaimed.update(
+        status=AnalysisJob.STATUS_FAILED,
+        locked_at=None,
+        last_error=f"Worker lost during attempt {attempts}; giving up.",
+        finished_at=now,
+    )
+    if failed:
+        logger.warning("Analysis job %s abandoned after %s attempts", job_id, attempts)
+        Resume.objects.filter(id=resume_id).update(analysis_status="failed")
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter: base * 2^(attempts - 1), capped."""
+    base = _setting("ANALYSIS_JOB_RETRY_BASE_DELAY", 10)
+    cap = _setting("ANALYSIS_JOB_RETRY_MAX_DELAY", 600)
+    delay = min(base * (2 ** max(attempts - 1, 0)), cap)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _owned(job: AnalysisJob):
+    # Once the visibility timeout lets another worker reclaim the job, the
+    # previous owner's lock no longer matches and its updates do nothing.
+    return AnalysisJob.objects.filter(id=job.id, locked_by=job.locked_by, locked_at=job.locked_at)
+
+
+def complete_job(job: AnalysisJob) -> None:
+    _owned(job).update(
+        status=AnalysisJob.STATUS_DONE,
+        locked_at=None,
+        finished_at=timezone.now(),
+    )
+
+
+def fail_job(job: AnalysisJob, error: str) -> None:
+    if job.attempts >= job.max_attempts:
+        failed = _owned(job).update(
+            status=AnalysisJob.STATUS_FAILED,
+            locked_at=None,
+            last_error=error,
+            finished_at=timezone.now(),
+        )
+        if failed:
+            Resume.objects.filter(id=job.resume_id).update(analysis_status="failed")
+        return
+
+    _owned(job).update(
+        status=AnalysisJob.STATUS_QUEUED,
+        locked_at=None,
+        last_error=error,
+        run_after=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+    )
+
+
+def run_job(job: AnalysisJob) -> None:
+    try:
+        process_resume(job.resume)
+    except Exception as e:
+        logger.exception("Analysis job %s failed (attempt %s/%s)", job.id, job.attempts, job.max_attempts)
+        fail_job(job, f"{type(e).__name__}: {e}")
+    else:
+        complete_job(job)
+
+
+def run_next_job(worker_id: str, visibility_timeout: Optional[int] = None) -> bool:
+    job = claim_next_job(worker_id, visibility_timeout)
+    if job is None:
+        return False
+    run_job(job)
+    return True
+
+
+# =========================================
+# QUEUE DEPTH
+# =========================================
+
+def queue_stats(include_finished: bool = False) -> Dict[str, object]:
+    """
+    Queue depth. Only queued and running jobs are counted, in one query
+    served by the status index, so status polls stay cheap however many
+    jobs have finished; ``include_finished`` adds the done/failed totals.
+    """
+    now = timezone.now()
+    ready = Q(status=AnalysisJob.STATUS_QUEUED, run_after__lte=now)
+    active = AnalysisJob.objects.filter(
+        status__in=[AnalysisJob.STATUS_QUEUED, AnalysisJob.STATUS_RUNNING]
+    ).aggregate(
+        queued=Count("id", filter=Q(status=AnalysisJob.STATUS_QUEUED)),
+        running=Count("id", filter=Q(status=AnalysisJob.STATUS_RUNNING)),
+        ready=Count("id", filter=ready),
+        oldest_ready=Min("created_at", filter=ready),
+    )
+    oldest_ready = active.pop("oldest_ready")
+    stats = {
+        **active,
+        "oldest_ready_age_seconds": round((now - oldest_ready).total_seconds(), 1) if oldest_ready else 0,
+    }
+
+    if include_finished:
+        counts = dict(
+            AnalysisJob.objects.filter(status__in=[AnalysisJob.STATUS_DONE, AnalysisJob.STATUS_FAILED])
+            .values_list("status").annotate(total=Count("id")).order_by()
+        )
+        stats["done"] = counts.get(AnalysisJob.STATUS_DONE, 0)
+        stats["failed"] = counts.get(AnalysisJob.STATUS_FAILED, 0)
+    return stats
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from matcher.exports import EXPORT_FORMATS, export_queryset, iter_export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the analysis history of every account (or one --user) as CSV or JSONL. "
+        "Rows are fetched in chunks, so memory use does not grow with the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+        parser.add_argument("--output", help="Write to this file instead of stdout.")
+        parser.add_argument("--user", help="Only export this username's resumes.")
+        parser.add_argument("--status", choices=["pending", "completed", "failed"],
+                            help="Only export resumes with this analysis status.")
+        parser.add_argument("--chunk-size", type=int, default=None,
+                            help="Rows fetched per query (default: EXPORT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f'No user named "{options["user"]}".')
+
+        lines = iter_export_lines(
+            export_queryset(user, options["status"]), options["format"], options["chunk_size"]
+        )
+        count = -1 if options["format"] == "csv" else 0  # the CSV header is not a row
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as stream:
+                for line in lines:
+                    stream.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
+                count += 1
+
+        self.stderr.write(f"Exported {count} resume(s).")
@@ -0,0 +1,48 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matcher.job_descriptions import import_job_descriptions
+from matcher.models import JobDescription
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import job postings from a JSONL feed into the job description registry. "
+        'Each line is an object with "text" (or "description") and optional "title", "id" and "source".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='JSONL file, or "-" to read standard input.')
+        parser.add_argument("--source", default="import", help="Source recorded for lines without one.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def _records(self, stream):
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise CommandError(f"Line {number}: invalid JSON ({e}).")
+            if not isinstance(record, dict):
+                raise CommandError(f"Line {number}: expected a JSON object.")
+            yield record
+
+    def handle(self, *args, **options):
+        if options["path"] == "-":
+            counts = import_job_descriptions(self._records(sys.stdin), options["source"], options["chunk_size"])
+        else:
+            try:
+                with open(options["path"], encoding="utf-8") as stream:
+                    counts = import_job_descriptions(self._records(stream), options["source"], options["chunk_size"])
+            except OSError as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {counts['created']} new posting(s); {counts['existing']} already registered, "
+            f"{counts['skipped']} record(s) without text skipped. "
+            f"Registry holds {JobDescription.objects.count()} posting(s)."
+        ))
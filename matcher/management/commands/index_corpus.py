@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from matcher.corpus import index_document, reset_corpus
+from matcher.job_descriptions import ensure_profile
+from matcher.models import CorpusDocument, CorpusStatistics, JobDescription, Resume
+from matcher.services import ResumeDocument, current_analysis_version
+
+
+class Command(BaseCommand):
+    help = "Index stored resumes and registered job descriptions into the BM25 corpus statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Drop all corpus statistics first.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            reset_corpus()
+
+        rows = (
+            Resume.objects.exclude(extracted_text="")
+            .order_by("id")
+            .values_list("id", "extracted_text")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+        indexed = 0
+        for resume_id, text in rows:
+            index_document(CorpusDocument.KIND_RESUME, resume_id, ResumeDocument(text).term_vector)
+            indexed += 1
+
+        # Stored profiles are reused; stale ones are recomputed (and indexed) by ensure_profile.
+        postings = JobDescription.objects.order_by("id").iterator(chunk_size=options["chunk_size"])
+        jobs = 0
+        for posting in postings:
+            if posting.profile_version == current_analysis_version():
+                index_document(CorpusDocument.KIND_JOB, posting.content_hash, posting.term_vector)
+            else:
+                ensure_profile(posting)
+            jobs += 1
+
+        totals = CorpusStatistics.objects.filter(pk=1).first()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} resume(s) and {jobs} job description(s); "
+            f"corpus holds {totals.doc_count if totals else 0} document(s)."
+        ))
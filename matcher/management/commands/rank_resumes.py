@@ -0,0 +1,99 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from matcher.batch import (
+    STORED_RESULT_FIELDS,
+    iter_batch_results,
+    iter_sources,
+    rank_results,
+    rank_stored,
+    write_results,
+)
+from matcher.job_descriptions import get_job_document, register_job_description
+
+
+class Command(BaseCommand):
+    help = (
+        "Score a directory or ZIP of resumes against one job description and stream the results, "
+        "or with --stored, BM25-rank the resumes already analyzed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Directory or ZIP archive of PDF/DOCX resumes.")
+        parser.add_argument("--stored", action="store_true",
+                            help="Rank stored resumes by their corpus term vectors instead of scoring files.")
+        parser.add_argument("--user", help="With --stored, only rank this user's resumes.")
+        jd = parser.add_mutually_exclusive_group(required=True)
+        jd.add_argument("--jd", help="Path to a text file containing the job description.")
+        jd.add_argument("--jd-text", help="Job description text.")
+        parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+        parser.add_argument("--output", help="Write results to this file instead of stdout.")
+        parser.add_argument("--workers", type=int, default=None, help="Files scored at once (default: BATCH_MAX_WORKERS).")
+        parser.add_argument("--top", type=int, default=10, help="Print the N best matches to stderr when done (0 to skip).")
+
+    def handle(self, *args, **options):
+        if options["jd"]:
+            with open(options["jd"], encoding="utf-8") as f:
+                jd_text = f.read()
+        else:
+            jd_text = options["jd_text"]
+
+        if not jd_text.strip():
+            raise CommandError("The job description is empty.")
+
+        if options["stored"]:
+            return self.rank_stored(jd_text, options)
+        if not options["path"]:
+            raise CommandError("Give a directory or ZIP archive, or --stored.")
+
+        try:
+            sources = iter_sources(options["path"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Only the fields needed for the final ranking are kept in memory.
+        summary = []
+
+        def collect(rows):
+            for row in rows:
+                summary.append({key: row[key] for key in ("file", "ats_score", "jd_match_score", "error")})
+                yield row
+
+        job = get_job_document(register_job_description(jd_text, source="batch"))
+        rows = collect(iter_batch_results(sources, job, workers=options["workers"]))
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as stream:
+                write_results(rows, stream, options["format"])
+        else:
+            write_results(rows, self.stdout, options["format"])
+
+        failed = sum(1 for row in summary if row["error"])
+        self.stderr.write(f"Scored {len(summary) - failed} resume(s), {failed} failed.")
+
+        if options["top"]:
+            for position, row in enumerate(rank_results(summary)[:options["top"]], start=1):
+                if row["error"]:
+                    break
+                self.stderr.write(
+                    f"{position:>3}. {row['file']}  JD match {row['jd_match_score']}%  ATS {row['ats_score']}"
+                )
+
+    def rank_stored(self, jd_text, options):
+        user = None
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No user named {options['user']!r}.")
+
+        job = get_job_document(register_job_description(jd_text, source="batch"))
+        rows = rank_stored(job, user=user, top_k=options["top"] or 20)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as stream:
+                write_results(rows, stream, options["format"], STORED_RESULT_FIELDS)
+        else:
+            write_results(rows, self.stdout, options["format"], STORED_RESULT_FIELDS)
+        self.stderr.write(f"Ranked the top {len(rows)} stored resume(s).")
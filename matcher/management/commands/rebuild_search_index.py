@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from matcher.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the resume full-text index triggers and re-index every resume (SQLite only)."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stdout.write(f"The {connection.vendor} search index is maintained by the database; nothing to do.")
+            return
+
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS("Resume search index rebuilt."))
@@ -0,0 +1,47 @@
+import json
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from matcher import metrics
+from matcher.jobs import default_worker_id, queue_stats, run_next_job
+
+
+class Command(BaseCommand):
+    help = "Process queued resume analysis jobs from the database job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the ready jobs, then exit.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--visibility-timeout", type=int, default=None, help="Seconds before a running job is considered abandoned.")
+        parser.add_argument("--worker-id", default=None)
+        parser.add_argument("--stats", action="store_true", help="Print queue depth as JSON and exit.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(json.dumps(queue_stats(include_finished=True), indent=2))
+            return
+
+        worker_id = options["worker_id"] or default_worker_id()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        self.stdout.write(f"Analysis worker {worker_id} started.")
+        processed = 0
+
+        while not self._stopping:
+            if run_next_job(worker_id, options["visibility_timeout"]):
+                processed += 1
+                metrics.flush()
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+
+        self.stdout.write(f"Analysis worker {worker_id} stopped after {processed} job(s).")
+
+    def _request_stop(self, signum, frame):
+        # Finish the current job before exiting so it is not left locked.
+        self._stopping = True
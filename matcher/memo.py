@@ -0,0 +1,104 @@
+"""
+Memoization of deterministic analyzers on Django's cache framework.
+
+@memoize stores a function's result in the "analysis" cache under
+``memo:<name>:<engine version>:<digest of the arguments>``. Text and
+analysis documents are hashed by content, so the same resume/JD pair hits
+the cache whichever request or process scores it, and bumping the engine
+or taxonomy version abandons every older entry. Analyzers that weight
+terms by the BM25 corpus statistics pass ``depends_on`` to key on the
+weights they look up as well, so a cached score always equals a fresh one
+and re-scoring documents that did not change still hits. Backend,
+size cap and TTL are settings (ANALYSIS_CACHE_*).
+
+When Django is not configured, memoization is off (ANALYSIS_MEMOIZE) or
+the cache backend fails, the function is simply called.
+"""
+import functools
+import hashlib
+import logging
+import sys
+from typing import Callable, Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+MEMO_CACHE_ALIAS = "analysis"
+_MISSING = object()
+
+
+def content_digest(value) -> str:
+    """Stable digest of one argument; documents expose a precomputed content_hash."""
+    content_hash = getattr(value, "content_hash", None)
+    if content_hash is not None:
+        return content_hash
+    if isinstance(value, str):
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return repr(value)
+
+
+def memo_key(name: str, version: str, args, kwargs, state: str = "") -> str:
+    digest = hashlib.sha256(state.encode("utf-8"))
+    for value in args:
+        digest.update(content_digest(value).encode("utf-8"))
+        digest.update(b"\0")
+    for key in sorted(kwargs):
+        digest.update(f"{key}={content_digest(kwargs[key])}".encode("utf-8"))
+        digest.update(b"\0")
+    return f"memo:{name}:{version}:{digest.hexdigest()}"
+
+
+def _memo_cache():
+    # Like metrics, usable from processes where Django was never set up.
+    conf = sys.modules.get("django.conf")
+    if conf is None or not conf.settings.configured or not getattr(conf.settings, "ANALYSIS_MEMOIZE", True):
+        return None
+    from django.core.cache import caches
+    return caches[MEMO_CACHE_ALIAS]
+
+
+def memoize(version: Callable[[], str], name: Optional[str] = None, timeout=None,
+            depends_on: Optional[Callable[..., str]] = None):
+    """
+    Cache a deterministic function's results. ``version`` returns the
+    current engine version; ``depends_on``, called with the function's
+    arguments, digests any outside state the result also depends on;
+    ``timeout`` overrides the cache's default TTL.
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _memo_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+
+            state = depends_on(*args, **kwargs) if depends_on is not None else ""
+            key = memo_key(label, version(), args, kwargs, state)
+            try:
+                result = cache.get(key, _MISSING)
+            except Exception as e:
+                logger.warning("Memo cache read failed for %s: %s", label, e)
+                return func(*args, **kwargs)
+
+            if result is not _MISSING:
+                metrics.MEMO_CACHE.inc(function=label, result="hit")
+                return result
+
+            metrics.MEMO_CACHE.inc(function=label, result="miss")
+            result = func(*args, **kwargs)
+            try:
+                if timeout is None:
+                    cache.set(key, result)
+                else:
+                    cache.set(key, result, timeout)
+            except Exception as e:
+                logger.warning("Memo cache write failed for %s: %s", label, e)
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
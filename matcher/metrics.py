@@ -0,0 +1,368 @@
+"""
+Pipeline metrics exported in Prometheus text format.
+
+Each process keeps counters and histograms in memory and periodically
+writes them to its own JSON file in METRICS_DIR. The /metrics view sums
+every process's file, so one scrape covers all gunicorn workers and the
+analysis worker. Files left by processes that have exited are folded into
+an archive file, so their counts are kept without the directory growing.
+Where fcntl is unavailable (Windows) there is no file locking, so each
+process serves only its own metrics and writes no files.
+
+This module has no Django imports at load time; services and worker
+processes can record metrics before the app registry is ready.
+"""
+import atexit
+import contextvars
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process mode
+    fcntl = None
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000, 10_000_000)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+_ARCHIVE_FILE = "metrics_archive.json"
+_FILE_PATTERN = re.compile(r"^metrics_(\d+)_[0-9a-f]+\.json$")
+
+
+def _setting(name, default):
+    # Settings are only consulted once Django has been loaded by the process.
+    conf = sys.modules.get("django.conf")
+    if conf is not None and conf.settings.configured:
+        return getattr(conf.settings, name, default)
+    return default
+
+
+def metrics_dir() -> str:
+    return _setting("METRICS_DIR", None) or os.path.join(tempfile.gettempdir(), "skillmatch-metrics")
+
+
+# =========================================
+# METRIC TYPES
+# =========================================
+
+REGISTRY: Dict[str, "_Metric"] = {}
+_lock = threading.Lock()
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[str, object] = {}
+        REGISTRY[name] = self
+
+    def _key(self, labels: Dict[str, object]) -> str:
+        return json.dumps([str(labels.get(name, "")) for name in self.labelnames])
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = TIME_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            state["buckets"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+
+# =========================================
+# PIPELINE METRICS
+# =========================================
+
+STAGE_SECONDS = Histogram(
+    "skillmatch_stage_duration_seconds", "Time spent in one pipeline stage.", ["stage"],
+)
+REQUEST_SECONDS = Histogram(
+    "skillmatch_request_duration_seconds", "HTTP request latency by view.", ["view", "method", "status"],
+)
+DOCUMENTS_PROCESSED = Counter(
+    "skillmatch_documents_processed_total", "Documents run through text extraction.", ["ext", "extractor"],
+)
+DOCUMENT_BYTES = Histogram(
+    "skillmatch_document_bytes", "Size of extracted documents.", ["ext"], buckets=BYTES_BUCKETS,
+)
+DOCUMENT_PAGES = Histogram(
+    "skillmatch_document_pages", "Page count of extracted documents.", ["ext"], buckets=PAGE_BUCKETS,
+)
+EXTRACTION_FAILURES = Counter(
+    "skillmatch_extraction_failures_total", "Extractions that produced no text.", ["ext"],
+)
+EXTRACTION_CACHE = Counter(
+    "skillmatch_extraction_cache_total", "Extraction cache lookups.", ["result"],
+)
+ANALYSES = Counter(
+    "skillmatch_analyses_total", "Resume analyses by outcome.", ["status"],
+)
+REPORT_CACHE = Counter(
+    "skillmatch_report_cache_total", "PDF report cache lookups.", ["result"],
+)
+MEMO_CACHE = Counter(
+    "skillmatch_memo_cache_total", "Memoized analyzer lookups.", ["function", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "skillmatch_cache_evictions_total", "Entries removed to keep a cache under its size cap.", ["backend"],
+)
+
+
+# =========================================
+# STAGE TIMERS
+# =========================================
+
+# Per-request list of (stage, milliseconds), set by the request middleware.
+_breakdown: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "skillmatch_stage_breakdown", default=None
+)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown.append((stage, elapsed * 1000))
+
+
+def timed(stage: str, func, *args, **kwargs):
+    with stage_timer(stage):
+        return func(*args, **kwargs)
+
+
+def start_breakdown() -> contextvars.Token:
+    return _breakdown.set([])
+
+
+def end_breakdown(token: contextvars.Token) -> List[Tuple[str, float]]:
+    breakdown = _breakdown.get() or []
+    _breakdown.reset(token)
+    return breakdown
+
+
+def summarize_breakdown(breakdown: List[Tuple[str, float]]) -> Dict[str, float]:
+    """Total milliseconds per stage, slowest first."""
+    totals: Dict[str, float] = {}
+    for stage, ms in breakdown:
+        totals[stage] = totals.get(stage, 0.0) + ms
+    return {stage: round(ms, 1) for stage, ms in sorted(totals.items(), key=lambda item: -item[1])}
+
+
+# =========================================
+# PER-PROCESS FILES
+# =========================================
+
+_process_file: Optional[str] = None
+_process_pid: Optional[int] = None
+_last_flush = 0.0
+
+
+def _snapshot() -> Dict[str, Dict[str, object]]:
+    with _lock:
+        return {name: json.loads(json.dumps(metric.values)) for name, metric in REGISTRY.items() if metric.values}
+
+
+def _own_file() -> str:
+    global _process_file, _process_pid
+    pid = os.getpid()
+    if _process_pid != pid:
+        _process_pid = pid
+        _process_file = os.path.join(metrics_dir(), f"metrics_{pid}_{uuid.uuid4().hex[:8]}.json")
+    return _process_file
+
+
+def _reset_after_fork() -> None:
+    # A forked worker must not re-report the counts its parent recorded.
+    global _lock, _process_pid, _last_flush
+    _lock = threading.Lock()
+    for metric in REGISTRY.values():
+        metric.values.clear()
+    _process_pid = None
+    _last_flush = 0.0
+
+
+def _write_json(path: str, data) -> None:
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def flush(force: bool = False) -> None:
+    """Write this process's metrics, at most once per METRICS_FLUSH_INTERVAL."""
+    global _last_flush
+    if fcntl is None:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < _setting("METRICS_FLUSH_INTERVAL", 1.0):
+        return
+    _last_flush = now
+
+    snapshot = _snapshot()
+    if not snapshot and _process_pid != os.getpid():
+        return  # nothing recorded yet; do not leave an empty file behind
+
+    try:
+        path = _own_file()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_json(path, snapshot)
+    except OSError:
+        pass
+
+
+atexit.register(flush, True)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# =========================================
+# AGGREGATION
+# =========================================
+
+def _merge(total: Dict[str, Dict[str, object]], data: Dict[str, Dict[str, object]]) -> None:
+    for name, series in data.items():
+        metric = REGISTRY.get(name)
+        if metric is None:
+            continue
+        merged = total.setdefault(name, {})
+        for key, value in series.items():
+            if metric.kind == "counter":
+                merged[key] = merged.get(key, 0) + value
+                continue
+            state = merged.get(key)
+            if state is None or len(state["buckets"]) != len(value["buckets"]):
+                merged[key] = {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+                continue
+            state["buckets"] = [a + b for a, b in zip(state["buckets"], value["buckets"])]
+            state["sum"] += value["sum"]
+            state["count"] += value["count"]
+
+
+def _read_json(path: str) -> Dict[str, Dict[str, object]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect() -> Dict[str, Dict[str, object]]:
+    """Sum the metrics of every live and exited process."""
+    if fcntl is None:
+        return _snapshot()
+    flush(force=True)
+    directory = metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        archive_path = os.path.join(directory, _ARCHIVE_FILE)
+        archive = _read_json(archive_path)
+        total: Dict[str, Dict[str, object]] = {}
+        _merge(total, archive)
+
+        archived = []
+        for filename in os.listdir(directory):
+            match = _FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            path = os.path.join(directory, filename)
+            data = _read_json(path)
+            _merge(total, data)
+            if not _pid_alive(int(match.group(1))):
+                _merge(archive, data)
+                archived.append(path)
+
+        if archived:
+            _write_json(archive_path, archive)
+            for path in archived:
+                os.remove(path)
+
+    return total
+
+
+# =========================================
+# PROMETHEUS TEXT FORMAT
+# =========================================
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(metric: _Metric, key: str, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(metric.labelnames, json.loads(key))) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def render_prometheus(data: Optional[Dict[str, Dict[str, object]]] = None) -> str:
+    data = collect() if data is None else data
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for key, value in sorted(data.get(name, {}).items()):
+            if metric.kind == "counter":
+                lines.append(f"{name}{_labels(metric, key)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets, value["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(metric, key, (('le', _format_bound(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(metric, key, (('le', '+Inf'),))} {value['count']}")
+            lines.append(f"{name}_sum{_labels(metric, key)} {value['sum']}")
+            lines.append(f"{name}_count{_labels(metric, key)} {value['count']}")
+    return "\n".join(lines) + "\n"
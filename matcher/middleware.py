@@ -0,0 +1,105 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import REQUEST_SECONDS, end_breakdown, flush, start_breakdown, summarize_breakdown
+
+logger = logging.getLogger("matcher.performance")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records request latency per view and logs requests slower than
+    SLOW_REQUEST_THRESHOLD_MS together with their per-stage breakdown.
+    Streaming responses are timed until the first byte is handed back.
+    Works in sync and async stacks, so ASGI requests stay on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold_ms = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 1000)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = start_breakdown()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            breakdown = end_breakdown(token)
+
+        self._record(request, response, elapsed, breakdown)
+        return response
+
+    async def __acall__(self, request):
+        token = start_breakdown()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            breakdown = end_breakdown(token)
+
+        self._record(request, response, elapsed, breakdown)
+        return response
+
+    def _record(self, request, response, elapsed, breakdown):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unmatched"
+        REQUEST_SECONDS.observe(elapsed, view=view, method=request.method, status=response.status_code)
+
+        elapsed_ms = elapsed * 1000
+        if self.threshold_ms and elapsed_ms >= self.threshold_ms:
+            stages = summarize_breakdown(breakdown)
+            logger.warning(
+                "Slow request %s %s (%s) took %.0f ms, status %s; stages: %s",
+                request.method,
+                request.path,
+                view,
+                elapsed_ms,
+                response.status_code,
+                ", ".join(f"{stage}={ms:.0f}ms" for stage, ms in stages.items()) or "none recorded",
+            )
+
+        flush()
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, usable in an async middleware stack. WhiteNoise itself is
+    sync-only, which would make Django run every ASGI request through a
+    thread; here only static file hits are handed to one.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
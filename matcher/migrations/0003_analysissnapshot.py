@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 03:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0002_resume_analysis_status_resume_ats_readability_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('engine_version', models.CharField(max_length=20)),
+                ('input_hash', models.CharField(max_length=64)),
+                ('result', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now=True)),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='matcher.resume')),
+            ],
+            options={
+                'db_table': 'matcher_analysis_snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-18 03:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def mark_existing_resumes(apps, schema_editor):
+    # Uploads made before the queue existed were analyzed synchronously
+    # but kept the default "pending" status.
+    Resume = apps.get_model('matcher', 'Resume')
+    pending = Resume.objects.filter(analysis_status='pending')
+    pending.exclude(extracted_text='').update(analysis_status='completed')
+    pending.filter(extracted_text='').update(analysis_status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0003_analysissnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='matcher.resume')),
+            ],
+            options={
+                'db_table': 'matcher_analysis_job',
+                'ordering': ['run_after', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=models.Index(fields=['status', 'run_after'], name='analysis_job_ready_idx'),
+        ),
+        migrations.RunPython(mark_existing_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0004_analysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionCache',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('extracted_text', models.TextField()),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('extractor', models.CharField(blank=True, default='', max_length=50)),
+                ('extraction_ms', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'matcher_extraction_cache',
+            },
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
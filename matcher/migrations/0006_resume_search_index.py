@@ -0,0 +1,82 @@
+# Full-text index over Resume.extracted_text.
+#
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# PostgreSQL: a stored generated tsvector column with a GIN index.
+# Other backends fall back to a LIKE scan in matcher.search.
+
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS matcher_resume_fts USING fts5(
+        extracted_text,
+        content='matcher_resume',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS matcher_resume_fts_ai AFTER INSERT ON matcher_resume BEGIN
+        INSERT INTO matcher_resume_fts(rowid, extracted_text) VALUES (new.id, new.extracted_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS matcher_resume_fts_ad AFTER DELETE ON matcher_resume BEGIN
+        INSERT INTO matcher_resume_fts(matcher_resume_fts, rowid, extracted_text)
+        VALUES ('delete', old.id, old.extracted_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS matcher_resume_fts_au AFTER UPDATE OF extracted_text ON matcher_resume BEGIN
+        INSERT INTO matcher_resume_fts(matcher_resume_fts, rowid, extracted_text)
+        VALUES ('delete', old.id, old.extracted_text);
+        INSERT INTO matcher_resume_fts(rowid, extracted_text) VALUES (new.id, new.extracted_text);
+    END
+    """,
+    "INSERT INTO matcher_resume_fts(matcher_resume_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS matcher_resume_fts_au",
+    "DROP TRIGGER IF EXISTS matcher_resume_fts_ad",
+    "DROP TRIGGER IF EXISTS matcher_resume_fts_ai",
+    "DROP TABLE IF EXISTS matcher_resume_fts",
+]
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE matcher_resume ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(extracted_text, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS matcher_resume_search_gin ON matcher_resume USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS matcher_resume_search_gin",
+    "ALTER TABLE matcher_resume DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0005_extractioncache'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-18 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0006_resume_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorpusDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('resume', 'Resume'), ('job', 'Job description')], max_length=10)),
+                ('key', models.CharField(max_length=64)),
+                ('length', models.PositiveIntegerField(default=0)),
+                ('term_vector', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'matcher_corpus_document',
+            },
+        ),
+        migrations.CreateModel(
+            name='CorpusStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_count', models.PositiveIntegerField(default=0)),
+                ('total_length', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'matcher_corpus_statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='CorpusTerm',
+            fields=[
+                ('term', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('document_frequency', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'matcher_corpus_term',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='corpusdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'key'), name='corpus_document_kind_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0007_corpus'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='resume',
+            options={'ordering': ['-uploaded_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-uploaded_at', '-id'], name='resume_user_history_idx'),
+        ),
+    ]
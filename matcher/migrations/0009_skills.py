@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-18 03:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0008_resume_history_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'matcher_skill',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('detected', 'Detected'), ('matched', 'Matched'), ('missing', 'Missing')], max_length=10)),
+                ('source', models.CharField(blank=True, default='', max_length=50)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='matcher.resume')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_links', to='matcher.skill')),
+            ],
+            options={
+                'db_table': 'matcher_resume_skill',
+                'ordering': ['resume_id', 'kind', 'position'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='resumeskill',
+            index=models.Index(fields=['skill', 'kind', 'resume'], name='resume_skill_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeskill',
+            constraint=models.UniqueConstraint(fields=('resume', 'kind', 'skill'), name='resume_skill_uniq'),
+        ),
+    ]
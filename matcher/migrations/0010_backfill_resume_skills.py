@@ -0,0 +1,96 @@
+# Backfill Skill / ResumeSkill rows for resumes analyzed before the tables existed.
+#
+# Detected and missing skills come from the comma-joined Resume columns;
+# matched skills come from the stored analysis snapshot when there is one.
+# Resumes are read in id order, CHUNK_SIZE at a time, and each chunk is
+# written with two bulk inserts, so memory stays flat on large tables.
+
+from django.db import migrations
+
+CHUNK_SIZE = 500
+
+SOURCES = {
+    "detected": "extract_technical_skills",
+    "matched": "jd_match_score",
+    "missing": "missing_skills",
+}
+
+
+def _split(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _key(name):
+    return " ".join(name.split()).lower()[:100]
+
+
+def _backfill_chunk(Skill, ResumeSkill, rows):
+    lists = {}
+    names = {}
+    for resume_id, detected, missing, snapshot in rows:
+        matched = (snapshot or {}).get("jd_matched") or []
+        lists[resume_id] = {"detected": _split(detected), "matched": matched, "missing": _split(missing)}
+        for kind_names in lists[resume_id].values():
+            for name in kind_names:
+                if _key(name):
+                    names.setdefault(_key(name), " ".join(name.split())[:100])
+
+    Skill.objects.bulk_create(
+        [Skill(key=key, name=name) for key, name in names.items()], ignore_conflicts=True, batch_size=CHUNK_SIZE
+    )
+    skill_ids = {}
+    keys = sorted(names)
+    for start in range(0, len(keys), CHUNK_SIZE):
+        skill_ids.update(Skill.objects.filter(key__in=keys[start:start + CHUNK_SIZE]).values_list("key", "id"))
+
+    links = []
+    for resume_id, kinds in lists.items():
+        for kind, kind_names in kinds.items():
+            seen = set()
+            for name in kind_names:
+                key = _key(name)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                links.append(ResumeSkill(
+                    resume_id=resume_id, skill_id=skill_ids[key], kind=kind,
+                    source=SOURCES[kind], position=len(seen) - 1,
+                ))
+    ResumeSkill.objects.bulk_create(links, ignore_conflicts=True, batch_size=CHUNK_SIZE)
+
+
+def backfill(apps, schema_editor):
+    Resume = apps.get_model("matcher", "Resume")
+    Skill = apps.get_model("matcher", "Skill")
+    ResumeSkill = apps.get_model("matcher", "ResumeSkill")
+
+    rows = (
+        Resume.objects.filter(analysis_status="completed")
+        .order_by("id")
+        .values_list("id", "detected_skills", "missing_skills", "snapshot__result")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            _backfill_chunk(Skill, ResumeSkill, chunk)
+            chunk = []
+    if chunk:
+        _backfill_chunk(Skill, ResumeSkill, chunk)
+
+
+def clear(apps, schema_editor):
+    apps.get_model("matcher", "ResumeSkill").objects.all().delete()
+    apps.get_model("matcher", "Skill").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0009_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 03:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0010_backfill_resume_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDescription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('title', models.CharField(blank=True, default='', max_length=200)),
+                ('source', models.CharField(blank=True, default='', max_length=50)),
+                ('external_id', models.CharField(blank=True, default='', max_length=200)),
+                ('term_vector', models.JSONField(default=dict)),
+                ('tech_skills', models.JSONField(default=list)),
+                ('profile_version', models.CharField(blank=True, default='', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'matcher_job_description',
+            },
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='job_posting',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='matcher.jobdescription'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Move every Resume.job_description text into the JobDescription registry.
+#
+# Identical postings (after whitespace/Unicode normalization) collapse into
+# one row. Profiles are left empty and computed on first use, so this
+# migration does not depend on the analyzers. Resumes are read CHUNK_SIZE
+# at a time; each chunk costs one lookup, one bulk insert and one UPDATE
+# per distinct posting.
+
+import hashlib
+import unicodedata
+
+from django.db import migrations
+
+CHUNK_SIZE = 500
+
+
+def _normalize(text):
+    text = unicodedata.normalize("NFKC", text or "")
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def _fold_chunk(JobDescription, Resume, rows):
+    by_hash = {}
+    for resume_id, text in rows:
+        normalized = _normalize(text)
+        if not normalized:
+            continue
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        by_hash.setdefault(digest, (normalized, []))[1].append(resume_id)
+
+    existing = dict(
+        JobDescription.objects.filter(content_hash__in=list(by_hash)).values_list("content_hash", "id")
+    )
+    JobDescription.objects.bulk_create([
+        JobDescription(content_hash=digest, text=normalized, source="resume")
+        for digest, (normalized, _) in by_hash.items()
+        if digest not in existing
+    ])
+    existing.update(
+        JobDescription.objects.filter(content_hash__in=list(by_hash)).values_list("content_hash", "id")
+    )
+    for digest, (_, resume_ids) in by_hash.items():
+        Resume.objects.filter(id__in=resume_ids).update(job_posting_id=existing[digest])
+
+
+def fold(apps, schema_editor):
+    JobDescription = apps.get_model("matcher", "JobDescription")
+    Resume = apps.get_model("matcher", "Resume")
+
+    rows = (
+        Resume.objects.exclude(job_description__isnull=True)
+        .exclude(job_description="")
+        .order_by("id")
+        .values_list("id", "job_description")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            _fold_chunk(JobDescription, Resume, chunk)
+            chunk = []
+    if chunk:
+        _fold_chunk(JobDescription, Resume, chunk)
+
+
+def unfold(apps, schema_editor):
+    JobDescription = apps.get_model("matcher", "JobDescription")
+    Resume = apps.get_model("matcher", "Resume")
+
+    postings = JobDescription.objects.order_by("id").values_list("id", "text").iterator(chunk_size=CHUNK_SIZE)
+    for posting_id, text in postings:
+        Resume.objects.filter(job_posting_id=posting_id).update(job_description=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0011_job_description'),
+    ]
+
+    operations = [
+        migrations.RunPython(fold, unfold),
+    ]
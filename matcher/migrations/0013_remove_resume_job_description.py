@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0012_fold_job_descriptions'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='resume',
+            name='job_description',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 04:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0013_remove_resume_job_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('engine_version', models.CharField(max_length=20)),
+                ('input_hash', models.CharField(max_length=64)),
+                ('ats_score', models.FloatField(default=0)),
+                ('jd_match_score', models.FloatField(default=0)),
+                ('result', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='matcher.jobdescription')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='matcher.resume')),
+            ],
+            options={
+                'db_table': 'matcher_job_match',
+                'ordering': ['-updated_at', '-id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobmatch',
+            constraint=models.UniqueConstraint(fields=('resume', 'job_posting'), name='job_match_resume_posting_uniq'),
+        ),
+    ]
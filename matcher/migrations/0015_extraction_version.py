@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0014_job_match'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='extractioncache',
+            name='extraction_version',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0015_extraction_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='corpusstatistics',
+            name='generation',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 04:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0016_corpus_generation'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='corpusstatistics',
+            name='generation',
+        ),
+    ]
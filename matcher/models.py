@@ -1,5 +1,33 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+
+
+class JobDescription(models.Model):
+    """
+    One distinct job posting, shared by every resume matched against it.
+    Postings are deduplicated by the hash of their normalized text and
+    carry the JD-side features the analyzers read, computed once; a profile
+    stamped with an older engine version is recomputed on next use.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    title = models.CharField(max_length=200, blank=True, default="")
+    source = models.CharField(max_length=50, blank=True, default="")
+    external_id = models.CharField(max_length=200, blank=True, default="")
+
+    # Precomputed profile; the keyword set is the term vector's keys.
+    term_vector = models.JSONField(default=dict)
+    tech_skills = models.JSONField(default=list)
+    profile_version = models.CharField(max_length=20, blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'matcher_job_description'
+
+    def __str__(self):
+        return self.title or f"Job description {self.content_hash[:12]}"
 
 
 class Resume(models.Model):
@@ -13,10 +41,17 @@ class Resume(models.Model):
 
     # Uploaded resume
     file = models.FileField(upload_to='resumes/')
+    file_sha256 = models.CharField(max_length=64, blank=True, default="", db_index=True)
     extracted_text = models.TextField(blank=True, default="")
 
     # Job description
-    job_description = models.TextField(blank=True, null=True)
+    job_posting = models.ForeignKey(
+        JobDescription,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='resumes'
+    )
 
     # Core scores
     ats_score = models.FloatField(default=0, null=True, blank=True)
@@ -51,18 +86,39 @@ class Resume(models.Model):
     analyzed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        ordering = ['-uploaded_at']
+        ordering = ['-uploaded_at', '-id']
         db_table = 'matcher_resume'
+        indexes = [
+            # Serves the per-user history list and its keyset pagination.
+            models.Index(fields=['user', '-uploaded_at', '-id'], name='resume_user_history_idx'),
+        ]
 
     def __str__(self):
         return f"Resume {self.id} - {self.suggested_role} ({self.ats_score}%)"
 
+    @property
+    def job_description(self):
+        return self.job_posting.text if self.job_posting_id else ""
+
+    def _prefetched_skills(self, kind):
+        # Rows loaded with prefetch_related("skill_links__skill") avoid re-parsing the text column.
+        links = getattr(self, '_prefetched_objects_cache', {}).get('skill_links')
+        if links is None:
+            return None
+        return [link.skill.name for link in sorted(links, key=lambda link: link.position) if link.kind == kind]
+
     def get_detected_skills_list(self):
+        prefetched = self._prefetched_skills(ResumeSkill.KIND_DETECTED)
+        if prefetched is not None:
+            return prefetched
         if self.detected_skills:
             return [skill.strip() for skill in self.detected_skills.split(',') if skill.strip()]
         return []
 
     def get_missing_skills_list(self):
+        prefetched = self._prefetched_skills(ResumeSkill.KIND_MISSING)
+        if prefetched is not None:
+            return prefetched
         if self.missing_skills:
             return [skill.strip() for skill in self.missing_skills.split(',') if skill.strip()]
         return []
@@ -80,4 +136,259 @@ class Resume(models.Model):
     def get_suggestions_list(self):
         if self.suggestions_summary:
             return [item.strip() for item in self.suggestions_summary.split('|') if item.strip()]
-        return []
\ No newline at end of file
+        return []
+
+class Skill(models.Model):
+    """
+    One distinct skill or keyword, shared by every resume that mentions it.
+    `key` is the lowercased name and is what lookups go through.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['key']
+        db_table = 'matcher_skill'
+
+    def __str__(self):
+        return self.name
+
+
+class ResumeSkill(models.Model):
+    """
+    A skill attached to a resume by one analyzer: detected in the resume,
+    matched against the job description, or missing from the resume.
+    """
+    KIND_DETECTED = "detected"
+    KIND_MATCHED = "matched"
+    KIND_MISSING = "missing"
+
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='skill_links'
+    )
+    skill = models.ForeignKey(
+        Skill,
+        on_delete=models.CASCADE,
+        related_name='resume_links'
+    )
+    kind = models.CharField(
+        max_length=10,
+        choices=[
+            (KIND_DETECTED, "Detected"),
+            (KIND_MATCHED, "Matched"),
+            (KIND_MISSING, "Missing"),
+        ]
+    )
+    # Name of the analyzer that produced the row, e.g. "extract_technical_skills".
+    source = models.CharField(max_length=50, blank=True, default="")
+    # Rank within the analyzer's output, so lists keep their original order.
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['resume_id', 'kind', 'position']
+        db_table = 'matcher_resume_skill'
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'kind', 'skill'], name='resume_skill_uniq'),
+        ]
+        indexes = [
+            # "Which / how many resumes list X" without touching the resume table.
+            models.Index(fields=['skill', 'kind', 'resume'], name='resume_skill_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"Resume {self.resume_id}: {self.skill_id} ({self.kind})"
+
+
+class AnalysisSnapshot(models.Model):
+    """
+    Persisted output of the full analysis pipeline for one resume.
+    A snapshot is reused while its engine version and input hash still match.
+    JD-match scores keep the BM25 corpus weights of when it was computed;
+    corpus growth alone does not make a snapshot stale (see matcher.corpus).
+    """
+    resume = models.OneToOneField(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='snapshot'
+    )
+    engine_version = models.CharField(max_length=20)
+    input_hash = models.CharField(max_length=64)
+    result = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'matcher_analysis_snapshot'
+
+    def __str__(self):
+        return f"Snapshot for resume {self.resume_id} (engine {self.engine_version})"
+
+    def is_current(self, engine_version, input_hash):
+        return self.engine_version == engine_version and self.input_hash == input_hash
+
+
+class JobMatch(models.Model):
+    """
+    A stored resume re-matched against another job description.
+    Only the JD-dependent outputs are kept (services.JD_RESULT_KEYS); the
+    resume side comes from the resume's snapshot. Like a snapshot, a match
+    is reused while its engine version and input hash still match.
+    """
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='matches'
+    )
+    job_posting = models.ForeignKey(
+        JobDescription,
+        on_delete=models.CASCADE,
+        related_name='matches'
+    )
+    engine_version = models.CharField(max_length=20)
+    input_hash = models.CharField(max_length=64)
+    ats_score = models.FloatField(default=0)
+    jd_match_score = models.FloatField(default=0)
+    result = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at', '-id']
+        db_table = 'matcher_job_match'
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'job_posting'], name='job_match_resume_posting_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Resume {self.resume_id} vs {self.job_posting_id} ({self.jd_match_score}%)"
+
+    def is_current(self, engine_version, input_hash):
+        return self.engine_version == engine_version and self.input_hash == input_hash
+
+
+class AnalysisJob(models.Model):
+    """
+    Database-backed work item for the background analysis worker.
+    A running job whose lock is older than the visibility timeout is
+    treated as abandoned and can be claimed again.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='jobs'
+    )
+    status = models.CharField(
+        max_length=20,
+        default=STATUS_QUEUED,
+        choices=[
+            (STATUS_QUEUED, "Queued"),
+            (STATUS_RUNNING, "Running"),
+            (STATUS_DONE, "Done"),
+            (STATUS_FAILED, "Failed"),
+        ]
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        db_table = 'matcher_analysis_job'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='analysis_job_ready_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} for resume {self.resume_id} ({self.status})"
+
+
+class ExtractionCache(models.Model):
+    """
+    Extracted text keyed by the SHA-256 of the uploaded file bytes.
+    Entries from an older extraction version are ignored and overwritten.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    extracted_text = models.TextField()
+    page_count = models.PositiveIntegerField(default=0)
+    extractor = models.CharField(max_length=50, blank=True, default="")
+    extraction_ms = models.FloatField(default=0)
+    # extraction.EXTRACTION_VERSION when extracted; older entries are redone.
+    extraction_version = models.CharField(max_length=20, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'matcher_extraction_cache'
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.extractor}, {self.page_count} pages)"
+
+
+class CorpusDocument(models.Model):
+    """
+    Stored term vector of one resume or job description.
+    Job descriptions are keyed by the SHA-256 of their text, so a JD that
+    is pasted again counts once in the corpus statistics.
+    """
+    KIND_RESUME = "resume"
+    KIND_JOB = "job"
+
+    kind = models.CharField(
+        max_length=10,
+        choices=[
+            (KIND_RESUME, "Resume"),
+            (KIND_JOB, "Job description"),
+        ]
+    )
+    key = models.CharField(max_length=64)
+    length = models.PositiveIntegerField(default=0)
+    term_vector = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'matcher_corpus_document'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='corpus_document_kind_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.key} ({self.length} terms)"
+
+
+class CorpusTerm(models.Model):
+    """Number of corpus documents containing a term."""
+    term = models.CharField(max_length=100, primary_key=True)
+    document_frequency = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'matcher_corpus_term'
+
+    def __str__(self):
+        return f"{self.term} (df={self.document_frequency})"
+
+
+class CorpusStatistics(models.Model):
+    """Single row holding corpus-wide totals for BM25 (pk is always 1)."""
+    doc_count = models.PositiveIntegerField(default=0)
+    total_length = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'matcher_corpus_statistics'
+
+    def __str__(self):
+        return f"{self.doc_count} documents"
+
+    @property
+    def avg_doc_length(self):
+        return self.total_length / self.doc_count if self.doc_count else 0.0
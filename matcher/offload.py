@@ -0,0 +1,62 @@
+"""
+Bounded thread pools for async views.
+
+Async views must not block the event loop, so blocking work is handed to
+one of two pools: ``run_cpu`` for extraction and scoring, ``run_io`` for
+request parsing and other file work. Both pools have a fixed size
+(ASYNC_CPU_WORKERS / ASYNC_IO_WORKERS), so a burst of uploads queues up
+instead of spawning a thread each, and the event loop keeps accepting and
+answering requests meanwhile.
+
+Offloaded calls run with a copy of the caller's context, so stage timers
+still land in the request's breakdown, and database connections the call
+opened are closed afterwards, as at the end of a request.
+"""
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+T = TypeVar("T")
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    executor = _executors.get(kind)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                size = settings.ASYNC_CPU_WORKERS if kind == "cpu" else settings.ASYNC_IO_WORKERS
+                executor = _executors[kind] = ThreadPoolExecutor(
+                    max_workers=size, thread_name_prefix=f"skillmatch-{kind}"
+                )
+    return executor
+
+
+def _closing_connections(func: Callable[..., T]) -> Callable[..., T]:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run CPU-bound work (extraction, scoring) on the bounded CPU pool."""
+    call = sync_to_async(_closing_connections(func), thread_sensitive=False, executor=get_executor("cpu"))
+    return await call(*args, **kwargs)
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run blocking file work (upload parsing, disk reads) on the bounded I/O pool."""
+    call = sync_to_async(_closing_connections(func), thread_sensitive=False, executor=get_executor("io"))
+    return await call(*args, **kwargs)
@@ -0,0 +1,166 @@
+"""
+Rendered PDF reports, cached on disk.
+
+A report is rendered once per (resume, analysis version, template
+version) into REPORT_CACHE_DIR and served from there afterwards. The file
+name carries a digest of the three, which doubles as the HTTP ETag, so a
+re-analysis or a template change produces a new file and older versions
+of the same resume's report are removed.
+
+Bulk exports stream a ZIP archive: each report is copied into the archive
+in small chunks and handed to the response as soon as it is written, so
+memory use does not grow with the number of reports.
+"""
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+from typing import Iterable, Iterator, List, NamedTuple
+
+from django.conf import settings
+
+from . import metrics
+from .analysis import analysis_input_hash, get_analysis
+from .models import Resume
+from .services import current_analysis_version
+from .utils import REPORT_TEMPLATE_VERSION, write_resume_report
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CachedReport(NamedTuple):
+    path: str
+    etag: str
+    size: int
+
+
+def report_cache_dir() -> str:
+    return settings.REPORT_CACHE_DIR
+
+
+def report_filename(resume: Resume) -> str:
+    return f"resume-{resume.pk}-report.pdf"
+
+
+def _report_paths(resume_id: int) -> List[str]:
+    return glob.glob(os.path.join(report_cache_dir(), f"{resume_id}-*.pdf"))
+
+
+def report_version(resume: Resume) -> str:
+    """Digest of everything the rendered PDF depends on."""
+    digest = hashlib.sha256()
+    for part in (
+        current_analysis_version(),
+        analysis_input_hash(resume.extracted_text, resume.job_description),
+        REPORT_TEMPLATE_VERSION,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:24]
+
+
+def get_report(resume: Resume) -> CachedReport:
+    """Return the cached report for a completed resume, rendering it on a miss."""
+    # Brings the snapshot up to date first, so the version below describes it.
+    analysis = get_analysis(resume)
+    version = report_version(resume)
+    path = os.path.join(report_cache_dir(), f"{resume.pk}-{version}.pdf")
+
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = None
+    metrics.REPORT_CACHE.inc(result="hit" if size is not None else "miss")
+    if size is not None:
+        return CachedReport(path, version, size)
+
+    with metrics.stage_timer("render_report"):
+        os.makedirs(report_cache_dir(), exist_ok=True)
+        # Rendered beside the final path and renamed into place, so a
+        # concurrent reader never sees a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=report_cache_dir(), prefix=f".{resume.pk}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_resume_report(resume, analysis, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    for stale in _report_paths(resume.pk):
+        if stale != path:
+            remove_file(stale)
+    return CachedReport(path, version, os.path.getsize(path))
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_cached_reports(resume_id: int) -> None:
+    for path in _report_paths(resume_id):
+        remove_file(path)
+
+
+# =========================================
+# BULK EXPORT
+# =========================================
+
+class _ZipStream:
+    """Write-only, unseekable sink; the generator drains what the archive wrote."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def archive_name(resume: Resume) -> str:
+    username = getattr(resume.user, "username", "") or f"user-{resume.user_id}"
+    return f"{username}/{report_filename(resume)}"
+
+
+def iter_report_zip(resumes: Iterable[Resume]) -> Iterator[bytes]:
+    """
+    Stream a ZIP of the resumes' reports. Reports that fail to render are
+    logged and left out rather than aborting the whole download.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for resume in resumes:
+            try:
+                report = get_report(resume)
+            except Exception:
+                logger.exception("Could not render the report for resume %s", resume.pk)
+                continue
+
+            info = zipfile.ZipInfo(archive_name(resume), date_time=resume.uploaded_at.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(report.path, "rb") as source, archive.open(info, "w") as entry:
+                while True:
+                    chunk = source.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    entry.write(chunk)
+                    data = stream.drain()
+                    if data:
+                        yield data
+            yield stream.drain()
+    yield stream.drain()
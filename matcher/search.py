@@ -0,0 +1,265 @@
+"""
+Full-text search over Resume.extracted_text.
+
+SQLite uses the FTS5 table created in migration 0006 (ranked with bm25),
+PostgreSQL the generated ``search_vector`` column (ranked with ts_rank_cd).
+Both indexes are maintained by the database itself on insert, update and
+delete. Any other backend falls back to an unranked LIKE scan.
+
+Query syntax: plain words are ANDed, "quoted text" is a phrase and a
+trailing ``*`` makes the last word a prefix match (``pyth*``).
+"""
+import math
+import re
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Resume
+
+# Highlight markers that cannot occur in extracted text; swapped for
+# <mark> tags after the snippet has been HTML-escaped.
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_END = "\x03"
+
+_QUERY_PART = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_WORD = re.compile(r"\w+")
+
+# Columns the result list needs; the resume text itself is never loaded.
+RESULT_FIELDS = (
+    "id", "user_id", "file", "suggested_role", "ats_score",
+    "analysis_status", "uploaded_at",
+)
+
+
+# =========================================
+# QUERY PARSING
+# =========================================
+
+@dataclass(frozen=True)
+class QueryTerm:
+    words: Tuple[str, ...]
+    prefix: bool = False
+
+
+def parse_query(query: str) -> List[QueryTerm]:
+    """Split user input into words and phrases, dropping punctuation."""
+    terms = []
+    for match in _QUERY_PART.finditer(query or ""):
+        phrase, phrase_star, bare = match.groups()
+        text = phrase if phrase is not None else bare
+        words = tuple(word.lower() for word in _WORD.findall(text))
+        if not words:
+            continue
+        prefix = bool(phrase_star) if phrase is not None else bare.endswith("*")
+        terms.append(QueryTerm(words=words, prefix=prefix))
+    return terms
+
+
+def to_fts5_query(terms: List[QueryTerm]) -> str:
+    # Every term is quoted, so FTS5 operators typed by users are inert.
+    return " ".join(
+        '"' + " ".join(term.words) + '"' + ("*" if term.prefix else "")
+        for term in terms
+    )
+
+
+def to_tsquery(terms: List[QueryTerm]) -> str:
+    parts = []
+    for term in terms:
+        words = list(term.words)
+        if term.prefix:
+            words[-1] += ":*"
+        parts.append("(" + " <-> ".join(words) + ")")
+    return " & ".join(parts)
+
+
+# =========================================
+# RESULTS
+# =========================================
+
+@dataclass
+class SearchHit:
+    resume: Resume
+    rank: float
+    snippet: str
+
+
+@dataclass
+class SearchPage:
+    query: str
+    page: int
+    per_page: int
+    total: int
+    hits: List[SearchHit] = field(default_factory=list)
+
+    @property
+    def num_pages(self) -> int:
+        return max(1, math.ceil(self.total / self.per_page))
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.num_pages
+
+
+def _render_snippet(raw: str) -> str:
+    html = escape(" ".join((raw or "").split()))
+    html = html.replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_END, "</mark>")
+    return mark_safe(html)
+
+
+def get_page_size(requested=None) -> int:
+    default = getattr(settings, "SEARCH_PAGE_SIZE", 20)
+    maximum = getattr(settings, "SEARCH_MAX_PAGE_SIZE", 100)
+    try:
+        size = int(requested or default)
+    except (TypeError, ValueError):
+        size = default
+    return min(max(size, 1), maximum)
+
+
+# =========================================
+# BACKENDS
+# =========================================
+
+def _search_sqlite(terms, user_id, limit, offset):
+    where = "matcher_resume_fts MATCH %s"
+    params = [to_fts5_query(terms)]
+    if user_id is not None:
+        where += " AND r.user_id = %s"
+        params.append(user_id)
+
+    base = (
+        "FROM matcher_resume_fts "
+        "JOIN matcher_resume r ON r.id = matcher_resume_fts.rowid "
+        f"WHERE {where}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) {base}", params)
+        total = cursor.fetchone()[0]
+
+        cursor.execute(
+            "SELECT r.id, -bm25(matcher_resume_fts), "
+            "snippet(matcher_resume_fts, 0, %s, %s, '…', 24) "
+            f"{base} ORDER BY bm25(matcher_resume_fts), r.id DESC LIMIT %s OFFSET %s",
+            [_HIGHLIGHT_START, _HIGHLIGHT_END, *params, limit, offset],
+        )
+        rows = cursor.fetchall()
+    return total, rows
+
+
+def _search_postgresql(terms, user_id, limit, offset):
+    where = "r.search_vector @@ q"
+    params = [to_tsquery(terms)]
+    if user_id is not None:
+        where += " AND r.user_id = %s"
+        params.append(user_id)
+
+    base = f"FROM matcher_resume r, to_tsquery('english', %s) q WHERE {where}"
+    headline_options = (
+        f"StartSel={_HIGHLIGHT_START}, StopSel={_HIGHLIGHT_END}, "
+        "MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=…"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) {base}", params)
+        total = cursor.fetchone()[0]
+
+        # ts_headline re-parses the document, so it only runs on the page rows.
+        cursor.execute(
+            "SELECT page.id, page.rank, "
+            "ts_headline('english', r.extracted_text, to_tsquery('english', %s), %s) "
+            "FROM ("
+            f"  SELECT r.id, ts_rank_cd(r.search_vector, q) AS rank {base}"
+            "  ORDER BY rank DESC, r.id DESC LIMIT %s OFFSET %s"
+            ") page JOIN matcher_resume r ON r.id = page.id "
+            "ORDER BY page.rank DESC, page.id DESC",
+            [params[0], headline_options, *params, limit, offset],
+        )
+        rows = cursor.fetchall()
+    return total, rows
+
+
+def _search_fallback(terms, user_id, limit, offset):
+    queryset = Resume.objects.all()
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    for term in terms:
+        queryset = queryset.filter(extracted_text__icontains=" ".join(term.words))
+
+    total = queryset.count()
+    first = " ".join(terms[0].words)
+    rows = []
+    for resume_id, text in queryset.order_by("-id").values_list("id", "extracted_text")[offset:offset + limit]:
+        position = text.lower().find(first)
+        if position < 0:
+            rows.append((resume_id, 0.0, text[:160]))
+            continue
+        start = max(position - 80, 0)
+        snippet = (
+            text[start:position] + _HIGHLIGHT_START + text[position:position + len(first)]
+            + _HIGHLIGHT_END + text[position + len(first):position + len(first) + 80]
+        )
+        rows.append((resume_id, 0.0, snippet))
+    return total, rows
+
+
+_BACKENDS = {
+    "sqlite": _search_sqlite,
+    "postgresql": _search_postgresql,
+}
+
+
+# =========================================
+# PUBLIC API
+# =========================================
+
+def search_resumes(query: str, user=None, page: int = 1,
+                   per_page: Optional[int] = None) -> SearchPage:
+    """
+    Ranked full-text search over resume text.
+    ``user`` restricts results to that user's resumes; None searches all.
+    """
+    per_page = get_page_size(per_page)
+    page = max(int(page or 1), 1)
+    result = SearchPage(query=query, page=page, per_page=per_page, total=0)
+
+    terms = parse_query(query)
+    if not terms:
+        return result
+
+    backend = _BACKENDS.get(connection.vendor, _search_fallback)
+    user_id = user.pk if user is not None else None
+    result.total, rows = backend(terms, user_id, per_page, (page - 1) * per_page)
+
+    resumes = Resume.objects.only(*RESULT_FIELDS).in_bulk([row[0] for row in rows])
+    result.hits = [
+        SearchHit(resume=resumes[resume_id], rank=round(rank or 0.0, 6), snippet=_render_snippet(snippet))
+        for resume_id, rank, snippet in rows
+        if resume_id in resumes
+    ]
+    return result
+
+
+def rebuild_search_index() -> None:
+    """
+    Re-index every resume. Only needed on SQLite after a migration that
+    rebuilt matcher_resume (which drops its triggers) or after raw bulk
+    loads; PostgreSQL's generated column is always current.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    # The trigger DDL lives in the migration; every statement is idempotent.
+    migration = import_module("matcher.migrations.0006_resume_search_index")
+    with connection.cursor() as cursor:
+        for statement in migration.SQLITE_FORWARD:
+            cursor.execute(statement)
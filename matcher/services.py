@@ -1,12 +1,33 @@
+import os
 import re
+import hashlib
 import logging
-from typing import Optional, Set, List, Tuple, Dict
+from functools import cached_property
+from typing import Optional, Set, List, Tuple, Dict, FrozenSet, Union
 
-import PyPDF2
 from pydantic import BaseModel, Field, ValidationError
 
+from resume_diagnostics_engine.bm25 import (
+    rank_by_weight, term_vector, term_weights, weighted_overlap,
+)
+from resume_diagnostics_engine.role_catalog import get_catalog, top_roles
+from resume_diagnostics_engine.section_detector import SectionSpan, section_kinds, segment_sections
+from resume_diagnostics_engine.skill_taxonomy import SOFT, TECHNICAL, find_skills, get_taxonomy
+
+from .memo import memoize
+from .metrics import timed
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change to any analyzer alters its output, so stored
+# analysis snapshots are recomputed on their next read.
+ANALYSIS_ENGINE_VERSION = "2.5"
+
+
+def current_analysis_version() -> str:
+    """Engine version plus skill taxonomy version; stored results older than this are recomputed."""
+    return f"{ANALYSIS_ENGINE_VERSION}+t{get_taxonomy().version}"
+
 
 # =========================================
 # DATA VALIDATION MODEL
@@ -28,26 +49,6 @@ STOPWORDS = {
     "were", "it", "will", "your", "you", "their", "our", "we", "they"
 }
 
-TECH_KEYWORDS = [
-    "python", "java", "c", "c++", "sql", "mysql", "postgresql",
-    "html", "css", "javascript", "react", "node", "django", "flask",
-    "api", "rest", "docker", "aws", "git", "github", "linux",
-    "pandas", "numpy", "machine learning", "data analysis",
-    "excel", "power bi", "tableau"
-]
-
-SOFT_SKILLS = [
-    "communication", "teamwork", "leadership", "adaptability",
-    "problem solving", "organizational skills", "initiative",
-    "time management", "critical thinking"
-]
-
-RESUME_SECTIONS = [
-    "summary", "objective", "education", "skills",
-    "projects", "experience", "internship", "certifications",
-    "achievements", "languages"
-]
-
 ACTION_VERBS = [
     "developed", "designed", "implemented", "built",
     "created", "led", "managed", "engineered", "optimized"
@@ -74,34 +75,161 @@ def extract_keywords(text: str) -> Set[str]:
 
 
 # =========================================
-# PDF TEXT EXTRACTION
+# ANALYSIS DOCUMENTS
 # =========================================
 
-def extract_text_from_pdf(path: str) -> str:
-    try:
-        text_content = []
+class AnalysisDocument:
+    """
+    Raw text plus the features analyzers derive from it.
+    Every feature is computed lazily and at most once per document.
+    """
+
+    def __init__(self, text: Optional[str]):
+        self.text = text or ""
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Identifies the text in memoization keys (see matcher.memo)."""
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def clean(self) -> str:
+        return clean_text(self.text)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return self.clean.split()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @cached_property
+    def term_vector(self) -> Dict[str, int]:
+        # Skill aliases count as their canonical name, so "postgres" matches "postgresql".
+        aliases = get_taxonomy().token_aliases
+        words = (aliases.get(w, w) for w in self.tokens)
+        return term_vector(w for w in words if w not in STOPWORDS and len(w) > 2)
+
+    @cached_property
+    def keywords(self) -> Set[str]:
+        return set(self.term_vector)
+
+    @cached_property
+    def tech_skills(self) -> List[str]:
+        return find_skills(self.clean, TECHNICAL)
+
+    @cached_property
+    def soft_skills(self) -> List[str]:
+        return find_skills(self.clean, SOFT)
 
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
 
-            if reader.is_encrypted:
-                logger.error(f"Encrypted PDF: {path}")
-                return ""
+class JobDocument(AnalysisDocument):
+    """A job description prepared for matching."""
 
-            for page in reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text_content.append(extracted)
+    @cached_property
+    def term_weights(self) -> Dict[str, float]:
+        # IDF of every JD keyword over the stored corpus, looked up once.
+        return term_weights(self.keywords)
+
+
+class ResumeDocument(AnalysisDocument):
+    """A resume prepared for scoring and diagnosis."""
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.split("\n")
+
+    @cached_property
+    def line_count(self) -> int:
+        return len([line for line in self.text.splitlines() if line.strip()])
+
+    @cached_property
+    def sections(self) -> List[SectionSpan]:
+        return segment_sections(self.text)
+
+    @cached_property
+    def section_kinds(self) -> FrozenSet[str]:
+        return section_kinds(self.sections)
+
+    @cached_property
+    def section_hits(self) -> int:
+        # Distinct recognized section headers, not keyword mentions anywhere in the text.
+        return len(self.section_kinds)
+
+    @cached_property
+    def action_hits(self) -> int:
+        return sum(1 for word in ACTION_VERBS if word in self.clean)
+
+    @cached_property
+    def number_count(self) -> int:
+        return len(re.findall(r'\b\d+%|\b\d+\b', self.clean))
+
+    @cached_property
+    def has_numbers(self) -> bool:
+        return bool(re.search(r'\b\d+%?\b', self.clean))
+
+    @cached_property
+    def has_email(self) -> bool:
+        return "@" in self.clean
+
+    @cached_property
+    def has_phone(self) -> bool:
+        return bool(re.search(r'\b\d{10}\b', self.clean))
+
+    @cached_property
+    def has_linkedin(self) -> bool:
+        return "linkedin" in self.clean
+
+    @cached_property
+    def has_github(self) -> bool:
+        return "github" in self.clean
+
+    @cached_property
+    def experience_years(self) -> int:
+        # Largest "N years" / "N+ yrs" mention; a rough seniority signal.
+        years = [int(n) for n in re.findall(r'\b(\d{1,2})\+?\s*(?:years?|yrs?)\b', self.lower)]
+        return max(years, default=0)
+
+
+ResumeInput = Union[str, ResumeDocument]
+JobInput = Union[str, JobDocument, None]
+
+
+def as_resume_document(resume: ResumeInput) -> ResumeDocument:
+    if isinstance(resume, ResumeDocument):
+        return resume
+    return ResumeDocument(resume)
+
+
+def as_job_document(job_description: JobInput) -> JobDocument:
+    if isinstance(job_description, JobDocument):
+        return job_description
+    return JobDocument(job_description)
+
+
+# =========================================
+# PDF TEXT EXTRACTION
+# =========================================
 
-        return "\n".join(text_content).strip()
+def extract_text_from_pdf(path) -> str:
+    """
+    Extract PDF text through the shared extractor registry.
+    ``path`` may also be a binary file object or an UploadedFile.
+    """
+    # Imported here so the analyzers stay importable before Django's app
+    # registry is ready (e.g. in batch worker processes).
+    from .extraction import extract_document
 
-    except FileNotFoundError:
+    if isinstance(path, str) and not os.path.exists(path):
         logger.error(f"File not found: {path}")
         return ""
 
-    except Exception as e:
-        logger.error(f"Extraction error: {e}")
-        return ""
+    return extract_document(path, ext=".pdf").text
 
 
 def get_clean_resume_payload(path: str) -> Optional[ResumeData]:
@@ -121,52 +249,63 @@ def get_clean_resume_payload(path: str) -> Optional[ResumeData]:
 # SKILL EXTRACTION
 # =========================================
 
-def extract_technical_skills(resume_text: str) -> List[str]:
-    text = clean_text(resume_text)
-    return [skill for skill in TECH_KEYWORDS if skill in text]
+def extract_technical_skills(resume_text: Union[str, AnalysisDocument]) -> List[str]:
+    if isinstance(resume_text, AnalysisDocument):
+        return list(resume_text.tech_skills)
+    return find_skills(clean_text(resume_text), TECHNICAL)
 
 
-def extract_soft_skills(resume_text: str) -> List[str]:
-    text = clean_text(resume_text)
-    return [skill for skill in SOFT_SKILLS if skill in text]
+def extract_soft_skills(resume_text: Union[str, AnalysisDocument]) -> List[str]:
+    if isinstance(resume_text, AnalysisDocument):
+        return list(resume_text.soft_skills)
+    return find_skills(clean_text(resume_text), SOFT)
 
 
 # =========================================
-# JD MATCHING
+# ROLE SUGGESTIONS
 # =========================================
 
-def jd_match_score(resume_text: str, jd_text: str) -> Tuple[int, List[str]]:
-    if not jd_text or not jd_text.strip():
-        return 0, []
+def suggest_roles(resume_text: ResumeInput, k: int = 5) -> List[Dict[str, object]]:
+    """Best-fitting job titles from the role catalog, best first."""
+    resume = as_resume_document(resume_text)
+    skills = get_catalog().skills_in(resume.clean) + list(resume.tech_skills)
+    return top_roles(skills, resume.experience_years, k=k)
 
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(jd_text)
 
-    if not jd_keywords:
+# =========================================
+# JD MATCHING
+# =========================================
+
+def jd_match_score(resume_text: ResumeInput, jd_text: JobInput) -> Tuple[int, List[str]]:
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(jd_text)
+
+    if not jd.keywords:
         return 0, []
 
-    matched = resume_keywords.intersection(jd_keywords)
-    score = int((len(matched) / len(jd_keywords)) * 100)
+    # Rare JD terms carry more weight than ones found in most documents.
+    weights = jd.term_weights
+    matched = resume.keywords.intersection(jd.keywords)
+    score = int(weighted_overlap(resume.keywords, weights) * 100)
 
-    return score, sorted(list(matched))[:20]
+    return score, rank_by_weight(matched, weights)[:20]
 
 
-def keyword_match_score(resume_text: str, jd_text: str) -> Tuple[int, List[str]]:
+def keyword_match_score(resume_text: ResumeInput, jd_text: JobInput) -> Tuple[int, List[str]]:
     return jd_match_score(resume_text, jd_text)
 
 
-def missing_skills(resume_text: str, jd_text: str) -> List[str]:
-    if not jd_text or not jd_text.strip():
-        return []
-
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(jd_text)
+def missing_skills(resume_text: ResumeInput, jd_text: JobInput) -> List[str]:
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(jd_text)
 
-    missing = jd_keywords - resume_keywords
-    return sorted(list(missing))[:15]
+    missing = jd.keywords - resume.keywords
+    if not missing:
+        return []
+    return rank_by_weight(missing, jd.term_weights)[:15]
 
 
-def skill_gap_analysis(resume_text: str, jd_text: str) -> List[str]:
+def skill_gap_analysis(resume_text: ResumeInput, jd_text: JobInput) -> List[str]:
     return missing_skills(resume_text, jd_text)
 
 
@@ -174,40 +313,42 @@ def skill_gap_analysis(resume_text: str, jd_text: str) -> List[str]:
 # ATS SCORE ENGINE
 # =========================================
 
-def realistic_ats_score(resume_text: str, job_description: str) -> Tuple[int, Dict[str, int]]:
-    resume_text = clean_text(resume_text)
-    job_description = clean_text(job_description)
+def ats_jd_points(jd_score: int) -> int:
+    """The JD-dependent part of realistic_ats_score; every other component depends on the resume only."""
+    return min(int(jd_score * 0.30), 30)
+
+
+def realistic_ats_score(resume_text: ResumeInput, job_description: JobInput) -> Tuple[int, Dict[str, int]]:
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(job_description)
 
     breakdown = {}
 
     # 1. JD Match (30)
-    jd_score, _ = jd_match_score(resume_text, job_description)
-    breakdown["JD Match"] = min(int(jd_score * 0.30), 30)
+    jd_score, _ = jd_match_score(resume, jd)
+    breakdown["JD Match"] = ats_jd_points(jd_score)
 
     # 2. Skills Match (25)
-    tech_skills_found = extract_technical_skills(resume_text)
-    skills_score = min(len(tech_skills_found) * 3, 25)
+    skills_score = min(len(resume.tech_skills) * 3, 25)
     breakdown["Skills Match"] = skills_score
 
     # 3. Resume Structure (20)
-    section_hits = sum(1 for section in RESUME_SECTIONS if section in resume_text)
-    structure_score = min(section_hits * 3, 20)
+    structure_score = min(resume.section_hits * 3, 20)
     breakdown["Structure"] = structure_score
 
     # 4. Experience / Action Depth (15)
-    action_hits = sum(1 for word in ACTION_VERBS if word in resume_text)
-    experience_score = min(action_hits * 3, 15)
+    experience_score = min(resume.action_hits * 3, 15)
     breakdown["Experience Depth"] = experience_score
 
     # 5. Formatting / Content Richness (10)
     formatting_score = 0
-    word_count = len(resume_text.split())
+    word_count = resume.word_count
 
     if word_count > 150:
         formatting_score += 5
     if word_count > 250:
         formatting_score += 3
-    if len(re.findall(r'\b\d+%|\b\d+\b', resume_text)) > 3:
+    if resume.number_count > 3:
         formatting_score += 2
 
     breakdown["Formatting"] = min(formatting_score, 10)
@@ -219,27 +360,29 @@ def realistic_ats_score(resume_text: str, job_description: str) -> Tuple[int, Di
 # =========================================
 # RESUME DIAGNOSIS ENGINE
 # =========================================
-def diagnose_resume(resume_text: str) -> Dict[str, object]:
-    original_text = resume_text or ""
-    text = clean_text(resume_text)
-
-    found_tech = extract_technical_skills(text)
-    found_soft = extract_soft_skills(text)
-
-    has_projects = "project" in text or "projects" in text
-    has_certifications = "certification" in text or "certifications" in text
-    has_experience = "experience" in text or "internship" in text or "intern" in text
-    has_education = "education" in text or "college" in text or "b.tech" in text or "degree" in text
-    has_email = "@" in text
-    has_phone = bool(re.search(r'\b\d{10}\b', text))
-    has_linkedin = "linkedin" in text
-    has_github = "github" in text
-
-    word_count = len(text.split())
-    action_hits = sum(1 for word in ACTION_VERBS if word in text)
-    has_numbers = bool(re.search(r'\b\d+%?\b', text))
-    line_count = len([line for line in original_text.splitlines() if line.strip()])
-    section_hits = sum(1 for section in RESUME_SECTIONS if section in text)
+@memoize(current_analysis_version)
+def diagnose_resume(resume_text: ResumeInput) -> Dict[str, object]:
+    resume = as_resume_document(resume_text)
+    text = resume.clean
+
+    found_tech = list(resume.tech_skills)
+    found_soft = list(resume.soft_skills)
+
+    sections = resume.section_kinds
+    has_projects = "projects" in sections
+    has_certifications = "certifications" in sections
+    has_experience = "experience" in sections
+    has_education = "education" in sections or "college" in text or "b.tech" in text or "degree" in text
+    has_email = resume.has_email
+    has_phone = resume.has_phone
+    has_linkedin = resume.has_linkedin
+    has_github = resume.has_github
+
+    word_count = resume.word_count
+    action_hits = resume.action_hits
+    has_numbers = resume.has_numbers
+    line_count = resume.line_count
+    section_hits = resume.section_hits
 
     diagnosis = {
         "overall_strength": "Weak",
@@ -439,11 +582,14 @@ def resume_suggestions(score: int) -> List[str]:
 # AI-LIKE REWRITE SUGGESTIONS
 # =========================================
 
-def ai_resume_suggestions(resume_text: str, job_description: str = "") -> Tuple[List[str], List[Tuple[str, str]]]:
+def ai_resume_suggestions(resume_text: ResumeInput, job_description: JobInput = "") -> Tuple[List[str], List[Tuple[str, str]]]:
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(job_description)
+
     suggestions = []
     improved_lines = []
 
-    lines = resume_text.split("\n")
+    lines = resume.lines
     weak_words = ["worked on", "responsible for", "did", "helped", "made"]
 
     for line in lines:
@@ -464,40 +610,47 @@ def ai_resume_suggestions(resume_text: str, job_description: str = "") -> Tuple[
                     suggestions.append(f"Rewrite: '{line}' → '{improved}'")
                 break
 
-    if not any(verb in resume_text.lower() for verb in ACTION_VERBS):
+    if not any(verb in resume.lower for verb in ACTION_VERBS):
         suggestions.append("Use strong action verbs like Developed, Designed, Implemented.")
 
-    if "%" not in resume_text:
+    if "%" not in resume.text:
         suggestions.append("Add measurable results (e.g., improved efficiency by 30%).")
 
-    if "project" not in resume_text.lower():
+    if "project" not in resume.lower:
         suggestions.append("Add a project section to showcase practical experience.")
 
-    if job_description:
-        missing = missing_skills(resume_text, job_description)
-        if missing:
-            suggestions.append(f"Add relevant keywords from JD: {', '.join(missing[:5])}")
+    if jd.text:
+        suggestions += jd_keyword_suggestions(missing_skills(resume, jd))
 
     return suggestions, improved_lines
 
+
+JD_KEYWORDS_SUGGESTION = "Add relevant keywords from JD: "
+
+
+def jd_keyword_suggestions(missing: List[str]) -> List[str]:
+    if not missing:
+        return []
+    return [JD_KEYWORDS_SUGGESTION + ", ".join(missing[:5])]
+
 # =========================================
 # ATS READABILITY / TEMPLATE WARNING
 # =========================================
 
-def detect_ats_template_risk(resume_text: str) -> dict:
+@memoize(current_analysis_version)
+def detect_ats_template_risk(resume_text: ResumeInput) -> dict:
     """
     Detect whether resume may be poorly readable by ATS due to template-heavy formatting.
     """
-    original_text = resume_text or ""
-    text = clean_text(original_text)
+    resume = as_resume_document(resume_text)
 
     warnings = []
     risk_level = "Low"
     readable = True
 
-    word_count = len(text.split())
-    line_count = len([line for line in original_text.splitlines() if line.strip()])
-    section_hits = sum(1 for section in RESUME_SECTIONS if section in text)
+    word_count = resume.word_count
+    line_count = resume.line_count
+    section_hits = resume.section_hits
 
     # Heuristic 1: Too little extracted text
     if word_count < 80:
@@ -512,8 +665,7 @@ def detect_ats_template_risk(resume_text: str) -> dict:
         warnings.append("Resume appears poorly structured after extraction, which may indicate ATS readability issues.")
 
     # Heuristic 4: Too few technical/career signals
-    tech_found = extract_technical_skills(text)
-    if len(tech_found) == 0:
+    if len(resume.tech_skills) == 0:
         warnings.append("No clear technical keywords were detected. This may be due to either weak content or unreadable formatting.")
 
     # Heuristic 5: Suspiciously low content richness
@@ -537,4 +689,100 @@ def detect_ats_template_risk(resume_text: str) -> dict:
         "warnings": warnings,
         "word_count": word_count,
         "section_hits": section_hits,
-    }
\ No newline at end of file
+    }
+
+
+# =========================================
+# FULL ANALYSIS PIPELINE
+# =========================================
+
+def corpus_weights_digest(resume_text: ResumeInput, job_description: JobInput = "") -> str:
+    """
+    Digest of the JD term weights run_analysis scores with: the only corpus
+    statistics its result depends on. It changes with the document count
+    and the JD terms' document frequencies, not when an unchanged document
+    is indexed again.
+    """
+    weights = as_job_document(job_description).term_weights
+    return hashlib.sha256(repr(sorted(weights.items())).encode("utf-8")).hexdigest()
+
+
+@memoize(current_analysis_version, depends_on=corpus_weights_digest)
+def run_analysis(resume_text: ResumeInput, job_description: JobInput = "") -> Dict[str, object]:
+    """
+    Run every analyzer once over shared documents.
+    The result only holds JSON-serializable values so it can be persisted as-is.
+    """
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(job_description)
+
+    ats_score, breakdown = timed("realistic_ats_score", realistic_ats_score, resume, jd)
+    keyword_score, matched_keywords = timed("keyword_match_score", keyword_match_score, resume, jd)
+    jd_score, jd_matched = timed("jd_match_score", jd_match_score, resume, jd)
+    ai_suggestions, improved_lines = timed("ai_resume_suggestions", ai_resume_suggestions, resume, jd)
+
+    return {
+        "ats_score": ats_score,
+        "breakdown": breakdown,
+        "keyword_score": keyword_score,
+        "matched_keywords": matched_keywords,
+        "missing": timed("missing_skills", missing_skills, resume, jd),
+        "jd_score": jd_score,
+        "jd_matched": jd_matched,
+        "skill_gap": timed("skill_gap_analysis", skill_gap_analysis, resume, jd),
+        "suggestions": resume_suggestions(ats_score),
+        "ai_suggestions": ai_suggestions,
+        "improved_lines": [list(pair) for pair in improved_lines],
+        "resume_diagnosis": timed("diagnose_resume", diagnose_resume, resume),
+        "detected_skills": timed("extract_technical_skills", extract_technical_skills, resume),
+        "ats_template_risk": timed("detect_ats_template_risk", detect_ats_template_risk, resume),
+        "suggested_roles": timed("suggest_roles", suggest_roles, resume),
+    }
+
+
+# Keys of a run_analysis result that depend on the job description.
+JD_RESULT_KEYS = (
+    "ats_score", "breakdown", "keyword_score", "matched_keywords", "missing",
+    "jd_score", "jd_matched", "skill_gap", "suggestions", "ai_suggestions",
+)
+
+
+def run_jd_analysis(resume_text: ResumeInput, job_description: JobInput,
+                    analysis: Dict[str, object]) -> Dict[str, object]:
+    """
+    Re-score an analyzed resume against another job description.
+    ``analysis`` is the resume's stored run_analysis result: its resume-only
+    parts (breakdown components, diagnosis, skills, template risk, roles)
+    are reused, and only the keyword overlap with the new JD is computed.
+    Returns the JD_RESULT_KEYS entries.
+    """
+    resume = as_resume_document(resume_text)
+    jd = as_job_document(job_description)
+
+    jd_score, jd_matched = timed("jd_match_score", jd_match_score, resume, jd)
+    missing = timed("missing_skills", missing_skills, resume, jd)
+
+    breakdown = dict(analysis["breakdown"])
+    breakdown["JD Match"] = ats_jd_points(jd_score)
+    ats_score = sum(breakdown.values())
+
+    ai_suggestions = [
+        suggestion for suggestion in analysis["ai_suggestions"]
+        if not suggestion.startswith(JD_KEYWORDS_SUGGESTION)
+    ]
+    if jd.text:
+        ai_suggestions += jd_keyword_suggestions(missing)
+
+    return {
+        "ats_score": ats_score,
+        "breakdown": breakdown,
+        # keyword_match_score and skill_gap_analysis are aliases of these two.
+        "keyword_score": jd_score,
+        "matched_keywords": jd_matched,
+        "missing": missing,
+        "jd_score": jd_score,
+        "jd_matched": jd_matched,
+        "skill_gap": list(missing),
+        "suggestions": resume_suggestions(ats_score),
+        "ai_suggestions": ai_suggestions,
+    }
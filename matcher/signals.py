@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .corpus import remove_document
+from .models import CorpusDocument, Resume
+from .reports import remove_cached_reports
+
+
+@receiver(post_delete, sender=Resume)
+def remove_resume_from_corpus(sender, instance, **kwargs):
+    """Keep BM25 document frequencies in step when a resume is deleted."""
+    remove_document(CorpusDocument.KIND_RESUME, instance.pk)
+
+
+@receiver(post_delete, sender=Resume)
+def remove_resume_reports(sender, instance, **kwargs):
+    """Cached PDFs are keyed by resume id, so they go with the resume."""
+    remove_cached_reports(instance.pk)
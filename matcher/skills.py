@@ -0,0 +1,130 @@
+"""
+Normalized skill storage.
+
+Each analysis writes its detected, matched and missing skills as
+ResumeSkill rows pointing at shared Skill rows, so questions like "how
+many resumes list Docker" are answered from the (skill, kind, resume)
+index instead of parsing the comma-joined columns of every resume.
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from resume_diagnostics_engine.skill_taxonomy import get_taxonomy
+
+from .models import Resume, ResumeSkill, Skill
+
+# Stays under SQLite's bound-parameter limit for `key IN (...)` queries.
+_IN_CHUNK = 500
+
+# kind -> (analysis result field, analyzer that produced it)
+SKILL_SOURCES = {
+    ResumeSkill.KIND_DETECTED: ("detected_skills", "extract_technical_skills"),
+    ResumeSkill.KIND_MATCHED: ("jd_matched", "jd_match_score"),
+    ResumeSkill.KIND_MISSING: ("missing", "missing_skills"),
+}
+
+
+def skill_key(name: str) -> str:
+    return " ".join(str(name).split()).lower()[:100]
+
+
+def _query_key(name: str) -> str:
+    """Key to look a skill up by; taxonomy aliases resolve to the stored canonical name."""
+    return skill_key(get_taxonomy().canonical(name) or name)
+
+
+def _chunks(items: List[str], size: int = _IN_CHUNK) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# =========================================
+# WRITING
+# =========================================
+
+def resolve_skills(names: Iterable[str]) -> Dict[str, Skill]:
+    """Return {key: Skill} for the given names, creating the missing ones in bulk."""
+    wanted: Dict[str, str] = {}
+    for name in names:
+        key = skill_key(name)
+        if key:
+            wanted.setdefault(key, " ".join(str(name).split())[:100])
+    if not wanted:
+        return {}
+
+    Skill.objects.bulk_create(
+        [Skill(key=key, name=name) for key, name in wanted.items()],
+        ignore_conflicts=True,
+        batch_size=_IN_CHUNK,
+    )
+    skills: Dict[str, Skill] = {}
+    for chunk in _chunks(sorted(wanted)):
+        skills.update((skill.key, skill) for skill in Skill.objects.filter(key__in=chunk))
+    return skills
+
+
+def build_resume_skills(resume_id: int, lists: Mapping[str, Iterable[str]],
+                        skills: Mapping[str, Skill]) -> List[ResumeSkill]:
+    """Unsaved ResumeSkill rows for {kind: names}, deduplicated per kind."""
+    rows = []
+    for kind, names in lists.items():
+        source = SKILL_SOURCES[kind][1]
+        seen = set()
+        for name in names:
+            key = skill_key(name)
+            if not key or key in seen or key not in skills:
+                continue
+            seen.add(key)
+            rows.append(ResumeSkill(
+                resume_id=resume_id, skill=skills[key], kind=kind, source=source, position=len(seen) - 1,
+            ))
+    return rows
+
+
+@transaction.atomic
+def store_resume_skills(resume: Resume, result: Mapping[str, object]) -> int:
+    """Replace a resume's skill rows with those of an analysis result."""
+    lists = {kind: list(result.get(field) or []) for kind, (field, _) in SKILL_SOURCES.items()}
+    skills = resolve_skills(name for names in lists.values() for name in names)
+
+    ResumeSkill.objects.filter(resume=resume).delete()
+    rows = build_resume_skills(resume.pk, lists, skills)
+    ResumeSkill.objects.bulk_create(rows, batch_size=_IN_CHUNK)
+    return len(rows)
+
+
+# =========================================
+# QUERIES
+# =========================================
+
+def _links(kind: str, user=None) -> QuerySet:
+    links = ResumeSkill.objects.filter(kind=kind)
+    if user is not None:
+        links = links.filter(resume__user=user)
+    return links
+
+
+def resumes_with_skill(name: str, kind: str = ResumeSkill.KIND_DETECTED, user=None) -> QuerySet:
+    resumes = Resume.objects.filter(skill_links__skill__key=_query_key(name), skill_links__kind=kind)
+    if user is not None:
+        resumes = resumes.filter(user=user)
+    return resumes
+
+
+def count_resumes_with_skill(name: str, kind: str = ResumeSkill.KIND_DETECTED, user=None) -> int:
+    return _links(kind, user).filter(skill__key=_query_key(name)).count()
+
+
+def skill_counts(kind: str = ResumeSkill.KIND_DETECTED, user=None,
+                 limit: Optional[int] = 20) -> List[Tuple[str, int]]:
+    """(skill name, number of resumes) pairs, most common first."""
+    counts = (
+        _links(kind, user)
+        .values("skill__name")
+        .annotate(resumes=Count("resume_id"))
+        .order_by("-resumes", "skill__name")
+        .values_list("skill__name", "resumes")
+    )
+    return list(counts[:limit] if limit else counts)
@@ -1,3 +1,1200 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import docx
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile, TemporaryUploadedFile
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from benchmarks import corpus as benchmark_corpus
+from benchmarks.run import compare
+from resume_diagnostics_engine import skill_taxonomy
+
+from .analysis import analyze_and_store, get_analysis, get_resume_document, rematch_resume
+from .batch import iter_batch_results, iter_zip_sources, rank_results, rank_stored
+from .corpus import index_document, rank_stored_resumes, reset_corpus
+from .exports import EXPORT_FIELDS, export_queryset, iter_export_lines
+from .extraction_pool import ExtractionPool
+from .history import decode_cursor, encode_cursor, get_history_page
+from .extraction import (
+    EXTRACTION_VERSION, EXTRACTORS, extract_cached, extract_document, file_sha256, register_extractor,
+)
+from .job_descriptions import get_job_document, import_job_descriptions, register_job_description
+from .jobs import claim_next_job, complete_job, enqueue_analysis, fail_job, queue_stats, run_job
+from . import async_views, extraction, metrics, reports
+from . import urls as matcher_urls
+from .memo import MEMO_CACHE_ALIAS
+from .models import (
+    AnalysisJob, JobDescription, AnalysisSnapshot, CorpusDocument, CorpusStatistics, ExtractionCache, JobMatch, Resume, ResumeSkill,
+    Skill,
+)
+from .reports import report_cache_dir
+from .search import parse_query, search_resumes
+from .skills import count_resumes_with_skill, resumes_with_skill, skill_counts, store_resume_skills
+from .services import (
+    JobDocument, ResumeDocument, as_resume_document, current_analysis_version,
+    find_skills, run_analysis,
+)
+
+
+RESUME_TEXT = """Jane Doe
+jane@example.com
+Skills
+Python, Django, PostgreSQL, Docker, Kubernetes
+Experience
+Backend Engineer at Acme Corp, built REST APIs in Python and Django.
+Education
+B.Tech in Computer Science
+"""
+
+JD_TEXT = """Backend engineer with Python, Django and Kubernetes experience.
+Familiarity with Terraform and AWS is a plus."""
+
+
+# Routes upload and report pages to the coroutine views, as ASYNC_VIEWS does under ASGI.
+urlpatterns = [
+    path("", include(([
+        path("upload/", async_views.upload_resume, name="upload_resume"),
+        path("view/<int:resume_id>/", async_views.view_resume_report, name="resume_view"),
+    ] + matcher_urls.urlpatterns, "matcher"))),
+    path("", include("jd_matcher.urls")),
+]
+
+
+@contextmanager
+def skill_taxonomy_file(version, extra_aliases=None):
+    """Serve a copy of the bundled taxonomy under another version, with extra aliases."""
+    with open(skill_taxonomy.DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] = version
+    for skill in data["skills"]:
+        skill["aliases"] = skill.get("aliases", []) + (extra_aliases or {}).get(skill["name"], [])
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "skills.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        with mock.patch.dict(os.environ, {"SKILL_TAXONOMY_PATH": path}):
+            skill_taxonomy._checked_at = 0.0
+            try:
+                yield path
+            finally:
+                skill_taxonomy._checked_at = 0.0
+    skill_taxonomy.get_taxonomy()
+
+
+def make_pdf(pages) -> bytes:
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for text in pages:
+        for offset, line in enumerate(text.splitlines()):
+            pdf.drawString(72, 760 - 14 * offset, line)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs=(), table_rows=()) -> bytes:
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    if table_rows:
+        table = document.add_table(rows=0, cols=len(table_rows[0]))
+        for row in table_rows:
+            cells = table.add_row().cells
+            for cell, text in zip(cells, row):
+                cell.text = text
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@override_settings(EXTRACTION_POOL_SIZE=0, ANALYSIS_USE_QUEUE=False)
+class UploadTestCase(TestCase):
+    """Uploads through the sync views, stored in a throwaway MEDIA_ROOT."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = self.settings(MEDIA_ROOT=media.name, REPORT_CACHE_DIR=os.path.join(media.name, "reports"))
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+        self.user = User.objects.create_user("uploader")
+        self.client.force_login(self.user)
+
+    def upload(self, content, name="resume.docx", job_description=JD_TEXT):
+        return self.client.post("/upload/", {
+            "resume": SimpleUploadedFile(name, content),
+            "job_description": job_description,
+        })
+
+
+# =========================================
+# ANALYSIS DOCUMENTS
+# =========================================
+
+class AnalysisDocumentTests(TestCase):
+    def test_documents_give_the_same_analysis_as_raw_text(self):
+        self.assertEqual(
+            run_analysis.uncached(ResumeDocument(RESUME_TEXT), JobDocument(JD_TEXT)),
+            run_analysis.uncached(RESUME_TEXT, JD_TEXT),
+        )
+
+    def test_features_are_computed_once_per_document(self):
+        resume = ResumeDocument(RESUME_TEXT)
+
+        with mock.patch("matcher.services.find_skills", wraps=find_skills) as find:
+            first = resume.tech_skills
+            second = as_resume_document(resume).tech_skills
+
+        self.assertEqual(find.call_count, 1)
+        self.assertIs(first, second)
+        self.assertIn("postgresql", first)
+
+    def test_term_vector_folds_skill_aliases(self):
+        vector = ResumeDocument("Postgres and k8s, then more postgres").term_vector
+
+        self.assertEqual(vector["postgresql"], 2)
+        self.assertEqual(vector["kubernetes"], 1)
+        self.assertNotIn("and", vector)
+
+
+# =========================================
+# SNAPSHOTS
+# =========================================
+
+class AnalysisSnapshotTests(TestCase):
+    def setUp(self):
+        self.resume = Resume.objects.create(
+            file="resumes/snapshot.pdf",
+            extracted_text=RESUME_TEXT,
+            job_posting=register_job_description(JD_TEXT),
+        )
+        self.result = analyze_and_store(self.resume)
+
+    def test_current_snapshot_is_served_without_reanalysis(self):
+        with mock.patch("matcher.analysis.run_analysis") as analysis:
+            result = get_analysis(Resume.objects.get(pk=self.resume.pk))
+
+        analysis.assert_not_called()
+        self.assertEqual(result, self.result)
+        self.assertEqual(self.resume.ats_score, self.result["ats_score"])
+        self.assertEqual(self.resume.analysis_status, "completed")
+
+    def test_changed_text_or_engine_version_recomputes(self):
+        Resume.objects.filter(pk=self.resume.pk).update(extracted_text=RESUME_TEXT + "Terraform on AWS\n")
+        result = get_analysis(Resume.objects.get(pk=self.resume.pk))
+        self.assertGreater(result["jd_score"], self.result["jd_score"])
+
+        AnalysisSnapshot.objects.filter(resume=self.resume).update(engine_version="0.0", result={})
+        self.assertEqual(get_analysis(Resume.objects.get(pk=self.resume.pk)), result)
+        self.assertEqual(AnalysisSnapshot.objects.get(resume=self.resume).engine_version, current_analysis_version())
+
+
+# =========================================
+# EXTRACTION
+# =========================================
+
+class ExtractorRegistryTests(TestCase):
+    def setUp(self):
+        self.addCleanup(EXTRACTORS.pop, ".test", None)
+
+    def register(self, name, pages, page_count=None, error=None):
+        def backend(source, collector):
+            if error:
+                raise error
+            for text in collector.selected(pages):
+                if not collector.accepting():
+                    break
+                collector.add(text)
+            return collector, len(pages) if page_count is None else page_count
+        register_extractor(".test", name)(backend)
+
+    def test_thin_output_falls_through_to_the_next_backend(self):
+        self.register("broken", [], error=RuntimeError("corrupt"))
+        self.register("thin", ["x"], page_count=2)
+        self.register("full", ["Page one " * 30, "Page two " * 30])
+
+        with self.assertLogs("matcher.extraction", "WARNING"):
+            result = extract_document(b"", ext=".test")
+
+        self.assertEqual(result.extractor, "full")
+        self.assertEqual(result.attempts, ["broken", "thin", "full"])
+        self.assertEqual(result.page_count, 2)
+
+    def test_longest_output_wins_when_every_backend_is_thin(self):
+        self.register("shorter", ["short"], page_count=3)
+        self.register("longer", ["a bit longer"], page_count=3)
+
+        result = extract_document(b"", ext=".test")
+
+        self.assertEqual((result.extractor, result.text), ("longer", "a bit longer"))
+
+    def test_page_budget_truncates(self):
+        self.register("pages", ["Page " * 60] * 5)
+        limits = {"time_budget": 10, "max_pages": 2, "max_chars": 100000, "min_chars_per_page": 1}
+
+        with self.settings(EXTRACTION_LIMITS=limits):
+            result = extract_document(b"", ext=".test")
+
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.text.count("Page"), 120)
+
+@override_settings(EXTRACTION_POOL_SIZE=0)
+class ExtractionCacheTests(TestCase):
+    def test_caches_complete_extraction(self):
+        content = make_docx(["Python developer with Django experience."])
+
+        first = extract_cached(content, ext=".docx")
+        second = extract_cached(content, ext=".docx")
+
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.text, first.text)
+
+    def test_does_not_cache_truncated_extraction(self):
+        content = make_docx(["Python developer with Django experience."] * 50)
+        limits = {"time_budget": 10, "max_pages": 50, "max_chars": 100, "min_chars_per_page": 200}
+
+        with self.settings(EXTRACTION_LIMITS=limits):
+            result = extract_cached(content, ext=".docx")
+
+        self.assertTrue(result.truncated)
+        self.assertLessEqual(len(result.text), 100)
+        self.assertFalse(ExtractionCache.objects.exists())
+
+        # Once the budget allows, the full text is extracted and cached.
+        result = extract_cached(content, ext=".docx")
+        self.assertFalse(result.truncated)
+        self.assertGreater(len(result.text), 100)
+        self.assertTrue(ExtractionCache.objects.exists())
+
+    def test_does_not_cache_empty_extraction(self):
+        with self.assertLogs("matcher.extraction", "WARNING"):
+            result = extract_cached(b"not a document", ext=".docx")
+
+        self.assertEqual(result.text, "")
+        self.assertFalse(ExtractionCache.objects.exists())
+
+    def test_redoes_entries_from_older_extraction_version(self):
+        content = make_docx(["Summary"], table_rows=[["Skills", "Kubernetes, Terraform"]])
+        sha256 = file_sha256(content)
+        extract_cached(content, sha256, ext=".docx")
+        ExtractionCache.objects.filter(sha256=sha256).update(extracted_text="Summary", extraction_version="")
+
+        result = extract_cached(content, ext=".docx")
+
+        self.assertFalse(result.cached)
+        self.assertIn("Kubernetes", result.text)
+        entry = ExtractionCache.objects.get(sha256=sha256)
+        self.assertEqual(entry.extraction_version, EXTRACTION_VERSION)
+        self.assertIn("Kubernetes", entry.extracted_text)
+
+
+
+class UploadExtractionCacheTests(UploadTestCase):
+    def test_identical_uploads_share_one_extraction(self):
+        content = make_docx(RESUME_TEXT.splitlines())
+
+        with mock.patch("matcher.extraction.run_extraction", wraps=extraction.run_extraction) as run:
+            self.assertEqual(self.upload(content).status_code, 200)
+            self.assertEqual(self.upload(content, "renamed.docx").status_code, 200)
+
+        self.assertEqual(run.call_count, 1)
+        first, second = Resume.objects.order_by("id")
+        self.assertEqual(first.file_sha256, file_sha256(content))
+        self.assertEqual(second.file_sha256, first.file_sha256)
+        self.assertEqual(second.extracted_text, first.extracted_text)
+        self.assertEqual(ExtractionCache.objects.count(), 1)
+
+
+class UploadInPlaceTests(UploadTestCase):
+    def upload_and_capture_source(self, content, name):
+        sources = []
+
+        def capture(source, *args, **kwargs):
+            sources.append((type(source), source.closed))
+            return extract_cached(source, *args, **kwargs)
+
+        with mock.patch("matcher.analysis.extract_cached", side_effect=capture):
+            self.assertEqual(self.upload(content, name).status_code, 200)
+        return sources
+
+    def test_small_upload_is_parsed_from_memory(self):
+        content = make_docx(RESUME_TEXT.splitlines())
+
+        self.assertEqual(self.upload_and_capture_source(content, "resume.docx"), [(InMemoryUploadedFile, False)])
+
+        resume = Resume.objects.get()
+        self.assertEqual(resume.analysis_status, "completed")
+        with resume.file.open("rb") as stored:
+            self.assertEqual(stored.read(), content)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_upload_is_parsed_from_its_temporary_file(self):
+        content = make_pdf([RESUME_TEXT] * 3)
+
+        with self.assertNoLogs("matcher.extraction", "WARNING"):
+            sources = self.upload_and_capture_source(content, "resume.pdf")
+
+        self.assertEqual(sources, [(TemporaryUploadedFile, False)])
+
+        resume = Resume.objects.get()
+        self.assertEqual(resume.file_sha256, file_sha256(content))
+        self.assertIn("kubernetes", resume.detected_skills)
+
+
+class ExtractionPoolTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = ExtractionPool(size=2, timeout=30, pages_per_task=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        super().tearDownClass()
+
+    def pages(self, count):
+        return [f"Page {number} of the resume\n" + "Python Django Kubernetes " * 12 for number in range(1, count + 1)]
+
+    def test_page_ranges_match_in_process_extraction(self):
+        content = make_pdf(self.pages(3))
+
+        pooled = self.pool.extract(content, ".pdf")
+        local = extract_document(content, ext=".pdf")
+
+        self.assertEqual(pooled.error, "")
+        self.assertEqual(pooled.page_count, 3)
+        self.assertEqual(pooled.text, local.text)
+        self.assertLess(pooled.text.index("Page 1"), pooled.text.index("Page 3"))
+
+    def test_dead_worker_is_replaced(self):
+        victim = self.pool._workers[0]
+        victim.process.kill()
+        victim.process.join()
+
+        with self.assertLogs("matcher.extraction_pool", "WARNING"):
+            for _ in range(3):
+                result = self.pool.extract(make_docx(["Python developer"]), ".docx")
+                self.assertIn("Python developer", result.text)
+        self.assertEqual(len(self.pool._workers), 2)
+        self.assertNotIn(victim, self.pool._workers)
+
+    def test_timed_out_worker_is_killed_and_reported(self):
+        workers = list(self.pool._workers)
+        # With no time left the deadline expires before the worker can answer.
+        self.pool.timeout = 0
+        try:
+            with self.assertLogs("matcher.extraction_pool", "WARNING"):
+                result = self.pool.extract(make_docx(["Python developer"]), ".docx")
+        finally:
+            self.pool.timeout = 30
+
+        self.assertEqual(result.text, "")
+        self.assertIn("timed out", result.error)
+        self.assertEqual(len(self.pool._workers), 2)
+        self.assertNotEqual(self.pool._workers, workers)
+        self.assertIn("Python developer", self.pool.extract(make_docx(["Python developer"]), ".docx").text)
+
+
+class DocxExtractionTests(TestCase):
+    def test_streaming_backend_reads_tables_in_document_order(self):
+        content = make_docx(
+            ["Jane Doe", "Experience"],
+            table_rows=[["Acme Corp", "Backend Engineer"], ["Globex", "Data Engineer"]],
+        )
+
+        result = extract_document(content, ext=".docx")
+
+        self.assertEqual(result.extractor, "docx-stream")
+        for text in ("Jane Doe", "Acme Corp", "Backend Engineer", "Globex", "Data Engineer"):
+            self.assertIn(text, result.text)
+        self.assertLess(result.text.index("Experience"), result.text.index("Acme Corp"))
+        self.assertLess(result.text.index("Acme Corp"), result.text.index("Globex"))
+
+    def test_text_box_is_read_once_not_again_from_its_fallback(self):
+        document = docx.Document()
+        paragraph = document.add_paragraph("Jane Doe")
+        box = "<w:txbxContent><w:p><w:r><w:t>Kubernetes certified</w:t></w:r></w:p></w:txbxContent>"
+        paragraph._p.append(docx.oxml.parse_xml(
+            '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+            ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+            ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+            ' xmlns:v="urn:schemas-microsoft-com:vml">'
+            '<mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><w:drawing><wps:txbx>{box}</wps:txbx></w:drawing></mc:Choice>'
+            f'<mc:Fallback><w:pict><v:shape><v:textbox>{box}</v:textbox></v:shape></w:pict></mc:Fallback>'
+            '</mc:AlternateContent></w:r>'
+        ))
+        document.add_paragraph("Experience")
+        buffer = io.BytesIO()
+        document.save(buffer)
+
+        result = extract_document(buffer.getvalue(), ext=".docx")
+
+        self.assertEqual(result.extractor, "docx-stream")
+        self.assertEqual(result.text.split("\n"), ["Kubernetes certified", "Jane Doe", "Experience"])
+
+    def test_falls_back_to_python_docx_without_document_xml(self):
+        with self.assertLogs("matcher.extraction", "WARNING"):
+            result = extract_document(b"not a document", ext=".docx")
+
+        self.assertEqual(result.text, "")
+        self.assertEqual(result.attempts, ["docx-stream", "python-docx"])
+
+
+# =========================================
+# JOB DESCRIPTIONS
+# =========================================
+
+class JobDescriptionRegistryTests(TestCase):
+    def test_equivalent_postings_share_one_profiled_row(self):
+        first = register_job_description(JD_TEXT)
+        again = register_job_description("\n\n" + JD_TEXT.replace(" ", "   ").replace("\n", "\r\n  \n") + "\n")
+
+        self.assertEqual(first.pk, again.pk)
+        self.assertEqual(JobDescription.objects.count(), 1)
+        self.assertIn("kubernetes", first.tech_skills)
+        self.assertIsNone(register_job_description("  \n "))
+        self.assertEqual(CorpusDocument.objects.filter(kind=CorpusDocument.KIND_JOB).count(), 1)
+
+    def test_stale_profile_is_rebuilt_and_job_document_uses_it(self):
+        posting = register_job_description(JD_TEXT)
+        JobDescription.objects.filter(pk=posting.pk).update(
+            profile_version="old", term_vector={"stale": 1.0}, tech_skills=["cobol"],
+        )
+        posting.refresh_from_db()
+
+        job = get_job_document(posting)
+
+        self.assertEqual(posting.profile_version, current_analysis_version())
+        self.assertEqual(job.term_vector, JobDocument(posting.text).term_vector)
+        self.assertEqual(job.tech_skills, JobDocument(posting.text).tech_skills)
+
+    def test_bulk_import_counts_new_duplicate_and_blank_records(self):
+        register_job_description(JD_TEXT)
+        records = [
+            {"title": "Existing", "text": JD_TEXT},
+            {"title": "Data", "description": "Data engineer with Spark and Airflow"},
+            {"title": "Data again", "text": "Data  engineer with Spark and Airflow"},
+            {"title": "Blank", "text": ""},
+        ]
+
+        counts = import_job_descriptions(records, source="feed", chunk_size=2)
+
+        self.assertEqual(counts, {"created": 1, "existing": 2, "skipped": 1})
+        imported = JobDescription.objects.get(title="Data")
+        self.assertEqual(imported.source, "feed")
+        self.assertEqual(imported.profile_version, current_analysis_version())
+
+
+# =========================================
+# SKILL TABLES
+# =========================================
+
+class SkillTableTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("skills")
+        self.resumes = [Resume.objects.create(user=self.user, file=f"resumes/{i}.pdf") for i in range(3)]
+
+    def store(self, resume, detected, missing=()):
+        return store_resume_skills(resume, {"detected_skills": detected, "jd_matched": [], "missing": list(missing)})
+
+    def test_rows_are_deduplicated_ordered_and_replaced(self):
+        self.assertEqual(self.store(self.resumes[0], ["Docker", "docker ", "Python"], ["AWS"]), 3)
+
+        detected = ResumeSkill.objects.filter(resume=self.resumes[0], kind=ResumeSkill.KIND_DETECTED)
+        self.assertEqual(
+            list(detected.order_by("position").values_list("skill__key", "source")),
+            [("docker", "extract_technical_skills"), ("python", "extract_technical_skills")],
+        )
+
+        self.store(self.resumes[0], ["Go"])
+
+        self.assertEqual(
+            list(ResumeSkill.objects.filter(resume=self.resumes[0]).values_list("skill__key", flat=True)), ["go"],
+        )
+        self.assertEqual(Skill.objects.filter(key="docker").count(), 1)
+
+    def test_counts_and_lookups_resolve_aliases(self):
+        self.store(self.resumes[0], ["kubernetes", "python"])
+        self.store(self.resumes[1], ["kubernetes"], ["python"])
+        self.store(self.resumes[2], ["python"])
+
+        self.assertEqual(count_resumes_with_skill("K8s"), 2)
+        self.assertEqual(count_resumes_with_skill("python", ResumeSkill.KIND_MISSING), 1)
+        self.assertEqual(set(resumes_with_skill("kubernetes", user=self.user)), set(self.resumes[:2]))
+        self.assertEqual(skill_counts(limit=None), [("kubernetes", 2), ("python", 2)])
+
+    def test_skills_api_counts_and_validates_kind(self):
+        self.store(self.resumes[0], ["python"])
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.get("/api/skills/", {"kind": "bogus"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/skills/", {"skill": "Python"}).json()["resumes"], 1)
+        self.assertEqual(
+            self.client.get("/api/skills/").json()["skills"], [{"name": "python", "resumes": 1}],
+        )
+
+
+# =========================================
+# HISTORY
+# =========================================
+
+class HistoryPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("history")
+        Resume.objects.create(user=User.objects.create_user("someone-else"), file="resumes/other.pdf")
+        start = timezone.now() - timedelta(days=1)
+        # Pairs of uploads share a timestamp, so the id tie-break is exercised.
+        for i in range(7):
+            resume = Resume.objects.create(user=self.user, file=f"resumes/{i}.pdf")
+            Resume.objects.filter(pk=resume.pk).update(uploaded_at=start + timedelta(minutes=i // 2))
+        self.expected = list(
+            Resume.objects.filter(user=self.user).order_by("-uploaded_at", "-id").values_list("id", flat=True)
+        )
+
+    def walk(self, page_size):
+        seen, cursor = [], None
+        while True:
+            page = get_history_page(self.user, cursor, page_size=page_size)
+            seen.extend(resume.id for resume in page.items)
+            if not page.has_more:
+                return seen
+            cursor = page.next_cursor
+
+    def test_cursor_walk_visits_every_resume_once_in_order(self):
+        for page_size in (1, 2, 3, 7, 20):
+            self.assertEqual(self.walk(page_size), self.expected, page_size)
+
+    def test_cursor_round_trips_and_stays_put_when_newer_uploads_arrive(self):
+        first = get_history_page(self.user, page_size=3)
+        anchor = first.items[-1]
+        self.assertEqual(decode_cursor(first.next_cursor), (anchor.uploaded_at, anchor.id))
+        self.assertEqual(encode_cursor(anchor), first.next_cursor)
+
+        Resume.objects.create(user=self.user, file="resumes/new.pdf")
+        second = get_history_page(self.user, first.next_cursor, page_size=3)
+
+        self.assertEqual([resume.id for resume in second.items], self.expected[3:6])
+
+    def test_api_rejects_forged_cursors(self):
+        self.client.force_login(self.user)
+
+        for cursor in ("not-a-cursor", encode_cursor(Resume(id=1, uploaded_at=timezone.now()))[:-4], "W10"):
+            self.assertEqual(self.client.get("/api/history/", {"cursor": cursor}).status_code, 400, cursor)
+
+        response = self.client.get("/api/history/").json()
+        self.assertEqual([row["id"] for row in response["results"]], self.expected)
+        self.assertIsNone(response["next_cursor"])
+
+
+class HistoryExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("exporter", is_staff=True)
+        self.client.force_login(self.user)
+        self.done = Resume.objects.create(
+            user=self.user, file="resumes/done.pdf", analysis_status="completed", ats_score=81,
+            detected_skills="python, docker,", strengths_summary='Led "Apollo", shipped|Mentored',
+            job_posting=register_job_description(JD_TEXT, title="Platform Engineer"),
+        )
+        Resume.objects.create(user=self.user, file="resumes/pending.pdf")
+        self.other = Resume.objects.create(user=User.objects.create_user("other"), file="resumes/other.pdf")
+
+    def download(self, **params):
+        response = self.client.get("/history/export/", params)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_jsonl_keeps_lists_as_arrays(self):
+        lines = list(iter_export_lines(export_queryset(self.user, "completed"), "jsonl", chunk_size=1))
+
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(list(row), EXPORT_FIELDS)
+        self.assertEqual(row["username"], "exporter")
+        self.assertEqual(row["job_title"], "Platform Engineer")
+        self.assertEqual(row["detected_skills"], ["python", "docker"])
+        self.assertEqual(row["strengths"], ['Led "Apollo", shipped', "Mentored"])
+        self.assertEqual(row["uploaded_at"], self.done.uploaded_at.isoformat())
+
+    def test_csv_download_quotes_fields_and_respects_scope(self):
+        response, body = self.download(format="csv")
+        rows = list(csv.DictReader(io.StringIO(body)))
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual([row["username"] for row in rows], ["exporter", "exporter"])
+        self.assertEqual(rows[0]["strengths"], 'Led "Apollo", shipped; Mentored')
+
+        _, body = self.download(format="jsonl", scope="all", status="pending")
+        self.assertEqual(
+            [json.loads(line)["id"] for line in body.splitlines()],
+            [Resume.objects.get(file="resumes/pending.pdf").pk, self.other.pk],
+        )
+        self.assertEqual(self.client.get("/history/export/", {"format": "xml"}).status_code, 400)
+
+
+# =========================================
+# SEARCH
+# =========================================
+
+class ResumeSearchTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner")
+        self.resume = Resume.objects.create(
+            user=self.owner, file="resumes/search.pdf", extracted_text="Senior Django developer with Kubernetes",
+        )
+
+    def found(self, query, user=None):
+        return [hit.resume.pk for hit in search_resumes(query, user=user).hits]
+
+    def test_index_follows_update_and_delete(self):
+        self.assertEqual(self.found("kubernetes"), [self.resume.pk])
+
+        Resume.objects.filter(pk=self.resume.pk).update(extracted_text="Rust systems programmer")
+
+        self.assertEqual(self.found("kubernetes"), [])
+        self.assertEqual(self.found("rust"), [self.resume.pk])
+
+        self.resume.delete()
+
+        self.assertEqual(self.found("rust"), [])
+
+    def test_phrases_prefixes_and_owner_scope(self):
+        other = User.objects.create_user("other")
+
+        self.assertEqual(self.found('"django developer"'), [self.resume.pk])
+        self.assertEqual(self.found('"developer django"'), [])
+        self.assertEqual(self.found("kuber*"), [self.resume.pk])
+        self.assertEqual(self.found("kubernetes", user=other), [])
+        self.assertEqual(self.found("kubernetes", user=self.owner), [self.resume.pk])
+
+    def test_operators_in_user_input_are_inert(self):
+        self.assertEqual(parse_query('django OR "NEAR(" -x*'), parse_query('django or near x*'))
+        self.assertEqual(self.found("django NOT"), [])
+
+    def test_snippet_highlights_match_and_escapes_text(self):
+        Resume.objects.filter(pk=self.resume.pk).update(extracted_text="<b>Kubernetes</b> operator")
+
+        hit = search_resumes("kubernetes").hits[0]
+
+        self.assertIn("&lt;b&gt;<mark>Kubernetes</mark>&lt;/b&gt;", hit.snippet)
+
+
+# =========================================
+# MEMOIZATION
+# =========================================
+
+@override_settings(ANALYSIS_MEMOIZE=True)
+class MemoizedAnalysisTests(TestCase):
+    def setUp(self):
+        caches[MEMO_CACHE_ALIAS].clear()
+
+    def memo_lookups(self, result):
+        return metrics.MEMO_CACHE.values.get(json.dumps(["run_analysis", result]), 0)
+
+    def test_reanalyzing_the_same_pair_hits_the_cache(self):
+        resume = Resume.objects.create(
+            file="resumes/memo.pdf", extracted_text=RESUME_TEXT, job_posting=register_job_description(JD_TEXT),
+        )
+        analyze_and_store(resume)
+        totals = CorpusStatistics.objects.values_list("doc_count", "total_length").get()
+        hits = self.memo_lookups("hit")
+
+        analyze_and_store(Resume.objects.get(pk=resume.pk))
+
+        self.assertEqual(self.memo_lookups("hit"), hits + 1)
+        self.assertEqual(CorpusStatistics.objects.values_list("doc_count", "total_length").get(), totals)
+
+    def test_cached_analysis_matches_fresh_analysis_after_corpus_grows(self):
+        run_analysis(ResumeDocument(RESUME_TEXT), JobDocument(JD_TEXT))
+        for key in range(20):
+            index_document("resume", key, {"python": 1, "django": 1, "backend": 1})
+
+        cached = run_analysis(ResumeDocument(RESUME_TEXT), JobDocument(JD_TEXT))
+        fresh = run_analysis.uncached(ResumeDocument(RESUME_TEXT), JobDocument(JD_TEXT))
+
+        self.assertEqual(cached, fresh)
+
+
+# =========================================
+# BATCH RANKING
+# =========================================
+
+@override_settings(EXTRACTION_POOL_SIZE=0)
+class BatchRankingTests(TestCase):
+    def sources(self):
+        strong = make_docx(RESUME_TEXT.splitlines() + ["Terraform and AWS certified"])
+        weak = make_docx(["Jane Roe", "Skills", "Excel, PowerPoint"])
+        return [
+            ("strong.docx", strong, ".docx"),
+            ("weak.docx", weak, ".docx"),
+            ("broken.docx", b"not a document", ".docx"),
+        ]
+
+    def test_rows_rank_best_match_first_and_report_failures(self):
+        with self.assertLogs("matcher.extraction", "WARNING"):
+            rows = rank_results(iter_batch_results(self.sources(), JD_TEXT, workers=2))
+
+        self.assertEqual([row["file"] for row in rows], ["strong.docx", "weak.docx", "broken.docx"])
+        self.assertGreater(rows[0]["jd_match_score"], rows[1]["jd_match_score"])
+        self.assertIn("kubernetes", rows[0]["detected_skills"])
+        self.assertEqual(rows[0]["extractor"], "docx-stream")
+        self.assertTrue(rows[2]["error"])
+
+    def test_zip_sources_skip_unsupported_and_hidden_members(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("batch/a.docx", b"a")
+            archive.writestr("batch/notes.txt", b"b")
+            archive.writestr("batch/.hidden.pdf", b"c")
+            archive.writestr("batch/B.PDF", b"d")
+
+        sources = list(iter_zip_sources(buffer))
+
+        self.assertEqual(sources, [("batch/a.docx", b"a", ".docx"), ("batch/B.PDF", b"d", ".pdf")])
+
+    def test_web_batch_is_staff_only_and_streams_csv(self):
+        user = User.objects.create_user("recruiter")
+        self.client.force_login(user)
+        files = [SimpleUploadedFile(name, content) for name, content, _ in self.sources()[:2]]
+        form = {"job_description": JD_TEXT, "format": "csv", "resumes": files}
+
+        self.assertEqual(self.client.post("/batch/", form).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        for upload in files:
+            upload.seek(0)
+        response = self.client.post("/batch/", form)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lines[0].split(",")[:3], ["file", "ats_score", "jd_match_score"])
+        self.assertEqual(len(lines), 3)
+
+
+# =========================================
+# CORPUS RANKING
+# =========================================
+
+class StoredRankingTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice")
+        self.bob = User.objects.create_user("bob")
+        vectors = {
+            ("alice", "kubernetes.pdf"): {"kubernetes": 3, "terraform": 2, "python": 1},
+            ("alice", "frontend.pdf"): {"react": 3, "css": 2, "python": 1},
+            ("bob", "devops.pdf"): {"kubernetes": 1, "python": 1, "experience": 4},
+        }
+        self.resumes = {}
+        for (username, name), vector in vectors.items():
+            resume = Resume.objects.create(user=User.objects.get(username=username), file=f"resumes/{name}")
+            index_document(CorpusDocument.KIND_RESUME, resume.pk, vector)
+            self.resumes[name] = resume
+
+    def test_rare_matching_terms_rank_first(self):
+        ranked = rank_stored_resumes({"kubernetes", "terraform"})
+
+        self.assertEqual(
+            [resume_id for resume_id, _ in ranked],
+            [self.resumes["kubernetes.pdf"].pk, self.resumes["devops.pdf"].pk],
+        )
+
+    def test_rank_stored_limits_to_one_user(self):
+        rows = rank_stored("Kubernetes, Terraform and Python engineer", user=self.alice)
+
+        self.assertEqual([row["file"] for row in rows], ["resumes/kubernetes.pdf", "resumes/frontend.pdf"])
+        self.assertTrue(all(row["user"] == "alice" for row in rows))
+
+    def test_command_ranks_stored_resumes(self):
+        output = io.StringIO()
+        call_command("rank_resumes", "--stored", "--jd-text", "Kubernetes and Terraform",
+                     stdout=output, stderr=io.StringIO())
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(rows[0]["resume_id"], self.resumes["kubernetes.pdf"].pk)
+
+
+# =========================================
+# JOB QUEUE
+# =========================================
+
+@override_settings(ANALYSIS_JOB_MAX_ATTEMPTS=2)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.resume = Resume.objects.create(file="resumes/queued.pdf")
+        self.job = enqueue_analysis(self.resume)
+
+    def expire_lock(self, job):
+        AnalysisJob.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(seconds=600))
+
+    def test_a_job_is_claimed_once(self):
+        first = claim_next_job("worker-a")
+        second = claim_next_job("worker-b")
+
+        self.assertEqual(first.id, self.job.id)
+        self.assertEqual(first.status, AnalysisJob.STATUS_RUNNING)
+        self.assertEqual(first.attempts, 1)
+        self.assertIsNone(second)
+
+    def test_job_past_visibility_timeout_is_reclaimed(self):
+        claim_next_job("worker-a")
+        self.assertIsNone(claim_next_job("worker-b", visibility_timeout=300))
+
+        self.expire_lock(self.job)
+        reclaimed = claim_next_job("worker-b", visibility_timeout=300)
+
+        self.assertEqual(reclaimed.locked_by, "worker-b")
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_job_whose_worker_died_on_the_last_attempt_is_failed_not_reclaimed(self):
+        claim_next_job("worker-a")
+        AnalysisJob.objects.filter(id=self.job.id).update(attempts=self.job.max_attempts)
+        self.expire_lock(self.job)
+        second = enqueue_analysis(Resume.objects.create(file="resumes/next.pdf"))
+
+        with self.assertLogs("matcher.jobs", "WARNING"):
+            claimed = claim_next_job("worker-b", visibility_timeout=300)
+
+        self.assertEqual(claimed.id, second.id)
+        job = AnalysisJob.objects.get(id=self.job.id)
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, job.max_attempts)
+        self.assertIn("Worker lost", job.last_error)
+        self.assertEqual(Resume.objects.get(id=self.resume.id).analysis_status, "failed")
+        self.assertIsNone(claim_next_job("worker-c", visibility_timeout=300))
+
+    def test_previous_owner_cannot_finish_a_reclaimed_job(self):
+        stale = claim_next_job("worker-a")
+        self.expire_lock(self.job)
+        claim_next_job("worker-b", visibility_timeout=300)
+
+        fail_job(stale, "timed out")
+        complete_job(stale)
+
+        job = AnalysisJob.objects.get(id=self.job.id)
+        self.assertEqual(job.status, AnalysisJob.STATUS_RUNNING)
+        self.assertEqual(job.locked_by, "worker-b")
+        self.assertEqual(job.last_error, "")
+
+    def test_failures_retry_with_backoff_until_max_attempts(self):
+        with mock.patch("matcher.jobs.process_resume", side_effect=ValueError("bad pdf")), \
+                self.assertLogs("matcher.jobs", "ERROR"):
+            run_job(claim_next_job("worker-a"))
+
+            job = AnalysisJob.objects.get(id=self.job.id)
+            self.assertEqual(job.status, AnalysisJob.STATUS_QUEUED)
+            self.assertGreater(job.run_after, timezone.now())
+            self.assertEqual(job.last_error, "ValueError: bad pdf")
+            self.assertIsNone(claim_next_job("worker-a"))
+
+            AnalysisJob.objects.filter(id=job.id).update(run_after=timezone.now())
+            run_job(claim_next_job("worker-a"))
+
+        job = AnalysisJob.objects.get(id=self.job.id)
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertEqual(Resume.objects.get(id=self.resume.id).analysis_status, "failed")
+
+    def test_queue_stats_count_active_jobs_in_one_query(self):
+        enqueue_analysis(Resume.objects.create(file="resumes/second.pdf"))
+        done = enqueue_analysis(Resume.objects.create(file="resumes/done.pdf"))
+        AnalysisJob.objects.filter(id=done.id).update(status=AnalysisJob.STATUS_DONE)
+        claim_next_job("worker-a")
+
+        with self.assertNumQueries(1):
+            stats = queue_stats()
+
+        self.assertEqual((stats["queued"], stats["running"], stats["ready"]), (1, 1, 1))
+        self.assertNotIn("done", stats)
+        self.assertEqual(queue_stats(include_finished=True)["done"], 1)
+
+    def test_successful_job_is_completed(self):
+        with mock.patch("matcher.jobs.process_resume") as process:
+            run_job(claim_next_job("worker-a"))
+
+        process.assert_called_once()
+        self.assertEqual(AnalysisJob.objects.get(id=self.job.id).status, AnalysisJob.STATUS_DONE)
+
+
+# =========================================
+# RE-MATCHING
+# =========================================
+
+class JobMatchTests(TestCase):
+    def setUp(self):
+        self.resume = Resume.objects.create(file="resumes/rematch.pdf", extracted_text=RESUME_TEXT + "Kube operators\n")
+        self.posting = register_job_description(JD_TEXT)
+
+    def test_current_match_is_reused(self):
+        analyze_and_store(self.resume)
+        match = rematch_resume(self.resume, self.posting)
+
+        with mock.patch("matcher.analysis.run_jd_analysis") as run_jd_analysis:
+            again = rematch_resume(self.resume, self.posting)
+
+        run_jd_analysis.assert_not_called()
+        self.assertEqual(again.pk, match.pk)
+        self.assertEqual(again.engine_version, current_analysis_version())
+
+    def test_stored_term_vector_is_reused_only_for_the_current_version(self):
+        analyze_and_store(self.resume)
+        CorpusDocument.objects.filter(key=str(self.resume.pk)).update(term_vector={"stored": 1})
+        self.assertEqual(get_resume_document(self.resume).term_vector, {"stored": 1})
+
+        with skill_taxonomy_file("test-2", {"kubernetes": ["kube"]}):
+            vector = get_resume_document(self.resume).term_vector
+
+        self.assertNotIn("stored", vector)
+        self.assertIn("kubernetes", vector)
+        self.assertNotIn("kube", vector)
+
+    def test_taxonomy_reload_makes_the_match_stale(self):
+        with skill_taxonomy_file("test-1"):
+            analyze_and_store(self.resume)
+            match = rematch_resume(self.resume, self.posting)
+
+        with skill_taxonomy_file("test-2", {"kubernetes": ["kube"]}):
+            version = current_analysis_version()
+            rematched = rematch_resume(self.resume, self.posting)
+            vector = CorpusDocument.objects.get(key=str(self.resume.pk)).term_vector
+
+        self.assertNotEqual(match.engine_version, version)
+        self.assertEqual(rematched.pk, match.pk)
+        self.assertEqual(rematched.engine_version, version)
+        self.assertEqual(JobMatch.objects.count(), 1)
+        self.assertNotIn("kube", vector)
+        self.assertIn("kubernetes", rematched.result["jd_matched"])
+
+
+# =========================================
+# ASYNC VIEWS
+# =========================================
+
+@override_settings(ROOT_URLCONF=__name__, EXTRACTION_POOL_SIZE=0, ANALYSIS_USE_QUEUE=False)
+class AsyncViewTests(TransactionTestCase):
+    # The offload pools run ORM calls on their own threads, so the data must be committed.
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = self.settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+        self.user = User.objects.create_user("async-uploader")
+        self.client = AsyncClient()
+        self.client.force_login(self.user)
+
+    async def test_upload_is_analyzed_and_report_served(self):
+        content = make_docx(RESUME_TEXT.splitlines())
+
+        response = await self.client.post("/upload/", {
+            "resume": SimpleUploadedFile("resume.docx", content),
+            "job_description": JD_TEXT,
+        })
+
+        self.assertIs(response.resolver_match.func, async_views.upload_resume)
+        self.assertContains(response, "kubernetes")
+        resume = await Resume.objects.aget(user=self.user)
+        self.assertEqual(resume.analysis_status, "completed")
+        self.assertEqual(resume.file_sha256, file_sha256(content))
+
+        report = await self.client.get(f"/view/{resume.pk}/")
+        self.assertEqual(report.status_code, 200)
+        self.assertEqual(report.context["ats_score"], resume.ats_score)
+
+    async def test_rejects_anonymous_users_other_owners_and_bad_files(self):
+        other = await Resume.objects.acreate(
+            user=await User.objects.acreate(username="someone"), file="resumes/x.pdf",
+        )
+
+        self.assertEqual((await self.client.get(f"/view/{other.pk}/")).status_code, 404)
+
+        response = await self.client.post("/upload/", {"resume": SimpleUploadedFile("notes.txt", b"hello")})
+        self.assertRedirects(response, "/upload/", fetch_redirect_response=False)
+        self.assertFalse(await Resume.objects.filter(user=self.user).aexists())
+
+        anonymous = await AsyncClient().get("/upload/")
+        self.assertEqual(anonymous.status_code, 302)
+        self.assertTrue(anonymous["Location"].startswith("/login/"))
+
+
+# =========================================
+# METRICS
+# =========================================
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = self.settings(METRICS_DIR=self.directory, METRICS_TOKEN="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # The per-process file name is derived from METRICS_DIR on first use.
+        self.addCleanup(setattr, metrics, "_process_pid", None)
+        metrics._process_pid = None
+
+    def exited_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        return process.pid
+
+    def test_collect_keeps_counts_of_exited_processes(self):
+        key = json.dumps(["archived"])
+        path = os.path.join(self.directory, f"metrics_{self.exited_pid()}_0000abcd.json")
+        with open(path, "w") as f:
+            json.dump({metrics.ANALYSES.name: {key: 5}}, f)
+
+        self.assertEqual(metrics.collect()[metrics.ANALYSES.name][key], 5)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(metrics.collect()[metrics.ANALYSES.name][key], 5)
+
+    def test_render_emits_cumulative_buckets_and_escaped_labels(self):
+        key = json.dumps(['say "hi"'])
+        data = {
+            metrics.STAGE_SECONDS.name: {key: {"buckets": [1, 2] + [0] * 10 + [1], "sum": 31.0, "count": 4}},
+        }
+
+        lines = metrics.render_prometheus(data).splitlines()
+
+        name = metrics.STAGE_SECONDS.name
+        self.assertIn(f'{name}_bucket{{stage="say \\"hi\\"",le="0.005"}} 1', lines)
+        self.assertIn(f'{name}_bucket{{stage="say \\"hi\\"",le="0.01"}} 3', lines)
+        self.assertIn(f'{name}_bucket{{stage="say \\"hi\\"",le="+Inf"}} 4', lines)
+        self.assertIn(f'{name}_count{{stage="say \\"hi\\""}} 4', lines)
+        self.assertIn(f"# TYPE {metrics.ANALYSES.name} counter", lines)
+
+    def test_without_fcntl_only_this_process_is_reported(self):
+        metrics.ANALYSES.inc(status="single-process")
+
+        with mock.patch.object(metrics, "fcntl", None):
+            data = metrics.collect()
+
+        self.assertIn(json.dumps(["single-process"]), data[metrics.ANALYSES.name])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_endpoint_requires_token_when_configured(self):
+        with self.settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 401)
+            response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"# TYPE {metrics.REQUEST_SECONDS.name} histogram", response.content.decode())
+
+
+# =========================================
+# REPORTS
+# =========================================
+
+class ReportCacheTests(UploadTestCase):
+    def setUp(self):
+        super().setUp()
+        self.upload(make_docx(RESUME_TEXT.splitlines()))
+        self.resume = Resume.objects.get()
+        self.url = f"/view/{self.resume.pk}/report.pdf"
+
+    def cached_files(self):
+        return sorted(os.listdir(report_cache_dir()))
+
+    def test_report_is_rendered_once_and_revalidated_by_etag(self):
+        with mock.patch("matcher.reports.write_resume_report", wraps=reports.write_resume_report) as render:
+            first = self.client.get(self.url)
+            body = b"".join(first.streaming_content)
+            again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(body.startswith(b"%PDF"))
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(len(self.cached_files()), 1)
+
+    def test_changed_analysis_replaces_the_cached_file(self):
+        etag = self.client.get(self.url)["ETag"]
+        old_files = self.cached_files()
+
+        Resume.objects.filter(pk=self.resume.pk).update(extracted_text=RESUME_TEXT + "\nGraphQL")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(self.cached_files()), 1)
+        self.assertNotEqual(self.cached_files(), old_files)
+
+        self.resume.delete()
+        self.assertEqual(self.cached_files(), [])
+
+    def test_zip_export_streams_reports_and_skips_failures(self):
+        self.upload(make_docx(["John Roe", "Skills", "Python, SQL"]))
+        second = Resume.objects.latest("id")
+
+        get_report = reports.get_report
+
+        def fail_for_second(resume):
+            if resume.pk == second.pk:
+                raise RuntimeError("render failed")
+            return get_report(resume)
+
+        with mock.patch("matcher.reports.get_report", side_effect=fail_for_second), \
+                self.assertLogs("matcher.reports", "ERROR"):
+            response = self.client.get("/reports/export.zip")
+            archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+        self.assertEqual(archive.namelist(), [f"uploader/resume-{self.resume.pk}-report.pdf"])
+        self.assertTrue(archive.read(archive.namelist()[0]).startswith(b"%PDF"))
+
+        response = self.client.get("/reports/export.zip", {"ids": str(second.pk)})
+        self.assertEqual(
+            zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))).namelist(),
+            [f"uploader/resume-{second.pk}-report.pdf"],
+        )
+        self.assertEqual(self.client.get("/reports/export.zip", {"ids": "1,x"}).status_code, 400)
+
+
+# =========================================
+# BENCHMARKS
+# =========================================
+
+class BenchmarkTests(SimpleTestCase):
+    def test_compare_flags_only_slowdowns_beyond_threshold_and_noise_floor(self):
+        def run(**medians):
+            return {"results": {"small": {name: {"median_ms": ms} for name, ms in medians.items()}}}
+
+        baseline = run(extract=100.0, clean=1.0, score=50.0, removed=5.0)
+        current = run(extract=130.0, clean=2.5, score=60.0, added=9.0)
+
+        rows = {row["stage"]: row for row in compare(current, baseline, threshold=0.25, noise_floor_ms=2.0)}
+
+        self.assertEqual(set(rows), {"extract", "clean", "score"})
+        self.assertTrue(rows["extract"]["regression"])
+        self.assertFalse(rows["clean"]["regression"])
+        self.assertFalse(rows["score"]["regression"])
+        self.assertEqual(rows["extract"]["ratio"], 1.3)
+
+    def test_corpus_is_deterministic(self):
+        self.assertEqual(benchmark_corpus.resume_text("small", seed=3), benchmark_corpus.resume_text("small", seed=3))
+        self.assertNotEqual(benchmark_corpus.resume_text("small", seed=3), benchmark_corpus.resume_text("small", seed=4))
+
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            a = benchmark_corpus.build_corpus(first, ["small"])["small"]
+            b = benchmark_corpus.build_corpus(second, ["small"])["small"]
+            for kind in ("pdf", "docx"):
+                with open(a[kind], "rb") as left, open(b[kind], "rb") as right:
+                    self.assertEqual(left.read(), right.read(), kind)
@@ -0,0 +1,26 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Computes the SHA-256 of every uploaded file while it streams in.
+    It passes each chunk through unchanged, so the default handlers still
+    build the UploadedFile. Digests are exposed as
+    ``request.upload_sha256[field_name]``.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self._digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, "upload_sha256"):
+            self.request.upload_sha256 = {}
+        self.request.upload_sha256[self.field_name] = self._digest.hexdigest()
+        return None
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+from . import async_views, views
+
+# Under ASGI the upload and report pages are coroutine views.
+analysis_views = async_views if settings.ASYNC_VIEWS else views
 
 app_name = "matcher"
 
@@ -9,13 +13,33 @@ urlpatterns = [
     path('', views.index, name='index'),
 
     # Upload page
-    path('upload/', views.upload_resume, name='upload_resume'),
+    path('upload/', analysis_views.upload_resume, name='upload_resume'),
+
+    # Recruiter batch ranking
+    path('batch/', views.batch_rank, name='batch_rank'),
 
     # Other pages
     path("history/", views.history, name="history"),
-    path("view/<int:resume_id>/", views.view_resume_report, name="resume_view"),
+    path("api/history/", views.history_api, name="history_api"),
+    path("history/export/", views.export_history, name="export_history"),
+    path("view/<int:resume_id>/", analysis_views.view_resume_report, name="resume_view"),
+    path("view/<int:resume_id>/status/", views.resume_status, name="resume_status"),
+    path("view/<int:resume_id>/rematch/", views.rematch, name="rematch"),
+    path("view/<int:resume_id>/match/<int:match_id>/", views.view_match, name="match_view"),
+    path("view/<int:resume_id>/report.pdf", views.download_report, name="download_report"),
+    path("reports/export.zip", views.export_reports, name="export_reports"),
     path("delete/<int:resume_id>/", views.delete_resume, name="delete_resume"),
 
+    # Full-text search
+    path("search/", views.search, name="search"),
+    path("api/search/", views.search_api, name="search_api"),
+
+    # Skill statistics
+    path("api/skills/", views.skills_api, name="skills_api"),
+
+    # Prometheus scrape endpoint
+    path("metrics", views.metrics, name="metrics"),
+
     # Auth
     path("login/", views.user_login, name="login"),
     path("signup/", views.signup_view, name="signup"),
@@ -1,29 +1,30 @@
+import logging
 from io import BytesIO
-from typing import List, Tuple, Any # PRO TOPIC: Type Hinting
+from typing import Any, BinaryIO, Dict, List # PRO TOPIC: Type Hinting
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 
-# Import your existing logic
-from resume_diagnostics_engine.skill_extractor import extract_explicit_skills
-from resume_diagnostics_engine.role_recommender import suggest_roles
-from resume_diagnostics_engine.jd_matcher import calculate_jd_match
+logger = logging.getLogger(__name__)
 
-def generate_resume_report(resume: Any) -> BytesIO: # LOGIC: Define Return Type
+# Bump whenever the report layout changes; cached PDFs are keyed by it.
+REPORT_TEMPLATE_VERSION = "1"
+
+
+def write_resume_report(resume: Any, analysis: Dict[str, Any], output: BinaryIO) -> None:
     """
-    Generates a PDF analysis report. 
-    Logic: Uses a 'Story' buffer to build the document step-by-step.
+    Renders the PDF analysis report into ``output``.
+    Logic: Uses a 'Story' buffer to build the document step-by-step. Skills
+    and scores come from the stored analysis instead of being recomputed.
     """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = SimpleDocTemplate(output, pagesize=A4)
     styles = getSampleStyleSheet()
     story = []
 
     # 1. LOGIC: NULL-SAFETY (Defensive Programming)
-    # Never assume resume.user or resume.extracted_text exists!
+    # Never assume resume.user or the analysis fields exist!
     username = getattr(resume.user, 'username', 'Unknown User')
     upload_date = resume.uploaded_at.strftime('%d %b %Y') if resume.uploaded_at else "N/A"
-    extracted_text = resume.extracted_text or ""
 
     # ===== HEADER SECTION =====
     story.append(Paragraph("ATS Resume Analysis Report", styles["Title"]))
@@ -33,14 +34,15 @@ def generate_resume_report(resume: Any) -> BytesIO: # LOGIC: Define Return Type
     story.append(Spacer(1, 12))
 
     # ===== SCORE LOGIC =====
-    # 2026 Recruiter Tip: Use f-strings for clean formatting
-    ats_score = resume.ats_score if resume.ats_score is not None else 0
+    ats_score = analysis.get("ats_score")
+    if ats_score is None:
+        ats_score = 0
     story.append(Paragraph(f"<b>ATS Score:</b> {ats_score}/100", styles["Heading2"]))
     story.append(Spacer(1, 10))
 
     # ===== SKILLS & JD MATCH LOGIC =====
-    skills: List[str] = extract_explicit_skills(extracted_text)
-    
+    skills: List[str] = list(analysis.get("detected_skills") or [])
+
     story.append(Paragraph("Detected Skills", styles["Heading2"]))
     skill_text = ", ".join(skills) if skills else "No skills detected"
     story.append(Paragraph(skill_text, styles["Normal"]))
@@ -48,15 +50,11 @@ def generate_resume_report(resume: Any) -> BytesIO: # LOGIC: Define Return Type
 
     # 2. LOGIC: THE CONDITIONAL OVERLAY
     if resume.job_description:
-        # Pass data to our "Set-based" matcher
-        jd_score, missing_keywords = calculate_jd_match(
-            resume_text=extracted_text,
-            jd_text=resume.job_description
-        )
+        missing_keywords: List[str] = list(analysis.get("missing") or [])
 
         story.append(Paragraph("Job Description Match", styles["Heading2"]))
-        story.append(Paragraph(f"JD Match Score: <b>{jd_score}%</b>", styles["Normal"]))
-        
+        story.append(Paragraph(f"JD Match Score: <b>{analysis.get('jd_score', 0)}%</b>", styles["Normal"]))
+
         # LOGIC: Visual Feedback
         if missing_keywords:
             story.append(Paragraph("<b>Missing Critical Skills:</b>", styles["Normal"]))
@@ -69,12 +67,22 @@ def generate_resume_report(resume: Any) -> BytesIO: # LOGIC: Define Return Type
     story.append(Spacer(1, 20))
     story.append(Paragraph("<i>Generated by SkillMatch ATS Engine (v2.0)</i>", styles["Italic"]))
 
+    doc.build(story)
+
+
+def generate_resume_report(resume: Any, analysis: Dict[str, Any]) -> BytesIO: # LOGIC: Define Return Type
+    """
+    In-memory variant of write_resume_report. Downloads are served from
+    matcher.reports, which caches the rendered file on disk.
+    """
+    buffer = BytesIO()
+
     # 3. LOGIC: BUFFER MANAGEMENT
     try:
-        doc.build(story)
+        write_resume_report(resume, analysis, buffer)
         buffer.seek(0)
         return buffer
     except Exception as e:
-        # If PDF building fails, return an empty buffer or log it
-        print(f"Report Generation Error: {e}")
+        # If PDF building fails, return an empty buffer and log it
+        logger.error("Report Generation Error: %s", e)
         return BytesIO()
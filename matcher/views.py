@@ -1,28 +1,35 @@
 import os
-import docx
-import PyPDF2
 
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.utils import timezone
+from django.core.exceptions import PermissionDenied
+from django.urls import reverse
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.decorators.http import require_POST
 
-from .models import Resume
-from .services import (
-    realistic_ats_score,
-    keyword_match_score,
-    missing_skills,
-    resume_suggestions,
-    jd_match_score,
-    skill_gap_analysis,
-    diagnose_resume,
-    ai_resume_suggestions,
-    extract_technical_skills,
-    detect_ats_template_risk,
+from .models import JobMatch, Resume, ResumeSkill
+from .analysis import get_analysis, get_match_analysis, process_resume, rematch_resume
+from .batch import (
+    SUPPORTED_EXTENSIONS,
+    iter_batch_results,
+    iter_csv_lines,
+    iter_jsonl_lines,
+    iter_zip_sources,
 )
+from .exports import EXPORT_FORMATS, export_queryset, iter_export_lines
+from .history import get_history_page
+from .job_descriptions import get_job_document, register_job_description
+from .jobs import enqueue_analysis, queue_stats
+from .metrics import render_prometheus, timed
+from .reports import get_report, iter_report_zip, report_filename
+from .search import search_resumes
+from .skills import count_resumes_with_skill, skill_counts
 
 
 # =========================================
@@ -71,40 +78,6 @@ def user_login(request):
     return render(request, "matcher/login.html", {"form": form})
 
 
-# =========================================
-# FILE TEXT EXTRACTION
-# =========================================
-
-def extract_text(file_path):
-    """
-    Extract text from PDF or DOCX file.
-    """
-    ext = os.path.splitext(file_path)[1].lower()
-
-    try:
-        if ext == ".pdf":
-            text = ""
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
-
-        elif ext == ".docx":
-            doc = docx.Document(file_path)
-            return "\n".join(
-                [para.text for para in doc.paragraphs if para.text.strip()]
-            ).strip()
-
-        return ""
-
-    except Exception as e:
-        print(f"Extraction error: {e}")
-        return ""
-
-
 # =========================================
 # SCORE CLASS HELPER
 # =========================================
@@ -117,6 +90,19 @@ def get_score_class(score):
     return "bg-danger"
 
 
+def build_report_context(resume, analysis):
+    context = dict(analysis)
+    context.update({
+        "resume": resume,
+        "ats_class": get_score_class(analysis["ats_score"]),
+        "jd_class": get_score_class(analysis["jd_score"]),
+        "resume_text": resume.extracted_text or "",
+        # Lazy: evaluated while the template renders.
+        "matches": resume.matches.select_related("job_posting"),
+    })
+    return context
+
+
 # =========================================
 # MAIN ANALYSIS
 # =========================================
@@ -140,118 +126,259 @@ def upload_resume(request):
         resume = Resume.objects.create(
             user=request.user,
             file=resume_file,
-            job_description=job_description
+            file_sha256=getattr(request, "upload_sha256", {}).get("resume", ""),
+            job_posting=register_job_description(job_description)
         )
 
-        # Extract resume text
-        resume_text = extract_text(resume.file.path)
-
-        if not resume_text.strip():
-            resume.extracted_text = ""
-            resume.analyzed_at = timezone.now()
-            resume.save()
+        # Hand extraction and scoring to the background worker
+        if settings.ANALYSIS_USE_QUEUE:
+            enqueue_analysis(resume)
+            return redirect("matcher:resume_view", resume_id=resume.id)
 
+        if not process_resume(resume, resume_file):
             messages.error(
                 request,
                 "Could not extract text from this resume. Please upload a cleaner PDF or DOCX file."
             )
             return redirect("matcher:upload_resume")
 
-        # Run analysis
-        ats_score, breakdown = realistic_ats_score(resume_text, job_description)
-        keyword_score, matched_keywords = keyword_match_score(resume_text, job_description)
-        missing = missing_skills(resume_text, job_description)
-        jd_score, jd_matched = jd_match_score(resume_text, job_description)
-        skill_gap = skill_gap_analysis(resume_text, job_description)
-        suggestions = resume_suggestions(ats_score)
-        ai_suggestions, improved_lines = ai_resume_suggestions(resume_text, job_description)
-        resume_diagnosis = diagnose_resume(resume_text)
-        detected_skills = extract_technical_skills(resume_text)
-        ats_template_risk = detect_ats_template_risk(resume_text)
-
-        # Save result summary
-        resume.extracted_text = resume_text
-        resume.ats_score = ats_score
-        resume.detected_skills = ", ".join(detected_skills)
-        resume.analyzed_at = timezone.now()
-        resume.save()
-
-        context = {
-            "resume": resume,
-            "ats_score": ats_score,
-            "ats_class": get_score_class(ats_score),
-            "breakdown": breakdown,
-            "keyword_score": keyword_score,
-            "matched_keywords": matched_keywords,
-            "missing": missing,
-            "suggestions": suggestions,
-            "jd_score": jd_score,
-            "jd_class": get_score_class(jd_score),
-            "jd_matched": jd_matched,
-            "skill_gap": skill_gap,
-            "ai_suggestions": ai_suggestions,
-            "improved_lines": improved_lines,
-            "resume_text": resume_text,
-            "resume_diagnosis": resume_diagnosis,
-            "detected_skills": detected_skills,
-            "ats_template_risk": ats_template_risk,
-        }
-
-        return render(request, "matcher/results.html", context)
+        context = build_report_context(resume, resume.snapshot.result)
+        return timed("render:results.html", render, request, "matcher/results.html", context)
 
     return render(request, "matcher/upload.html")
 
 
+# =========================================
+# RECRUITER BATCH MODE
+# =========================================
+
+@login_required(login_url="matcher:login")
+def batch_rank(request):
+    # Batches tie up the shared extraction pool; only staff may run them.
+    if not request.user.is_staff:
+        raise PermissionDenied
+
+    if request.method == "POST":
+        job_description = request.POST.get("job_description", "").strip()
+        output_format = request.POST.get("format", "jsonl")
+        archive = request.FILES.get("resumes_zip")
+        files = request.FILES.getlist("resumes")
+
+        if not job_description:
+            messages.error(request, "Please paste the job description to rank against.")
+            return redirect("matcher:batch_rank")
+
+        if archive:
+            sources = iter_zip_sources(archive)
+        elif files:
+            sources = (
+                (f.name, f.read(), os.path.splitext(f.name)[1].lower())
+                for f in files
+                if os.path.splitext(f.name)[1].lower() in SUPPORTED_EXTENSIONS
+            )
+        else:
+            messages.error(request, "Please upload a ZIP archive or a folder of resumes.")
+            return redirect("matcher:batch_rank")
+
+        posting = register_job_description(job_description, source="batch")
+        rows = iter_batch_results(sources, get_job_document(posting))
+        if output_format == "csv":
+            response = StreamingHttpResponse(iter_csv_lines(rows), content_type="text/csv")
+            response["Content-Disposition"] = 'attachment; filename="ranking.csv"'
+        else:
+            response = StreamingHttpResponse(iter_jsonl_lines(rows), content_type="application/x-ndjson")
+            response["Content-Disposition"] = 'attachment; filename="ranking.jsonl"'
+        return response
+
+    return render(request, "matcher/batch.html")
+
+
 # =========================================
 # HISTORY / REPORTS
 # =========================================
 
 @login_required(login_url="matcher:login")
 def history(request):
-    resumes = Resume.objects.filter(user=request.user).order_by("-uploaded_at")
-    return render(request, "matcher/history.html", {"resumes": resumes})
+    try:
+        page = get_history_page(request.user, request.GET.get("cursor"))
+    except ValueError:
+        return redirect("matcher:history")
+
+    return render(request, "matcher/history.html", {
+        "resumes": page.items,
+        "next_cursor": page.next_cursor,
+    })
+
+
+@login_required(login_url="matcher:login")
+def history_api(request):
+    """JSON feed of the history list for infinite scroll."""
+    try:
+        page = get_history_page(request.user, request.GET.get("cursor"))
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+    return JsonResponse({
+        "results": [
+            {
+                "id": resume.id,
+                "ats_score": resume.ats_score,
+                "suggested_role": resume.suggested_role,
+                "detected_skills": resume.detected_skills,
+                "analysis_status": resume.analysis_status,
+                "uploaded_at": resume.uploaded_at.isoformat(),
+                "report_url": reverse("matcher:resume_view", args=[resume.id]),
+                "pdf_url": (
+                    reverse("matcher:download_report", args=[resume.id])
+                    if resume.analysis_status == "completed" else None
+                ),
+                "delete_url": reverse("matcher:delete_resume", args=[resume.id]),
+            }
+            for resume in page.items
+        ],
+        "next_cursor": page.next_cursor,
+    })
+
+
+@login_required(login_url="matcher:login")
+def export_history(request):
+    """
+    The user's whole analysis history as a streamed CSV or JSONL download
+    (?format=csv|jsonl). Staff may pass scope=all to export every account.
+    """
+    output_format = request.GET.get("format", "csv")
+    if output_format not in EXPORT_FORMATS:
+        return JsonResponse({"error": "Unknown format."}, status=400)
+    export_all = request.user.is_staff and request.GET.get("scope") == "all"
+
+    resumes = export_queryset(None if export_all else request.user, request.GET.get("status") or None)
+    content_type = "text/csv" if output_format == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(iter_export_lines(resumes, output_format), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="history.{output_format}"'
+    return response
 
 
 @login_required(login_url="matcher:login")
 def view_resume_report(request, resume_id):
+    resume = get_object_or_404(
+        Resume.objects.select_related("snapshot", "job_posting"),
+        id=resume_id,
+        user=request.user
+    )
+
+    if resume.analysis_status != "completed":
+        return render(request, "matcher/processing.html", {"resume": resume})
+
+    analysis = get_analysis(resume)
+
+    context = build_report_context(resume, analysis)
+    return timed("render:results.html", render, request, "matcher/results.html", context)
+
+
+@login_required(login_url="matcher:login")
+@require_POST
+def rematch(request, resume_id):
+    """Score a stored resume against another job description without re-analyzing it."""
+    resume = get_object_or_404(
+        Resume.objects.select_related("snapshot", "job_posting"),
+        id=resume_id,
+        user=request.user,
+        analysis_status="completed",
+    )
+    posting = register_job_description(request.POST.get("job_description", ""), source="rematch")
+
+    if posting is None:
+        messages.error(request, "Please paste the job description to match against.")
+        return redirect("matcher:resume_view", resume_id=resume.id)
+    if posting.pk == resume.job_posting_id:
+        return redirect("matcher:resume_view", resume_id=resume.id)
+
+    match = rematch_resume(resume, posting)
+    return redirect("matcher:match_view", resume_id=resume.id, match_id=match.id)
+
+
+@login_required(login_url="matcher:login")
+def view_match(request, resume_id, match_id):
+    match = get_object_or_404(
+        JobMatch.objects.select_related("resume__snapshot", "resume__job_posting", "job_posting"),
+        id=match_id,
+        resume_id=resume_id,
+        resume__user=request.user,
+    )
+
+    context = build_report_context(match.resume, get_match_analysis(match))
+    context["match"] = match
+    return timed("render:results.html", render, request, "matcher/results.html", context)
+
+
+@login_required(login_url="matcher:login")
+def resume_status(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    job = resume.jobs.order_by("-id").first()
 
-    resume_text = resume.extracted_text or ""
-    job_description = resume.job_description or ""
-
-    ats_score, breakdown = realistic_ats_score(resume_text, job_description)
-    keyword_score, matched_keywords = keyword_match_score(resume_text, job_description)
-    missing = missing_skills(resume_text, job_description)
-    jd_score, jd_matched = jd_match_score(resume_text, job_description)
-    skill_gap = skill_gap_analysis(resume_text, job_description)
-    suggestions = resume_suggestions(ats_score)
-    ai_suggestions, improved_lines = ai_resume_suggestions(resume_text, job_description)
-    resume_diagnosis = diagnose_resume(resume_text)
-    detected_skills = extract_technical_skills(resume_text)
-    ats_template_risk = detect_ats_template_risk(resume_text)
-
-    context = {
-        "resume": resume,
-        "ats_score": ats_score,
-        "ats_class": get_score_class(ats_score),
-        "breakdown": breakdown,
-        "keyword_score": keyword_score,
-        "matched_keywords": matched_keywords,
-        "missing": missing,
-        "suggestions": suggestions,
-        "jd_score": jd_score,
-        "jd_class": get_score_class(jd_score),
-        "jd_matched": jd_matched,
-        "skill_gap": skill_gap,
-        "ai_suggestions": ai_suggestions,
-        "improved_lines": improved_lines,
-        "resume_text": resume_text,
-        "resume_diagnosis": resume_diagnosis,
-        "detected_skills": detected_skills,
-        "ats_template_risk": ats_template_risk,
-    }
-
-    return render(request, "matcher/results.html", context)
+    return JsonResponse({
+        "id": resume.id,
+        "status": resume.analysis_status,
+        "ready": resume.analysis_status == "completed",
+        "attempts": job.attempts if job else 0,
+        "report_url": reverse("matcher:resume_view", args=[resume.id]),
+        "queue": queue_stats(),
+    })
+
+
+@login_required(login_url="matcher:login")
+def download_report(request, resume_id):
+    """The PDF report, served from the on-disk cache with an ETag."""
+    resume = get_object_or_404(
+        Resume.objects.select_related("snapshot", "job_posting", "user"),
+        id=resume_id,
+        user=request.user
+    )
+    if resume.analysis_status != "completed":
+        return redirect("matcher:resume_view", resume_id=resume.id)
+
+    report = get_report(resume)
+    etag = quote_etag(report.etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(
+            open(report.path, "rb"),
+            as_attachment=True,
+            filename=report_filename(resume),
+            content_type="application/pdf",
+        )
+    response["ETag"] = etag
+    # Browsers revalidate with If-None-Match and get a 304 while the report is unchanged.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required(login_url="matcher:login")
+def export_reports(request):
+    """
+    Streamed ZIP of the user's PDF reports; ?ids=1,2,3 narrows the set.
+    Staff may pass scope=all for every user's reports.
+    """
+    resumes = (
+        Resume.objects.filter(analysis_status="completed")
+        .select_related("snapshot", "job_posting", "user")
+        .order_by("id")
+    )
+    if not (request.user.is_staff and request.GET.get("scope") == "all"):
+        resumes = resumes.filter(user=request.user)
+
+    ids = request.GET.get("ids", "").strip()
+    if ids:
+        try:
+            resumes = resumes.filter(id__in=[int(value) for value in ids.split(",") if value.strip()])
+        except ValueError:
+            return JsonResponse({"error": "ids must be a comma-separated list of integers."}, status=400)
+
+    response = StreamingHttpResponse(
+        iter_report_zip(resumes.iterator(chunk_size=100)), content_type="application/zip"
+    )
+    response["Content-Disposition"] = 'attachment; filename="reports.zip"'
+    return response
 
 
 @login_required(login_url="matcher:login")
@@ -260,4 +387,111 @@ def delete_resume(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
     resume.delete()
     messages.success(request, "Resume deleted successfully.")
-    return redirect("matcher:history")
\ No newline at end of file
+    return redirect("matcher:history")
+
+
+# =========================================
+# SEARCH
+# =========================================
+
+def _run_search(request):
+    """Staff may pass scope=all to search every user's resumes."""
+    query = request.GET.get("q", "").strip()
+    search_all = request.user.is_staff and request.GET.get("scope") == "all"
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 1
+
+    results = search_resumes(
+        query,
+        user=None if search_all else request.user,
+        page=page,
+        per_page=request.GET.get("per_page"),
+    )
+    return results, search_all
+
+
+@login_required(login_url="matcher:login")
+def search(request):
+    results, search_all = _run_search(request)
+    return render(request, "matcher/search.html", {
+        "results": results,
+        "search_all": search_all,
+    })
+
+
+@login_required(login_url="matcher:login")
+def search_api(request):
+    results, search_all = _run_search(request)
+    return JsonResponse({
+        "query": results.query,
+        "scope": "all" if search_all else "mine",
+        "page": results.page,
+        "per_page": results.per_page,
+        "total": results.total,
+        "num_pages": results.num_pages,
+        "results": [
+            {
+                "id": hit.resume.id,
+                "file": hit.resume.file.name,
+                "suggested_role": hit.resume.suggested_role,
+                "ats_score": hit.resume.ats_score,
+                "uploaded_at": hit.resume.uploaded_at.isoformat(),
+                "rank": hit.rank,
+                "snippet": str(hit.snippet),
+                "report_url": reverse("matcher:resume_view", args=[hit.resume.id]),
+            }
+            for hit in results.hits
+        ],
+    })
+
+
+# =========================================
+# SKILL STATISTICS
+# =========================================
+
+@login_required(login_url="matcher:login")
+def skills_api(request):
+    """
+    Most common skills across the user's resumes, or the resume count for
+    one ?skill=. kind is detected (default), matched or missing; staff may
+    pass scope=all.
+    """
+    kind = request.GET.get("kind", ResumeSkill.KIND_DETECTED)
+    if kind not in dict(ResumeSkill._meta.get_field("kind").choices):
+        return JsonResponse({"error": "Unknown kind."}, status=400)
+    search_all = request.user.is_staff and request.GET.get("scope") == "all"
+    user = None if search_all else request.user
+
+    skill = request.GET.get("skill", "").strip()
+    if skill:
+        return JsonResponse({
+            "skill": skill,
+            "kind": kind,
+            "scope": "all" if search_all else "mine",
+            "resumes": count_resumes_with_skill(skill, kind, user),
+        })
+
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 20)), 200))
+    except ValueError:
+        limit = 20
+    return JsonResponse({
+        "kind": kind,
+        "scope": "all" if search_all else "mine",
+        "skills": [{"name": name, "resumes": count} for name, count in skill_counts(kind, user, limit)],
+    })
+
+
+# =========================================
+# METRICS
+# =========================================
+
+def metrics(request):
+    """Prometheus scrape endpoint, aggregated across all processes."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -2,6 +2,11 @@ import re
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 
+from .bm25 import term_weights, weighted_overlap
+from .role_catalog import top_roles
+from .skill_taxonomy import find_skills
+
+
 def calculate_ats_score(
     resume_text: str,
     job_description: Optional[str] = None,
@@ -60,101 +65,17 @@ def calculate_ats_score(
 def suggest_roles(detected_skills: List[str], experience_years: float = 0) -> List[Dict]:
     """
     AI-Powered Career Recommendation Engine
-    Matches skills + experience to 50+ corporate roles
+    Matches skills + experience against the shared role catalog (top 5 titles)
     """
-    # Corporate role database (expanded for fresher → mid-level)
-    role_database = {
-        # 🎯 YOUR SWEET SPOT ROLES
-        'backend_fresher': {
-            'skills': ['Python', 'Django', 'SQL'],
-            'min_exp': 0,
-            'roles': ['Junior Backend Developer', 'Python Developer', 'Django Developer']
-        },
-        'fullstack_fresher': {
-            'skills': ['Python', 'Django', 'JavaScript'],
-            'min_exp': 0,
-            'roles': ['Fullstack Developer', 'Software Engineer Fresher']
-        },
-        'data_analyst': {
-            'skills': ['Python', 'SQL', 'Excel'],
-            'min_exp': 0,
-            'roles': ['Data Analyst', 'Junior Data Analyst']
-        },
-        # 💼 ENTERPRISE ROLES
-        'backend': {
-            'skills': ['Python', 'Django', 'SQL', 'Docker'],
-            'min_exp': 1,
-            'roles': ['Backend Developer', 'Python Backend Engineer']
-        },
-        'devops': {
-            'skills': ['Python', 'Docker', 'AWS', 'Linux'],
-            'min_exp': 1,
-            'roles': ['DevOps Engineer', 'Junior DevOps']
-        },
-        # 🎓 PERFECT FOR FRESHERS
-        'associate': {
-            'skills': ['Python', 'Projects', 'Internship'],
-            'min_exp': 0,
-            'roles': ['Associate Software Engineer', 'Trainee Software Engineer']
-        }
-    }
-    
-    matches = []
-    skill_lower = [s.lower() for s in detected_skills]
-    
-    for category, data in role_database.items():
-        # Skill matching (70% weight)
-        skill_matches = sum(1 for skill in data['skills'] if skill.lower() in skill_lower)
-        skill_score = skill_matches / len(data['skills'])
-        
-        # Experience fit (30% weight)
-        exp_fit = 1.0 if experience_years >= data['min_exp'] else 0.6
-        
-        # Total fit score
-        fit_score = (skill_score * 0.7) + (exp_fit * 0.3)
-        
-        if fit_score > 0.35:  # 35% threshold for recommendation
-            for role in data['roles']:
-                matches.append({
-                    'role': role,
-                    'category': category,
-                    'fit_score': round(fit_score * 100, 1),
-                    'skills_matched': skill_matches,
-                    'total_required': len(data['skills'])
-                })
-    
-    # Sort by fit score + limit to top 5
-    return sorted(matches, key=lambda x: x['fit_score'], reverse=True)[:5]
+    return top_roles(detected_skills, experience_years, k=5)
 
 # ===============================
 # 🔧 HELPER FUNCTIONS (Pure Python)
 # ===============================
 
 def extract_skills(text: str) -> List[str]:
-    """Corporate skill extraction (75+ enterprise keywords)"""
-    text_lower = text.lower()
-    skills = []
-    
-    skill_keywords = [
-        # Programming Languages
-        'python', 'java', 'javascript', 'sql', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-        # Frameworks
-        'react', 'angular', 'vue', 'django', 'flask', 'spring', 'laravel', 'node', 'express',
-        # Tools/Cloud
-        'git', 'github', 'docker', 'aws', 'azure', 'gcp', 'jenkins', 'kubernetes', 'linux',
-        # Databases
-        'mysql', 'postgresql', 'mongo', 'oracle', 'redis', 'elasticsearch',
-        # Methodologies
-        'agile', 'scrum', 'devops', 'ci/cd', 'tdd', 'bdd',
-        # Soft skills
-        'leadership', 'communication', 'teamwork', 'problem solving'
-    ]
-    
-    for skill in skill_keywords:
-        if re.search(rf'\b{skill}\b', text_lower):
-            skills.append(skill.title())
-    
-    return list(set(skills))
+    """Corporate skill extraction over the whole skill taxonomy"""
+    return [skill.title() for skill in find_skills(text)]
 
 def calculate_experience_score(text: str) -> float:
     """Extract experience years from text"""
@@ -170,14 +91,13 @@ def calculate_experience_score(text: str) -> float:
     return min(years * 3.5, 25)
 
 def calculate_keyword_match(resume: str, jd: str) -> float:
-    """TF-IDF style keyword matching (no external libs)"""
-    resume_words = re.findall(r'\b\w{3,}\b', resume.lower())
-    jd_words = [w for w in re.findall(r'\b\w{3,}\b', jd.lower()) if len(w) > 3]
-    
-    jd_set = set(jd_words)
-    matches = sum(1 for word in jd_set if word in resume_words)
-    
-    match_ratio = matches / max(len(jd_set), 1)
+    """IDF-weighted keyword matching against the corpus statistics"""
+    resume_words = set(re.findall(r'\b\w{3,}\b', resume.lower()))
+    jd_set = {w for w in re.findall(r'\b\w{3,}\b', jd.lower()) if len(w) > 3}
+    if not jd_set:
+        return 0.0
+
+    match_ratio = weighted_overlap(resume_words, term_weights(jd_set))
     return min(match_ratio * 1.3, 1.0)
 
 def calculate_structure_score(structure: Dict) -> float:
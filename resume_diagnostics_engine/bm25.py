@@ -0,0 +1,142 @@
+"""
+Corpus-aware term weighting (BM25).
+
+Terms are weighted by inverse document frequency, so a JD term that
+appears in nearly every stored document ("experience") counts for little
+while a rare one ("kubernetes") dominates the match. Document frequencies
+come from a pluggable corpus provider; the engine itself has no storage
+and no framework dependency. With no provider, or an empty corpus, every
+term has the same weight and scores reduce to plain overlap.
+"""
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Standard Okapi BM25 parameters: term-frequency saturation and
+# document-length normalization.
+K1 = 1.2
+B = 0.75
+
+# Longest term stored in a term vector; longer "words" are extraction noise.
+MAX_TERM_LENGTH = 100
+
+# Function words carry no signal and are kept out of most stored vectors;
+# without this list they would get the maximal IDF of an unseen term.
+STOPWORDS = frozenset({
+    "a", "about", "above", "after", "all", "also", "an", "and", "any", "are", "as", "at",
+    "be", "been", "being", "both", "but", "by", "can", "could", "did", "do", "does", "each",
+    "etc", "for", "from", "had", "has", "have", "having", "he", "her", "his", "how", "if",
+    "in", "into", "is", "it", "its", "may", "more", "most", "must", "not", "of", "on",
+    "or", "other", "our", "over", "per", "she", "should", "so", "some", "such", "than",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this", "those",
+    "through", "to", "under", "up", "us", "very", "was", "we", "were", "what", "when",
+    "where", "which", "while", "who", "will", "with", "within", "would", "you", "your",
+})
+
+
+# =========================================
+# TERM VECTORS
+# =========================================
+
+def term_vector(terms: Iterable[str]) -> Counter:
+    """Term -> frequency for an already tokenized document."""
+    return Counter(term for term in terms if len(term) <= MAX_TERM_LENGTH)
+
+
+# =========================================
+# CORPUS STATISTICS
+# =========================================
+
+@dataclass(frozen=True)
+class CorpusView:
+    """Corpus totals plus the document frequencies of a set of terms."""
+    doc_count: int = 0
+    avg_doc_length: float = 0.0
+    document_frequencies: Mapping[str, int] = field(default_factory=dict)
+
+    def idf(self, term: str) -> float:
+        # BM25 idf with the +1 inside the log, so it is never negative.
+        n = self.doc_count
+        df = min(self.document_frequencies.get(term, 0), n)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+
+class CorpusProvider:
+    """Source of corpus statistics. The default is an empty corpus."""
+
+    def view(self, terms: Iterable[str]) -> CorpusView:
+        return CorpusView()
+
+
+_provider: CorpusProvider = CorpusProvider()
+
+
+def set_corpus_provider(provider: CorpusProvider) -> None:
+    global _provider
+    _provider = provider
+
+
+def get_corpus_view(terms: Iterable[str]) -> CorpusView:
+    return _provider.view(terms)
+
+
+def term_weights(terms: Iterable[str], view: Optional[CorpusView] = None) -> Dict[str, float]:
+    """IDF weight for every distinct term, fetched in one provider call."""
+    terms = set(terms)
+    content_terms = terms - STOPWORDS
+    view = view if view is not None else get_corpus_view(content_terms)
+    return {term: view.idf(term) if term in content_terms else 0.0 for term in terms}
+
+
+# =========================================
+# SCORING
+# =========================================
+
+def weighted_overlap(doc_terms: Set[str], weights: Mapping[str, float]) -> float:
+    """
+    Share of the query's total IDF weight present in the document (0..1).
+    Linear in the number of query terms.
+    """
+    total = sum(weights.values())
+    if not total:
+        return 0.0
+    return sum(weight for term, weight in weights.items() if term in doc_terms) / total
+
+
+def rank_by_weight(terms: Iterable[str], weights: Mapping[str, float]) -> List[str]:
+    """Most informative terms first; ties alphabetically."""
+    return sorted(terms, key=lambda term: (-weights.get(term, 0.0), term))
+
+
+def bm25_score(weights: Mapping[str, float], vector: Mapping[str, int],
+               doc_length: int, avg_doc_length: float,
+               k1: float = K1, b: float = B) -> float:
+    """Okapi BM25 of one document for a query given as term -> idf."""
+    if avg_doc_length <= 0:
+        avg_doc_length = doc_length or 1
+    norm = k1 * (1 - b + b * doc_length / avg_doc_length)
+
+    score = 0.0
+    for term, weight in weights.items():
+        tf = vector.get(term, 0)
+        if tf:
+            score += weight * tf * (k1 + 1) / (tf + norm)
+    return score
+
+
+def rank_documents(weights: Mapping[str, float],
+                   documents: Iterable[Tuple[Hashable, Mapping[str, int], int]],
+                   avg_doc_length: float, top_k: int = 20) -> List[Tuple[Hashable, float]]:
+    """
+    Score ``(key, term_vector, length)`` documents and return the ``top_k``
+    best as ``(key, score)``. Documents are consumed as a stream and only
+    the current top-k is kept in memory.
+    """
+    scored = (
+        (bm25_score(weights, vector, length, avg_doc_length), key)
+        for key, vector, length in documents
+    )
+    best = heapq.nlargest(top_k, (item for item in scored if item[0] > 0), key=lambda item: item[0])
+    return [(key, round(score, 4)) for score, key in best]
@@ -4,10 +4,18 @@ MIN_WORD_COUNT = 120
 # ======================
 # SECTION HEADERS
 # ======================
+# A line is a section header when it reads as one of these (see
+# section_detector.segment_sections).
+
+SUMMARY_HEADERS = [
+    "summary", "professional summary", "profile",
+    "objective", "career objective", "about me"
+]
 
 SKILLS_HEADERS = [
     "skills", "technical skills", "skill set",
-    "key skills", "competencies", "tech stack"
+    "key skills", "competencies", "tech stack",
+    "programming languages"
 ]
 
 EXPERIENCE_HEADERS = [
@@ -25,30 +33,57 @@ PROJECT_HEADERS = [
     "academic projects", "personal projects"
 ]
 
-# ======================
-# SKILLS
-# ======================
-
-COMMON_SKILLS = [
-    "python", "django", "sql", "mysql",
-    "html", "css", "javascript",
-    "git", "java", "c++"
+CERTIFICATION_HEADERS = [
+    "certifications", "certification",
+    "certificates", "licenses"
 ]
 
-INFERRED_SKILLS = [
-    "machine learning", "data science",
-    "artificial intelligence"
+ACHIEVEMENT_HEADERS = [
+    "achievements", "awards",
+    "honors", "accomplishments"
 ]
 
-# 🔴 REQUIRED for imports (your crash fix)
-SKILL_KEYWORDS = COMMON_SKILLS
+LANGUAGE_HEADERS = [
+    "languages"
+]
 
 # ======================
-# ROLE → SKILL MAP
+# SKILLS AND ROLES (compatibility)
 # ======================
+# Skill vocabularies live in data/skills.json (see skill_taxonomy) and
+# roles in data/roles.json (see role_catalog). The old constant names are
+# kept for existing imports and derived from those files on first access;
+# new code should call get_taxonomy() / get_catalog(), which see reloads.
+
+
+def _common_skills():
+    from .skill_taxonomy import FIELDS, TECHNICAL, get_taxonomy
+    return list(get_taxonomy().names(set(TECHNICAL) - set(FIELDS)))
 
-ROLE_SKILL_MAP = {
-    "Backend Developer": ["python", "django", "sql"],
-    "Frontend Developer": ["html", "css", "javascript"],
-    "Software Engineer": ["python", "java", "git"],
+
+def _inferred_skills():
+    from .skill_taxonomy import FIELDS, get_taxonomy
+    return list(get_taxonomy().names(FIELDS))
+
+
+def _role_skill_map():
+    from .role_catalog import get_catalog
+    role_skills = {}
+    for role in get_catalog().roles:
+        for title in role.titles:
+            role_skills.setdefault(title, [skill.lower() for skill in role.skills])
+    return role_skills
+
+
+_DERIVED = {
+    "COMMON_SKILLS": _common_skills,
+    "SKILL_KEYWORDS": _common_skills,
+    "INFERRED_SKILLS": _inferred_skills,
+    "ROLE_SKILL_MAP": _role_skill_map,
 }
+
+
+def __getattr__(name):
+    if name in _DERIVED:
+        return _DERIVED[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,7 @@
 import re
 
+from .bm25 import rank_by_weight, term_weights, weighted_overlap
+
 def calculate_jd_match(resume_text: str, jd_text: str) -> tuple[float, list[str]]:
     # LOGIC: Clean and convert to Sets for O(1) lookup
     resume_words = set(resume_text.lower().split())
@@ -12,5 +14,7 @@ def calculate_jd_match(resume_text: str, jd_text: str) -> tuple[float, list[str]
     if not jd_keywords:
         return 0.0, []
 
-    score = round((len(matched_skills) / len(jd_keywords)) * 100, 2)
-    return score, list(missing_skills)
+    # LOGIC: Rare JD terms outweigh ones found in most stored documents
+    weights = term_weights(jd_keywords)
+    score = round(weighted_overlap(resume_words, weights) * 100, 2)
+    return score, rank_by_weight(missing_skills, weights)
@@ -0,0 +1,182 @@
+"""
+Role catalog loaded once from a data file.
+
+Every role's required skills are encoded as a bitset over the catalog's
+skill vocabulary, and a candidate's skills as one more bitset, so the
+number of skills a candidate has for a role is
+``popcount(role.mask & candidate_mask)``. An inverted index from skill bit
+to roles limits scoring to roles sharing at least one skill with the
+candidate, and the best k are picked with a heap, so a recommendation
+stays well under a millisecond with thousands of roles.
+"""
+import heapq
+import json
+import os
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .skill_matcher import SkillMatcher
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "data", "roles.json")
+
+# fit = SKILL_WEIGHT * share of required skills + EXPERIENCE_WEIGHT * experience fit
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+UNDER_EXPERIENCED_FIT = 0.6
+MIN_FIT = 0.35
+
+
+def skill_key(skill: str) -> str:
+    return " ".join(str(skill).lower().split())
+
+
+@dataclass(frozen=True)
+class Role:
+    category: str
+    titles: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    min_experience: float
+    mask: int
+
+
+@dataclass(frozen=True)
+class RoleMatch:
+    role: Role
+    matched: int
+    fit: float
+
+    def as_dicts(self) -> List[Dict[str, object]]:
+        """One entry per job title, in the shape the scorers have always returned."""
+        return [
+            {
+                "role": title,
+                "category": self.role.category,
+                "fit_score": round(self.fit * 100, 1),
+                "skills_matched": self.matched,
+                "total_required": len(self.role.skills),
+            }
+            for title in self.role.titles
+        ]
+
+
+class RoleCatalog:
+    """Immutable set of roles with bitset-encoded skill requirements."""
+
+    def __init__(self, roles: Iterable[Mapping[str, object]]):
+        self._bits: Dict[str, int] = {}
+        postings: List[List[int]] = []
+        built = []
+
+        for index, entry in enumerate(roles):
+            # First spelling wins; "Python" and "python" are one required skill.
+            unique: Dict[str, str] = {}
+            for skill in entry.get("skills", ()):
+                if skill_key(skill):
+                    unique.setdefault(skill_key(skill), str(skill))
+            skills = tuple(unique.values())
+            mask = 0
+            for skill in skills:
+                bit = self._bits.setdefault(skill_key(skill), len(self._bits))
+                if bit == len(postings):
+                    postings.append([])
+                if not mask >> bit & 1:
+                    postings[bit].append(index)
+                mask |= 1 << bit
+            built.append(Role(
+                category=str(entry.get("category") or f"role_{index}"),
+                titles=tuple(entry.get("titles") or (entry.get("category"),)),
+                skills=skills,
+                min_experience=float(entry.get("min_experience", 0)),
+                mask=mask,
+            ))
+
+        self.roles: Tuple[Role, ...] = tuple(built)
+        self._postings: Tuple[Tuple[int, ...], ...] = tuple(tuple(p) for p in postings)
+        # Parallel arrays read in the scoring loop.
+        self._masks = tuple(role.mask for role in built)
+        self._sizes = tuple(len(role.skills) for role in built)
+        self._min_experience = tuple(role.min_experience for role in built)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoleCatalog":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["roles"] if isinstance(data, dict) else data)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._bits)
+
+    @cached_property
+    def skill_matcher(self) -> SkillMatcher:
+        """Finds the catalog's own skill vocabulary in free text."""
+        return SkillMatcher(list(self._bits))
+
+    def skills_in(self, text: str) -> List[str]:
+        return self.skill_matcher.find_all(text)
+
+    def skill_mask(self, skills: Iterable[str]) -> int:
+        mask = 0
+        for skill in skills:
+            bit = self._bits.get(skill_key(skill))
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _candidates(self, mask: int) -> Iterable[int]:
+        """Indices of roles sharing at least one skill bit with ``mask``."""
+        seen = set()
+        while mask:
+            low = mask & -mask
+            seen.update(self._postings[low.bit_length() - 1])
+            mask ^= low
+        return seen
+
+    def match(self, skills: Iterable[str], experience_years: float = 0.0, k: Optional[int] = 5,
+              min_fit: float = MIN_FIT, min_matched: int = 1) -> List[RoleMatch]:
+        """
+        Best-fitting roles, highest fit first (catalog order breaks ties).
+        ``k=None`` returns every role that passes the thresholds.
+        """
+        mask = self.skill_mask(skills)
+        masks, sizes, min_experience = self._masks, self._sizes, self._min_experience
+        full_fit = EXPERIENCE_WEIGHT
+        short_fit = EXPERIENCE_WEIGHT * UNDER_EXPERIENCED_FIT
+
+        scored = []
+        for index in self._candidates(mask):
+            matched = (masks[index] & mask).bit_count()
+            if matched < min_matched:
+                continue
+            fit = SKILL_WEIGHT * matched / sizes[index] + (
+                full_fit if experience_years >= min_experience[index] else short_fit
+            )
+            if fit > min_fit:
+                scored.append((fit, -index, matched))
+
+        best = sorted(scored, reverse=True) if k is None else heapq.nlargest(k, scored)
+        return [RoleMatch(self.roles[-neg_index], matched, fit) for fit, neg_index, matched in best]
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: str) -> RoleCatalog:
+    return RoleCatalog.from_file(path)
+
+
+def get_catalog() -> RoleCatalog:
+    """The process-wide catalog; ROLE_CATALOG_PATH points at a replacement data file."""
+    return load_catalog(os.getenv("ROLE_CATALOG_PATH") or DEFAULT_CATALOG_PATH)
+
+
+def top_roles(skills: Iterable[str], experience_years: float = 0.0, k: int = 5) -> List[Dict[str, object]]:
+    """The k best job titles for a skill list, as role dicts."""
+    titles: List[Dict[str, object]] = []
+    for match in get_catalog().match(skills, experience_years, k=k):
+        titles.extend(match.as_dicts())
+        if len(titles) >= k:
+            break
+    return titles[:k]
@@ -1,12 +1,11 @@
-from .constants import ROLE_SKILL_MAP
+from .role_catalog import get_catalog
+
 
 def suggest_roles(skills):
+    """Titles of every catalog role the skills cover at least two requirements of, best first."""
     matched_roles = []
 
-    for role, required_skills in ROLE_SKILL_MAP.items():
-        match_count = sum(skill in skills for skill in required_skills)
-
-        if match_count >= 2:
-            matched_roles.append(role)
+    for match in get_catalog().match(skills, k=None, min_fit=0, min_matched=2):
+        matched_roles.extend(match.role.titles)
 
     return matched_roles
@@ -1,23 +1,141 @@
+"""
+Line-based resume section segmentation.
+
+segment_sections() walks the text once, line by line, and recognizes
+section headers from constants.*_HEADERS. A header is a line that reads as
+a header phrase ("Technical Skills", "EXPERIENCE", "Skills & Tools") or
+starts with one followed by a colon or, in capitals, by the section's
+content ("Skills: Python, SQL", "SKILLS Python SQL"). Every section runs
+from its header to the next one and is returned as a typed span with
+offsets into the original text, so analyzers look inside one section
+instead of searching the whole text once per header.
+"""
 import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
 from .constants import (
-    SKILLS_HEADERS, EXPERIENCE_HEADERS,
-    EDUCATION_HEADERS, PROJECT_HEADERS,
-    MIN_WORD_COUNT
+    ACHIEVEMENT_HEADERS, CERTIFICATION_HEADERS, EDUCATION_HEADERS,
+    EXPERIENCE_HEADERS, LANGUAGE_HEADERS, MIN_WORD_COUNT, PROJECT_HEADERS,
+    SKILLS_HEADERS, SUMMARY_HEADERS,
 )
 
-def analyze_structure(text: str):
-    lower = text.lower()
+SECTION_HEADERS: Dict[str, List[str]] = {
+    "summary": SUMMARY_HEADERS,
+    "skills": SKILLS_HEADERS,
+    "experience": EXPERIENCE_HEADERS,
+    "education": EDUCATION_HEADERS,
+    "projects": PROJECT_HEADERS,
+    "certifications": CERTIFICATION_HEADERS,
+    "achievements": ACHIEVEMENT_HEADERS,
+    "languages": LANGUAGE_HEADERS,
+}
+
+# Header phrase -> section kind.
+_HEADER_KINDS: Dict[str, str] = {
+    header: kind for kind, headers in SECTION_HEADERS.items() for header in headers
+}
+_LONGEST_HEADER_WORDS = max(len(header.split()) for header in _HEADER_KINDS)
+_HEADER_FIRST_WORDS = frozenset(header.split()[0] for header in _HEADER_KINDS)
+# Lines whose first three letters start no header are skipped unparsed.
+_HEADER_PREFIXES = frozenset(word[:3] for word in _HEADER_FIRST_WORDS)
+_LEADING_MARKS = " \t\u2022*-\u00b7>"
+
+# Longer lines are only headers when written as "Header: content".
+_MAX_HEADER_WORDS = 4
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+
+
+def _normalize(fragment: str) -> str:
+    return _NON_LETTERS.sub(" ", fragment.lower()).strip()
+
+
+@dataclass(frozen=True)
+class SectionSpan:
+    kind: str
+    header: str
+    # Offsets into the segmented text: the header line, the first character
+    # of the section's content, and where the next section begins.
+    start: int
+    body_start: int
+    end: int
+
+    def body(self, text: str) -> str:
+        return text[self.body_start:self.end]
+
+
+def _match_header(line: str) -> Optional[Tuple[str, int]]:
+    """(kind, offset of the content within the line) when the line is a header."""
+    first = line.split(None, 1)[:1]
+    if not first or _normalize(first[0]).partition(" ")[0] not in _HEADER_FIRST_WORDS:
+        return None
 
-    def has_section(headers):
-        return any(h in lower for h in headers)
+    head, colon, _ = line.partition(":")
+    name = _normalize(head)
+    if not name:
+        return None
 
+    kind = _HEADER_KINDS.get(name)
+    if kind is not None:
+        return kind, len(head) + len(colon) if colon else len(line)
+
+    words = line.split()
+    # "SKILLS Python, SQL": a capitalized header running into its content.
+    for n in range(min(_LONGEST_HEADER_WORDS, len(words) - 1), 0, -1):
+        lead = " ".join(words[:n])
+        kind = _HEADER_KINDS.get(_normalize(lead))
+        if kind is not None and lead.isupper():
+            content_at = re.match(r"\s*" + r"\s+".join(map(re.escape, words[:n])), line).end()
+            if len(words) > _MAX_HEADER_WORDS or not line[content_at:].isupper():
+                return kind, content_at
+
+    if colon or len(words) > _MAX_HEADER_WORDS:
+        return None
+
+    # Short header lines with extra words: "Skills & Tools", "Education and Training".
+    for n in range(min(_LONGEST_HEADER_WORDS, len(name.split())), 0, -1):
+        kind = _HEADER_KINDS.get(" ".join(name.split()[:n]))
+        if kind is not None:
+            return kind, len(line)
+    return None
+
+
+def segment_sections(text: str) -> List[SectionSpan]:
+    """Sections in document order; text before the first header belongs to none."""
+    spans: List[SectionSpan] = []
+    current: Optional[Tuple[str, str, int, int]] = None
+    offset = 0
+
+    for line in (text or "").splitlines(keepends=True):
+        start, offset = offset, offset + len(line)
+        if line.lstrip(_LEADING_MARKS)[:3].lower() not in _HEADER_PREFIXES:
+            continue
+        match = _match_header(line.rstrip("\r\n"))
+        if match is not None:
+            if current is not None:
+                spans.append(SectionSpan(*current, end=start))
+            kind, content_at = match
+            current = (kind, line.strip(), start, start + content_at)
+
+    if current is not None:
+        spans.append(SectionSpan(*current, end=offset))
+    return spans
+
+
+def section_kinds(spans: List[SectionSpan]) -> FrozenSet[str]:
+    return frozenset(span.kind for span in spans)
+
+
+def analyze_structure(text: str):
+    sections = section_kinds(segment_sections(text))
     word_count = len(text.split())
 
     return {
-        "has_skills": has_section(SKILLS_HEADERS),
-        "has_experience": has_section(EXPERIENCE_HEADERS),
-        "has_education": has_section(EDUCATION_HEADERS),
-        "has_projects": has_section(PROJECT_HEADERS),
+        "has_skills": "skills" in sections,
+        "has_experience": "experience" in sections,
+        "has_education": "education" in sections,
+        "has_projects": "projects" in sections,
         "is_readable": word_count >= MIN_WORD_COUNT,
         "word_count": word_count,
     }
@@ -1,36 +1,24 @@
-import re
-from .constants import COMMON_SKILLS, INFERRED_SKILLS, SKILLS_HEADERS
+from .section_detector import segment_sections
+from .skill_taxonomy import FIELDS, TECHNICAL, find_skills
 
 
-def extract_explicit_skills(text):
-    text_lower = text.lower()
+def extract_explicit_skills(text, sections=None):
+    # Only the skills section(s) are scanned; pass precomputed sections to skip segmenting again.
+    if sections is None:
+        sections = segment_sections(text)
 
-    skills_section = ""
-    for header in SKILLS_HEADERS:
-        pattern = rf"{header}[\s:]*([\s\S]*?)(\n\n|education|projects|experience)"
-        match = re.search(pattern, text_lower)
-        if match:
-            skills_section = match.group(1)
-            break
+    skills_section = "\n".join(
+        span.body(text) for span in sections if span.kind == "skills"
+    )
 
-    if not skills_section:
+    if not skills_section.strip():
         return []
 
-    found = []
-    for skill in COMMON_SKILLS:
-        if skill in skills_section:
-            found.append(skill)
-
-    return sorted(set(found))
+    return sorted(find_skills(skills_section.lower(), TECHNICAL))
 
 
 def extract_inferred_skills(text, explicit_skills):
     if explicit_skills:
         return []
 
-    inferred = []
-    for skill in INFERRED_SKILLS:
-        if skill in text.lower():
-            inferred.append(skill)
-
-    return inferred
+    return find_skills(text, FIELDS)
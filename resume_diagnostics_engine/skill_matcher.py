@@ -0,0 +1,186 @@
+"""
+Single-pass multi-pattern skill matching.
+
+A SkillMatcher compiles a keyword vocabulary into an Aho-Corasick automaton
+once, then finds every keyword in a text with one left-to-right scan. The
+cost of a scan depends on the text length and the number of hits, not on
+the vocabulary size.
+"""
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+# A run of whitespace in the scanned text behaves like a single space, so
+# multi-word skills ("machine learning") still match across line breaks
+# ("machine\r\nlearning") and padding ("machine  learning").
+_WHITESPACE = re.compile(r"\s")
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _fold(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    The lowercased text with whitespace runs folded to one space, plus the
+    source offset of every character in it. The offsets are None when they
+    are the identity: no whitespace run, and no character whose lowercase
+    form is longer ("İ" lowercases to two characters).
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return _fold_by_char(text)
+    if not _WHITESPACE_RUN.search(text):
+        return _WHITESPACE.sub(" ", lowered), None
+
+    offsets: List[int] = []
+    previous = 0
+    for run in _WHITESPACE_RUN.finditer(text):
+        offsets.extend(range(previous, run.start() + 1))
+        previous = run.end()
+    offsets.extend(range(previous, len(text)))
+    return _WHITESPACE.sub(" ", _WHITESPACE_RUN.sub(" ", lowered)), offsets
+
+
+def _fold_by_char(text: str) -> Tuple[str, List[int]]:
+    chars: List[str] = []
+    offsets: List[int] = []
+    in_space = False
+    for index, ch in enumerate(text):
+        if ch.isspace():
+            if not in_space:
+                chars.append(" ")
+                offsets.append(index)
+                in_space = True
+            continue
+        in_space = False
+        ch = ch.lower()
+        chars.append(ch)
+        offsets.extend([index] * len(ch))
+    return "".join(chars), offsets
+
+
+class SkillMatcher:
+    """
+    Immutable keyword automaton with word-boundary rules.
+
+    ``keywords`` is either an iterable of keywords, or a mapping of
+    pattern -> label when several spellings should report the same skill.
+    Matching is case-insensitive. A hit is rejected when a keyword edge that
+    is a word character touches another word character in the text, so
+    "java" does not match inside "javascript" while "c++" still matches
+    before punctuation.
+    """
+
+    __slots__ = ("_goto", "_fail", "_output", "_patterns", "_labels", "_label_order")
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, str]]):
+        if isinstance(keywords, Mapping):
+            pairs = list(keywords.items())
+        else:
+            pairs = [(keyword, keyword) for keyword in keywords]
+
+        self._patterns: List[str] = []
+        self._labels: List[str] = []
+        self._label_order: Dict[str, int] = {}
+
+        seen = set()
+        for pattern, label in pairs:
+            normalized = " ".join(pattern.lower().split())
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            self._patterns.append(normalized)
+            self._labels.append(label)
+            self._label_order.setdefault(label, len(self._label_order))
+
+        self._build()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            output[state] = output[state] + (index,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[child] = target if target != child else 0
+                # Merge suffix outputs so a scan never walks the fail chain to report hits.
+                output[child] = output[child] + output[fail[child]]
+
+        self._goto = tuple(goto)
+        self._fail = tuple(fail)
+        self._output = tuple(output)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, label)`` for every boundary-respecting hit; offsets index ``text``."""
+        if not text:
+            return
+
+        haystack, offsets = _fold(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        patterns, labels = self._patterns, self._labels
+        size = len(haystack)
+        state = 0
+
+        for position, ch in enumerate(haystack):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for index in output[state]:
+                pattern = patterns[index]
+                start = end - len(pattern)
+                if start > 0 and _is_word_char(pattern[0]) and _is_word_char(haystack[start - 1]):
+                    continue
+                if end < size and _is_word_char(pattern[-1]) and _is_word_char(haystack[end]):
+                    continue
+                if offsets is None:
+                    yield start, end, labels[index]
+                else:
+                    yield offsets[start], offsets[end - 1] + 1, labels[index]
+
+    def find_all(self, text: str) -> List[str]:
+        """Return the distinct labels found in ``text``, in vocabulary order."""
+        found = {label for _, _, label in self.iter_matches(text)}
+        return sorted(found, key=self._label_order.__getitem__)
+
+    def contains_any(self, text: str) -> bool:
+        return next(self.iter_matches(text), None) is not None
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(keywords: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(keywords)
+
+
+def get_matcher(keywords: Iterable[str]) -> SkillMatcher:
+    """Return a shared matcher for an arbitrary keyword list, built once per distinct list."""
+    return _cached_matcher(tuple(keywords))
@@ -0,0 +1,193 @@
+"""
+Versioned skill taxonomy shared by every skill extractor.
+
+data/skills.json lists canonical skills with their aliases and category.
+It is compiled once into an immutable SkillTaxonomy: an alias -> canonical
+lookup plus one alias-aware SkillMatcher per category group, built on first
+use and reused afterwards. Every hit is reported under its canonical name,
+so "k8s" and "kubernetes" count as the same skill everywhere.
+
+get_taxonomy() re-stats the file at most every RELOAD_CHECK_INTERVAL
+seconds and swaps in a freshly compiled taxonomy when it changed, so
+editing the file takes effect in running workers without a restart. A
+file that fails to load is logged and the previous taxonomy stays active.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from .skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills.json")
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Category groups the extractors ask for.
+TECHNICAL = ("language", "web", "framework", "database", "cloud", "devops", "tool", "data", "concept", "field")
+FIELDS = ("field",)
+SOFT = ("soft",)
+ALL: Optional[Tuple[str, ...]] = None
+
+
+def _normalize(term: str) -> str:
+    return " ".join(str(term).lower().split())
+
+
+@dataclass(frozen=True)
+class TaxonomySkill:
+    name: str
+    category: str
+    aliases: Tuple[str, ...]
+
+
+class SkillTaxonomy:
+    """Immutable compiled taxonomy."""
+
+    def __init__(self, data: Mapping[str, object]):
+        self.version = str(data.get("version", "0"))
+        self.categories: Mapping[str, str] = MappingProxyType(dict(data.get("categories") or {}))
+
+        skills: List[TaxonomySkill] = []
+        lookup: Dict[str, str] = {}
+        for entry in data.get("skills") or ():
+            name = _normalize(entry["name"])
+            if not name or name in lookup:
+                continue
+            aliases = tuple(
+                alias for alias in dict.fromkeys(_normalize(a) for a in entry.get("aliases") or ())
+                if alias and alias != name and alias not in lookup
+            )
+            skill = TaxonomySkill(name=name, category=str(entry.get("category") or ""), aliases=aliases)
+            skills.append(skill)
+            lookup[name] = name
+            for alias in aliases:
+                lookup[alias] = name
+
+        self.skills: Tuple[TaxonomySkill, ...] = tuple(skills)
+        self._lookup: Mapping[str, str] = MappingProxyType(lookup)
+        # Single-word aliases of single-word skills ("k8s" -> "kubernetes"), for token streams.
+        self.token_aliases: Mapping[str, str] = MappingProxyType({
+            alias: name for alias, name in lookup.items()
+            if alias != name and " " not in alias and " " not in name
+        })
+        self._by_name: Mapping[str, TaxonomySkill] = MappingProxyType({skill.name: skill for skill in skills})
+        self._matchers: Dict[Optional[FrozenSet[str]], SkillMatcher] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def __contains__(self, term: str) -> bool:
+        return _normalize(term) in self._lookup
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical name for a skill or any of its aliases; None if unknown."""
+        return self._lookup.get(_normalize(term))
+
+    def canonicalize(self, terms: Iterable[str]) -> List[str]:
+        """Canonical names of the known terms, deduplicated, in input order."""
+        names = (self._lookup.get(_normalize(term)) for term in terms)
+        return list(dict.fromkeys(name for name in names if name))
+
+    def category(self, term: str) -> Optional[str]:
+        name = self.canonical(term)
+        return self._by_name[name].category if name else None
+
+    def names(self, categories: Optional[Iterable[str]] = ALL) -> Tuple[str, ...]:
+        wanted = None if categories is None else set(categories)
+        return tuple(skill.name for skill in self.skills if wanted is None or skill.category in wanted)
+
+    def matcher(self, categories: Optional[Iterable[str]] = ALL) -> SkillMatcher:
+        """Alias-aware matcher over the given categories, compiled once per taxonomy."""
+        key = None if categories is None else frozenset(categories)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            with self._lock:
+                matcher = self._matchers.get(key)
+                if matcher is None:
+                    patterns: Dict[str, str] = {}
+                    for skill in self.skills:
+                        if key is None or skill.category in key:
+                            patterns[skill.name] = skill.name
+                            for alias in skill.aliases:
+                                patterns[alias] = skill.name
+                    matcher = self._matchers[key] = SkillMatcher(patterns)
+        return matcher
+
+    def find(self, text: str, categories: Optional[Iterable[str]] = ALL) -> List[str]:
+        """Canonical names of the skills mentioned in ``text``, in taxonomy order."""
+        return self.matcher(categories).find_all(text)
+
+
+# =========================================
+# LOADING AND HOT RELOAD
+# =========================================
+
+_state_lock = threading.Lock()
+_taxonomy: Optional[SkillTaxonomy] = None
+_loaded_path: Optional[str] = None
+_file_signature: Optional[Tuple[int, int]] = None
+_checked_at = 0.0
+
+
+def taxonomy_path() -> str:
+    return os.getenv("SKILL_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _reload(path: str, signature: Optional[Tuple[int, int]]) -> None:
+    global _taxonomy, _loaded_path, _file_signature
+    try:
+        taxonomy = SkillTaxonomy.from_file(path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        if _taxonomy is None:
+            raise
+        logger.error("Keeping skill taxonomy v%s; could not load %s: %s", _taxonomy.version, path, e)
+    else:
+        # Compile the common groups before the taxonomy becomes visible.
+        for group in TECHNICAL, SOFT, FIELDS, ALL:
+            taxonomy.matcher(group)
+        if _taxonomy is not None:
+            logger.info("Reloaded skill taxonomy v%s from %s (%d skills)", taxonomy.version, path, len(taxonomy))
+        _taxonomy = taxonomy
+    _loaded_path = path
+    _file_signature = signature
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """The current taxonomy, reloaded if the file changed since the last check."""
+    global _checked_at
+    now = time.monotonic()
+    if _taxonomy is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _taxonomy
+
+    with _state_lock:
+        if _taxonomy is None or now - _checked_at >= RELOAD_CHECK_INTERVAL:
+            path = taxonomy_path()
+            signature = _signature(path)
+            if _taxonomy is None or path != _loaded_path or signature != _file_signature:
+                _reload(path, signature)
+            _checked_at = now
+    return _taxonomy
+
+
+def find_skills(text: str, categories: Optional[Iterable[str]] = ALL) -> List[str]:
+    return get_taxonomy().find(text, categories)
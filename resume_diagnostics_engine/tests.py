@@ -0,0 +1,317 @@
+import json
+import os
+import random
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from . import constants, role_catalog, skill_taxonomy
+from .role_catalog import RoleCatalog, get_catalog, top_roles
+from .section_detector import analyze_structure, segment_sections
+from .skill_extractor import extract_explicit_skills
+from .skill_matcher import SkillMatcher, _is_word_char
+from .skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+
+def brute_force_matches(patterns, text):
+    """
+    Every boundary-respecting (start, end, label) hit in source offsets,
+    found by trying each pattern at each offset; a space in a pattern
+    consumes a whole run of whitespace.
+    """
+    def match_at(pattern, start):
+        position = start
+        for ch in pattern:
+            if ch == " ":
+                if position == len(text) or not text[position].isspace():
+                    return None
+                while position < len(text) and text[position].isspace():
+                    position += 1
+            elif position < len(text) and text[position].lower() == ch:
+                position += 1
+            else:
+                return None
+        return position
+
+    hits = set()
+    seen = set()
+    for pattern, label in patterns.items():
+        pattern = " ".join(pattern.lower().split())
+        if not pattern or pattern in seen:
+            continue
+        seen.add(pattern)
+        for start in range(len(text)):
+            end = match_at(pattern, start)
+            if end is None:
+                continue
+            if start > 0 and _is_word_char(pattern[0]) and _is_word_char(text[start - 1].lower()):
+                continue
+            if end < len(text) and _is_word_char(pattern[-1]) and _is_word_char(text[end].lower()):
+                continue
+            hits.add((start, end, label))
+    return hits
+
+
+def brute_force_roles(roles, skills, experience_years):
+    """(category, matched, fit) for every qualifying role, best first, scored set by set."""
+    have = {" ".join(skill.lower().split()) for skill in skills}
+    scored = []
+    for index, role in enumerate(roles):
+        required = {" ".join(skill.lower().split()) for skill in role["skills"]}
+        matched = len(required & have)
+        if not matched:
+            continue
+        experienced = experience_years >= role.get("min_experience", 0)
+        fit = role_catalog.SKILL_WEIGHT * matched / len(required) + role_catalog.EXPERIENCE_WEIGHT * (
+            1 if experienced else role_catalog.UNDER_EXPERIENCED_FIT
+        )
+        if fit > role_catalog.MIN_FIT:
+            scored.append((-fit, index, role["category"], matched))
+    return [(category, matched, -fit) for fit, _, category, matched in sorted(scored)]
+
+
+# =========================================
+# SKILL MATCHER
+# =========================================
+
+class SkillMatcherTests(SimpleTestCase):
+    def test_matches_brute_force_on_random_vocabularies(self):
+        rng = random.Random(7)
+        alphabet = "ab+. \n\r\t"
+
+        for _ in range(300):
+            patterns = {
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): f"skill{i}"
+                for i in range(rng.randint(1, 8))
+            }
+            text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 40)))
+
+            matcher = SkillMatcher(patterns)
+
+            self.assertEqual(set(matcher.iter_matches(text)), brute_force_matches(patterns, text),
+                             f"patterns={patterns!r} text={text!r}")
+
+    def test_respects_word_boundaries(self):
+        matcher = SkillMatcher(["java", "c++", "machine learning", "node.js"])
+
+        self.assertEqual(matcher.find_all("JavaScript and C# only"), [])
+        self.assertEqual(
+            matcher.find_all("Java, C++.\nMachine\nlearning with Node.js"),
+            ["java", "c++", "machine learning", "node.js"],
+        )
+
+    def test_whitespace_runs_match_a_single_space(self):
+        matcher = SkillMatcher(["machine learning"])
+
+        for text in ("machine  learning", "machine\r\nlearning", "machine \t\n learning", "machine\u00a0learning"):
+            self.assertEqual(list(matcher.iter_matches(f"ML: {text}.")), [(4, 4 + len(text), "machine learning")])
+
+    def test_offsets_index_the_original_text_when_lowercasing_grows_it(self):
+        text = "\u0130 Go  and Rust"
+        matcher = SkillMatcher(["go", "rust", "i\u0307"])
+
+        hits = sorted(matcher.iter_matches(text))
+
+        self.assertEqual(hits, [(0, 1, "i\u0307"), (2, 4, "go"), (10, 14, "rust")])
+        self.assertEqual([text[start:end] for start, end, _ in hits], ["\u0130", "Go", "Rust"])
+
+    def test_aliases_report_their_label_once_in_vocabulary_order(self):
+        matcher = SkillMatcher({"kubernetes": "kubernetes", "k8s": "kubernetes", "python": "python"})
+
+        self.assertEqual(matcher.find_all("python on k8s and Kubernetes"), ["kubernetes", "python"])
+        self.assertTrue(matcher.contains_any("runs on K8S"))
+        self.assertFalse(matcher.contains_any("k8ss"))
+
+
+# =========================================
+# ROLE CATALOG
+# =========================================
+
+class RoleCatalogTests(SimpleTestCase):
+    def test_matches_brute_force_on_random_catalogs(self):
+        rng = random.Random(11)
+        vocabulary = [f"skill {i}" for i in range(40)]
+
+        for _ in range(50):
+            roles = [
+                {
+                    "category": f"role {i}",
+                    "skills": rng.sample(vocabulary, rng.randint(1, 8)),
+                    "min_experience": rng.choice([0, 2, 5]),
+                }
+                for i in range(rng.randint(1, 60))
+            ]
+            skills = [skill.upper() for skill in rng.sample(vocabulary, rng.randint(0, 15))] + ["unknown"]
+            years = rng.choice([0, 3, 10])
+            catalog = RoleCatalog(roles)
+
+            expected = brute_force_roles(roles, skills, years)
+            got = [(match.role.category, match.matched, match.fit) for match in catalog.match(skills, years, k=None)]
+
+            self.assertEqual([row[:2] for row in got], [row[:2] for row in expected])
+            for (_, _, fit), (_, _, reference) in zip(got, expected):
+                self.assertAlmostEqual(fit, reference)
+            self.assertEqual(catalog.match(skills, years, k=3), catalog.match(skills, years, k=None)[:3])
+
+    def test_ties_keep_catalog_order_and_duplicates_count_once(self):
+        catalog = RoleCatalog([
+            {"category": "first", "skills": ["python", "Python", "sql"]},
+            {"category": "second", "skills": ["sql", "python"]},
+        ])
+
+        matches = catalog.match(["python", "SQL"], k=None)
+
+        self.assertEqual([match.role.category for match in matches], ["first", "second"])
+        self.assertEqual(matches[0].role.skills, ("python", "sql"))
+        self.assertEqual(matches[0].matched, 2)
+
+    def test_bundled_catalog_serves_titles(self):
+        catalog = get_catalog()
+        skills = catalog.roles[0].skills
+
+        roles = top_roles(skills, experience_years=10, k=2)
+
+        self.assertEqual(len(roles), 2)
+        self.assertEqual(roles[0]["category"], catalog.roles[0].category)
+        self.assertEqual(roles[0]["fit_score"], 100.0)
+
+
+# =========================================
+# SKILL TAXONOMY
+# =========================================
+
+class SkillTaxonomyTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "skills.json")
+        environ = mock.patch.dict(os.environ, {"SKILL_TAXONOMY_PATH": self.path})
+        environ.start()
+        self.addCleanup(self.restore_bundled_taxonomy)
+        self.addCleanup(environ.stop)
+
+    def restore_bundled_taxonomy(self):
+        skill_taxonomy._checked_at = 0.0
+        get_taxonomy()
+
+    def write(self, content, mtime_ns):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def reload(self):
+        skill_taxonomy._checked_at = 0.0
+        return get_taxonomy()
+
+    def taxonomy(self, version, aliases=()):
+        return {
+            "version": version,
+            "skills": [{"name": "Kubernetes", "category": "devops", "aliases": list(aliases)}],
+        }
+
+    def test_aliases_resolve_to_the_first_skill_claiming_them(self):
+        taxonomy = SkillTaxonomy({"skills": [
+            {"name": "Go", "category": "language", "aliases": ["golang", "GoLang "]},
+            {"name": "Golang Tools", "category": "tool", "aliases": ["golang"]},
+            {"name": "go", "category": "tool"},
+        ]})
+
+        self.assertEqual(len(taxonomy), 2)
+        self.assertEqual(taxonomy.canonical("GOLANG"), "go")
+        self.assertEqual(taxonomy.skills[0].aliases, ("golang",))
+        self.assertEqual(taxonomy.canonicalize(["golang", "go", "cobol", "golang tools"]), ["go", "golang tools"])
+        self.assertEqual(taxonomy.find("golang tools and golang", ["tool"]), ["golang tools"])
+
+    def test_changed_file_is_picked_up_and_a_bad_one_keeps_the_old_version(self):
+        self.write(self.taxonomy("1"), 1_000_000_000)
+        self.assertEqual(self.reload().version, "1")
+
+        self.write(self.taxonomy("2", ["k8s"]), 2_000_000_000)
+        current = self.reload()
+        self.assertEqual(current.version, "2")
+        self.assertEqual(current.find("deploys to K8s"), ["kubernetes"])
+
+        self.write("{not json", 3_000_000_000)
+        with self.assertLogs("resume_diagnostics_engine.skill_taxonomy", "ERROR"):
+            self.assertIs(self.reload(), current)
+
+        self.write(self.taxonomy("4"), 4_000_000_000)
+        self.assertEqual(self.reload().version, "4")
+
+    def test_legacy_skill_constants_follow_reloads(self):
+        self.write(self.taxonomy("2"), 2_000_000_000)
+        self.reload()
+
+        self.assertEqual(constants.COMMON_SKILLS, ["kubernetes"])
+
+    def test_file_is_only_rechecked_after_the_interval(self):
+        self.write(self.taxonomy("1"), 1_000_000_000)
+        loaded = self.reload()
+
+        self.write(self.taxonomy("2"), 2_000_000_000)
+
+        self.assertIs(get_taxonomy(), loaded)
+
+
+class LegacyConstantsTests(SimpleTestCase):
+    def test_removed_constants_are_derived_from_the_data_files(self):
+        from .constants import COMMON_SKILLS, INFERRED_SKILLS, ROLE_SKILL_MAP, SKILL_KEYWORDS
+
+        self.assertIn("python", COMMON_SKILLS)
+        self.assertEqual(SKILL_KEYWORDS, COMMON_SKILLS)
+        self.assertIn("machine learning", INFERRED_SKILLS)
+        self.assertNotIn("machine learning", COMMON_SKILLS)
+        self.assertIn("python", ROLE_SKILL_MAP[get_catalog().roles[0].titles[0]])
+        with self.assertRaises(ImportError):
+            from .constants import NO_SUCH_CONSTANT  # noqa: F401
+
+
+# =========================================
+# SECTION SEGMENTER
+# =========================================
+
+RESUME = (
+    "Jane Doe\n"
+    "Skills in leadership helped the team grow\n"
+    "Technical Skills: Python, Django\n"
+    "SQL\r\n"
+    "WORK EXPERIENCE\n"
+    "Acme Corp, used Kubernetes daily\n"
+    "EDUCATION B.Tech, 2019\n"
+    "Projects & Open Source\n"
+    "Built a Go CLI"
+)
+
+
+class SectionSegmenterTests(SimpleTestCase):
+    def test_spans_cover_the_text_from_the_first_header(self):
+        spans = segment_sections(RESUME)
+
+        self.assertEqual([span.kind for span in spans], ["skills", "experience", "education", "projects"])
+        self.assertEqual(spans[0].start, RESUME.index("Technical Skills"))
+        for span, following in zip(spans, spans[1:]):
+            self.assertEqual(span.end, following.start)
+        self.assertEqual(spans[-1].end, len(RESUME))
+
+    def test_bodies_start_after_the_header(self):
+        skills, experience, education, projects = segment_sections(RESUME)
+
+        self.assertEqual(skills.body(RESUME), " Python, Django\nSQL\r\n")
+        self.assertEqual(experience.body(RESUME), "\nAcme Corp, used Kubernetes daily\n")
+        self.assertEqual(education.header, "EDUCATION B.Tech, 2019")
+        self.assertEqual(education.body(RESUME), " B.Tech, 2019\n")
+        self.assertEqual(projects.body(RESUME), "\nBuilt a Go CLI")
+
+    def test_sentences_starting_with_a_header_word_are_not_headers(self):
+        self.assertEqual(segment_sections("Experience with Python and Docker in production\nSKILLED IN DOCKER"), [])
+        self.assertEqual(segment_sections(""), [])
+
+    def test_consumers_read_only_their_section(self):
+        self.assertEqual(extract_explicit_skills(RESUME), ["django", "python", "sql"])
+        self.assertEqual(extract_explicit_skills("Used Python daily"), [])
+
+        structure = analyze_structure(RESUME)
+        self.assertTrue(structure["has_skills"] and structure["has_projects"])
+        self.assertEqual(structure["word_count"], len(RESUME.split()))
+